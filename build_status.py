@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+E-Nation OS Build Status Daemon
+- Consumes ninja output ONCE (fed in-process or by following a log)
+- Keeps progress, rate, ETA and stall state in memory
+- Serves it as JSON over a local Unix socket (and optionally HTTP)
+
+Usage:
+  ./build_status.py serve [--log build_ultra_reliable.log] [--http 8765]
+  ./build_status.py status
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SOCKET_PATH = os.environ.get("BUILD_STATUS_SOCKET", "build_status.sock")
+STALL_TIMEOUT = 1200  # Seconds without a finished target
+RATE_WINDOW = 120  # Seconds of target completions used for the rate
+
+# Raw ninja status lines and the v2.0 monitor screens in the log
+NINJA_STATUS_RE = re.compile(
+    r"\[(?P<current>\d+)/(?P<total>\d+)\]\s+(?P<action>.*)"
+    r"|(?P<screen_current>\d+)\s*/\s*(?P<screen_total>\d+)\s+targets"
+)
+
+
+class ProgressTracker:
+    """In-memory build progress fed from ninja output lines (thread-safe)"""
+
+    def __init__(self, stall_timeout=STALL_TIMEOUT, rate_window=RATE_WINDOW):
+        self.lock = threading.Lock()
+        self.stall_timeout = stall_timeout
+        self.rate_window = rate_window
+        self.start_time = time.time()
+        self.current_target = 0
+        self.total_targets = 0
+        self.current_action = ""
+        self.last_progress = self.start_time
+        self.completions = deque()  # (time, target count)
+        self.status = "STARTING"
+        self.retry_count = 0
+        self.max_retries = 0
+        self.last_error = ""
+        self.details = ""
+
+    def feed(self, line):
+        """Consume one line of ninja output; returns True on progress"""
+        match = NINJA_STATUS_RE.search(line)
+        if not match:
+            if "FAILED:" in line:
+                with self.lock:
+                    self.last_error = line.strip()[:200]
+            return False
+
+        if match.group("current") is not None:
+            current, total = int(match.group("current")), int(match.group("total"))
+            action = match.group("action").strip()
+        else:
+            current = int(match.group("screen_current"))
+            total = int(match.group("screen_total"))
+            action = None
+
+        with self.lock:
+            self.total_targets = total
+            if action:
+                self.current_action = action[:120]
+            if current < self.current_target:
+                # Ninja restarted and renumbered its remaining work
+                self.completions.clear()
+            progressed = current != self.current_target
+            self.current_target = current
+            if progressed:
+                now = time.time()
+                self.last_progress = now
+                self.completions.append((now, current))
+                while self.completions and now - self.completions[0][0] > self.rate_window:
+                    self.completions.popleft()
+            if self.status in ("STARTING", "RESUMING"):
+                self.status = "BUILDING"
+            return progressed
+
+    def set_status(self, status, details=""):
+        with self.lock:
+            self.status = status
+            self.details = details
+
+    def touch(self):
+        """Record liveness that isn't a finished target (resets the stall clock)"""
+        with self.lock:
+            self.last_progress = time.time()
+
+    def _rate(self, now):
+        """Targets per second over the recent window (lock held)"""
+        if len(self.completions) < 2:
+            return 0.0
+        (t0, n0), (t1, n1) = self.completions[0], self.completions[-1]
+        span = max(now, t1) - t0
+        return (n1 - n0) / span if span > 0 else 0.0
+
+    def snapshot(self):
+        """Return the current state as a JSON-serializable dict"""
+        now = time.time()
+        with self.lock:
+            rate = self._rate(now)
+            remaining = max(0, self.total_targets - self.current_target)
+            eta = remaining / rate if rate > 0 else None
+            idle = now - self.last_progress
+            return {
+                "status": self.status,
+                "details": self.details,
+                "current_target": self.current_target,
+                "total_targets": self.total_targets,
+                "percent": (
+                    100.0 * self.current_target / self.total_targets
+                    if self.total_targets
+                    else 0.0
+                ),
+                "current_action": self.current_action,
+                "rate_per_second": round(rate, 3),
+                "avg_time_per_target": round(1 / rate, 2) if rate > 0 else None,
+                "elapsed_seconds": int(now - self.start_time),
+                "eta_seconds": int(eta) if eta is not None else None,
+                "finish_at": (
+                    (datetime.now() + timedelta(seconds=eta)).isoformat(
+                        timespec="seconds"
+                    )
+                    if eta is not None
+                    else None
+                ),
+                "seconds_since_progress": int(idle),
+                "stalled": idle > self.stall_timeout,
+                "retry_count": self.retry_count,
+                "max_retries": self.max_retries,
+                "last_error": self.last_error,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+
+    def write_status_file(self, path):
+        """Write the legacy agent_status.txt view of the snapshot"""
+        snap = self.snapshot()
+        with open(path, "w") as f:
+            f.write(f"Status: {snap['status']}\n")
+            f.write(f"Time: {datetime.now()}\n")
+            f.write(f"Resume: {snap['retry_count']}/{snap['max_retries']}\n")
+            f.write(f"Last Target: {snap['current_target']}\n")
+            if snap["details"]:
+                f.write(f"Details: {snap['details']}\n")
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """GET /status (or /) returns the tracker snapshot as JSON"""
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/status"):
+            self.send_error(404)
+            return
+        body = json.dumps(self.server.tracker.snapshot()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _socket_in_use(path):
+    """Whether a daemon accepts connections on the Unix socket at `path`"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(2.0)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class StatusServer:
+    """Serve a ProgressTracker on a Unix socket and optionally localhost HTTP"""
+
+    def __init__(self, tracker, socket_path=SOCKET_PATH, http_port=None):
+        self.tracker = tracker
+        self.socket_path = socket_path
+        self.http_port = http_port
+        self.servers = []
+
+    def start(self):
+        if self.socket_path and hasattr(socket, "AF_UNIX"):
+            if os.path.exists(self.socket_path):
+                if not stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                    raise OSError(f"{self.socket_path} exists and is not a socket")
+                if _socket_in_use(self.socket_path):
+                    raise OSError(
+                        f"A status daemon is already serving {self.socket_path}"
+                    )
+                os.unlink(self.socket_path)  # Left over from a dead daemon
+            self.servers.append(_UnixHTTPServer(self.socket_path, _StatusHandler))
+        if self.http_port:
+            self.servers.append(
+                ThreadingHTTPServer(("127.0.0.1", self.http_port), _StatusHandler)
+            )
+        for server in self.servers:
+            server.tracker = self.tracker
+            threading.Thread(
+                target=server.serve_forever, name="build-status", daemon=True
+            ).start()
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.servers = []
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=2.0):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def query_status(socket_path=SOCKET_PATH, http_port=None, timeout=2.0):
+    """Fetch the daemon snapshot, or None if no daemon is listening"""
+    if http_port:
+        conn = http.client.HTTPConnection("127.0.0.1", http_port, timeout=timeout)
+    else:
+        conn = _UnixHTTPConnection(socket_path, timeout=timeout)
+    try:
+        conn.request("GET", "/status")
+        response = conn.getresponse()
+        if response.status != 200:
+            return None
+        return json.loads(response.read())
+    except (OSError, ValueError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+
+
+def serve(args):
+    """Run the daemon, following a log file when no process feeds it"""
+    from monitor_build import LogFollower
+
+    tracker = ProgressTracker()
+    try:
+        server = StatusServer(tracker, args.socket, args.http).start()
+    except OSError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"📡 Serving build status on {args.socket}"
+          + (f" and http://127.0.0.1:{args.http}/status" if args.http else ""))
+
+    while not os.path.exists(args.log):
+        time.sleep(1)
+    follower = LogFollower(args.log)
+    try:
+        while True:
+            for line in follower.read_lines():
+                tracker.feed(line)
+            follower.wait(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.close()
+        server.stop()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build progress daemon")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("--http", type=int, help="Also serve on this localhost port")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Follow a log and serve status")
+    serve_parser.add_argument("--log", default="build_ultra_reliable.log")
+    sub.add_parser("status", help="Print the current status as JSON")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return serve(args)
+
+    snap = query_status(args.socket, args.http)
+    if snap is None:
+        print("❌ No build status daemon is running", file=sys.stderr)
+        return 1
+    print(json.dumps(snap, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,12 @@
 """
 E-Nation OS Build Monitor v5.0 - Ultimate Edition
 Features: Speed Graph, System Stats, Notifications, Countdown
+
+The log is followed in-process (inotify on Linux, kqueue on macOS, polling
+elsewhere), parsed with one combined regex and redrawn at a fixed frame
+rate. System stats are sampled on their own timer instead of per line.
+When the build status daemon is running (build_status.py) its snapshot is
+used instead and the log is not read at all.
 """
 
 import subprocess
@@ -9,8 +15,16 @@ import time
 import os
 import re
 import sys
+import select
+import struct
 from datetime import datetime, timedelta
 from collections import deque
+from build_status import query_status
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 # ANSI Colors & Control
 RESET = "\033[0m"
@@ -30,6 +44,177 @@ MOVE_HOME = "\033[H"
 HIDE_CURSOR = "\033[?25l"
 SHOW_CURSOR = "\033[?25h"
 
+# Refresh rates
+FRAME_INTERVAL = 0.25  # Seconds between redraws (4 fps)
+STATS_INTERVAL = 2.0  # Seconds between system stat samples
+SIREN_INTERVAL = 30.0  # Seconds between stall sirens
+TAIL_BYTES = 64 * 1024  # How much existing log to show on startup
+
+# One pass per line: every field the monitor cares about, as named groups
+LOG_LINE_RE = re.compile(
+    r"(?P<current>\d+)\s*/\s*(?P<targets>\d+)\s+targets"
+    r"|(?P<percent>[\d.]+)%\s+complete"
+    r"|Avg time/target:\s+(?P<avg>[\d.]+)s"
+    r"|Elapsed:\s+(?P<elapsed>.+?)$"
+    r"|Remaining:\s+(?P<remaining>.+?)$"
+    r"|Finish at:\s+(?P<finish>.+?)$"
+    r"|CXX\s+(?P<cxx>.+)"
+    r"|(?P<regen>Regenerating ninja files)"
+)
+
+
+class LogFollower:
+    """Follow a growing log file without spawning `tail -f`
+
+    Waits for writes with inotify (Linux) or kqueue (macOS) and falls back
+    to polling. Data is read in chunks and split into complete lines;
+    truncation or rotation restarts from the beginning of the file.
+    """
+
+    IN_MODIFY = 0x00000002
+
+    def __init__(self, path, tail_bytes=TAIL_BYTES):
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.file.seek(max(0, size - tail_bytes))
+        if size > tail_bytes:
+            self.file.readline()  # Drop the partial first line
+        self.partial = b""
+        self.inotify_fd = None
+        self.kqueue = None
+        self._setup_watch()
+
+    def _setup_watch(self):
+        if sys.platform.startswith("linux"):
+            try:
+                import ctypes
+                import ctypes.util
+
+                libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+                fd = libc.inotify_init1(os.O_NONBLOCK)
+                if fd >= 0 and libc.inotify_add_watch(
+                    fd, os.fsencode(self.path), self.IN_MODIFY
+                ) >= 0:
+                    self.inotify_fd = fd
+                elif fd >= 0:
+                    os.close(fd)
+            except (OSError, AttributeError):
+                self.inotify_fd = None
+        elif hasattr(select, "kqueue"):
+            self.kqueue = select.kqueue()
+            self.kevent = select.kevent(
+                self.file.fileno(),
+                filter=select.KQ_FILTER_VNODE,
+                flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+                fflags=select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND,
+            )
+
+    def wait(self, timeout):
+        """Block until the file changes or the timeout expires"""
+        if timeout <= 0:
+            return
+        if self.inotify_fd is not None:
+            ready, _, _ = select.select([self.inotify_fd], [], [], timeout)
+            if ready:
+                try:
+                    while os.read(self.inotify_fd, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+        elif self.kqueue is not None:
+            self.kqueue.control([self.kevent], 1, timeout)
+        else:
+            time.sleep(timeout)
+
+    def read_lines(self):
+        """Return all complete lines appended since the last call"""
+        try:
+            if os.stat(self.path).st_size < self.file.tell():
+                self.file.seek(0)  # Truncated or rotated
+                self.partial = b""
+        except FileNotFoundError:
+            return []
+        data = self.file.read()
+        if not data:
+            return []
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode("utf-8", errors="replace") for line in lines]
+
+    def close(self):
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+        if self.kqueue is not None:
+            self.kqueue.close()
+        self.file.close()
+
+
+class SystemStats:
+    """Whole-machine CPU and RAM usage, sampled on a timer
+
+    Uses psutil when installed, /proc on Linux and a single `ps` call per
+    sample elsewhere. Never called per log line.
+    """
+
+    def __init__(self, interval=STATS_INTERVAL):
+        self.interval = interval
+        self.cpu_usage = 0.0
+        self.ram_usage = 0.0
+        self.last_sample = 0.0
+        self._last_cpu_times = None
+        self._cpu_count = os.cpu_count() or 1
+
+    def maybe_sample(self):
+        now = time.monotonic()
+        if now - self.last_sample < self.interval:
+            return
+        self.last_sample = now
+        try:
+            if psutil is not None:
+                self.cpu_usage = psutil.cpu_percent(interval=None)
+                self.ram_usage = psutil.virtual_memory().percent
+            elif os.path.exists("/proc/stat"):
+                self._sample_proc()
+            else:
+                self._sample_ps()
+        except (OSError, ValueError):
+            pass
+
+    def _sample_proc(self):
+        with open("/proc/stat") as f:
+            fields = [int(x) for x in f.readline().split()[1:]]
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        total = sum(fields)
+        if self._last_cpu_times:
+            last_idle, last_total = self._last_cpu_times
+            if total > last_total:
+                busy = 1.0 - (idle - last_idle) / (total - last_total)
+                self.cpu_usage = busy * 100
+        self._last_cpu_times = (idle, total)
+
+        meminfo = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])
+        if meminfo.get("MemTotal"):
+            available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+            self.ram_usage = 100.0 * (1 - available / meminfo["MemTotal"])
+
+    def _sample_ps(self):
+        result = subprocess.run(
+            ["ps", "-A", "-o", "%cpu=,%mem="], capture_output=True, text=True
+        )
+        cpu = mem = 0.0
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                cpu += float(parts[0])
+                mem += float(parts[1])
+        self.cpu_usage = cpu / self._cpu_count
+        self.ram_usage = mem
+
 class BuildMonitor:
     def __init__(self):
         self.current_target = 0
@@ -52,17 +237,28 @@ class BuildMonitor:
         self.graph_chars = "  ▂▃▄▅▆▇█"
         
         # System stats
-        self.cpu_usage = 0.0
-        self.ram_usage = 0.0
-        self.last_sys_check = 0
+        self.stats = SystemStats()
         
         # Notifications
         self.last_notified_percent = 0
         self.stall_threshold = 600  # 10 minutes
         self.in_red_alert = False
+        self.last_siren = 0.0
+
+    @property
+    def cpu_usage(self):
+        return self.stats.cpu_usage
+
+    @property
+    def ram_usage(self):
+        return self.stats.ram_usage
 
     def trigger_siren(self):
-        """Play loud alert sound"""
+        """Play loud alert sound (at most once per SIREN_INTERVAL)"""
+        now = time.monotonic()
+        if now - self.last_siren < SIREN_INTERVAL:
+            return
+        self.last_siren = now
         # Play system beep and speak alert (non-blocking if possible, but simple here)
         subprocess.Popen("afplay /System/Library/Sounds/Sosumi.aiff", shell=True)
         subprocess.Popen("say 'Build Alert! Stalled!'", shell=True)
@@ -87,26 +283,6 @@ class BuildMonitor:
                 sound="Ping"
             )
 
-    def update_system_stats(self):
-        """Update CPU and RAM usage"""
-        if time.time() - self.last_sys_check < 2.0:
-            return
-            
-        try:
-            cpu_cmd = "ps -A -o %cpu | awk '{s+=$1} END {print s}'"
-            result = subprocess.run(cpu_cmd, shell=True, capture_output=True, text=True)
-            if result.stdout.strip():
-                self.cpu_usage = float(result.stdout.strip())
-            
-            ram_cmd = "ps -A -o %mem | awk '{s+=$1} END {print s}'"
-            result = subprocess.run(ram_cmd, shell=True, capture_output=True, text=True)
-            if result.stdout.strip():
-                self.ram_usage = float(result.stdout.strip())
-                
-            self.last_sys_check = time.time()
-        except:
-            pass
-
     def get_speed_graph(self):
         """Generate ASCII graph of build speed"""
         if not self.speed_history:
@@ -120,42 +296,54 @@ class BuildMonitor:
 
     def parse_log_line(self, line):
         """Parse a line from the build log"""
-        # Check for progress to reset stall timer
-        match = re.search(r'(\d+)\s*/\s*(\d+)\s+targets', line)
-        if match:
-            self.current_target = int(match.group(1))
-            self.total_targets = int(match.group(2))
+        match = LOG_LINE_RE.search(line)
+        if not match:
+            return
+        field = match.lastgroup
+        if field == "targets":
+            # Progress resets the stall timer
+            self.current_target = int(match.group("current"))
+            self.total_targets = int(match.group("targets"))
             self.last_update = datetime.now()
-            self.last_progress_time = time.time() # Reset stall timer
+            self.last_progress_time = time.time()
             self.check_milestones()
-        
-        match = re.search(r'([\d.]+)%\s+complete', line)
-        if match:
-            self.percent = float(match.group(1))
-        
-        match = re.search(r'Avg time/target:\s+([\d.]+)s', line)
-        if match:
-            self.avg_time = float(match.group(1))
+        elif field == "percent":
+            self.percent = float(match.group("percent"))
+        elif field == "avg":
+            self.avg_time = float(match.group("avg"))
             if self.avg_time > 0:
                 self.speed_history.append(1.0 / self.avg_time)
-        
-        match = re.search(r'Elapsed:\s+(.+?)(?:\n|$)', line)
-        if match:
-            self.elapsed_str = match.group(1).strip()
-        
-        match = re.search(r'Remaining:\s+(.+?)(?:\n|$)', line)
-        if match:
-            self.remaining_str = match.group(1).strip()
-        
-        match = re.search(r'Finish at:\s+(.+?)(?:\n|$)', line)
-        if match:
-            self.finish_time = match.group(1).strip()
-        
-        match = re.search(r'CXX\s+(.+)', line)
-        if match:
-            self.current_action = f"CXX {match.group(1)[:55]}"
-            
-        self.update_system_stats()
+        elif field == "elapsed":
+            self.elapsed_str = match.group("elapsed").strip()
+        elif field == "remaining":
+            self.remaining_str = match.group("remaining").strip()
+        elif field == "finish":
+            self.finish_time = match.group("finish").strip()
+        elif field == "cxx":
+            self.current_action = f"CXX {match.group('cxx')[:55]}"
+        elif field == "regen":
+            self.current_action = "🔨 Regenerating build files (this takes a moment)..."
+            self.remaining_str = "Configuring..."
+            self.finish_time = "Please wait..."
+
+    def apply_status(self, snap):
+        """Load state from a build status daemon snapshot"""
+        if snap["current_target"] != self.current_target:
+            self.last_update = datetime.now()
+        self.current_target = snap["current_target"]
+        self.total_targets = snap["total_targets"]
+        self.percent = snap["percent"]
+        self.current_action = snap["current_action"][:60] or self.current_action
+        self.last_progress_time = time.time() - snap["seconds_since_progress"]
+        self.elapsed_str = str(timedelta(seconds=snap["elapsed_seconds"]))
+        if snap["avg_time_per_target"]:
+            self.avg_time = snap["avg_time_per_target"]
+            self.speed_history.append(1.0 / self.avg_time)
+        if snap["eta_seconds"] is not None:
+            self.remaining_str = str(timedelta(seconds=snap["eta_seconds"]))
+            finish = datetime.now() + timedelta(seconds=snap["eta_seconds"])
+            self.finish_time = finish.strftime("%I:%M:%S %p")
+        self.check_milestones()
 
     def draw(self):
         """Draw the Ultimate UI"""
@@ -310,6 +498,25 @@ def main():
     except:
         pass
     
+    monitor = BuildMonitor()
+    if query_status() is not None:
+        print(f"{CYAN}📡 Reading from build status daemon{RESET}")
+        time.sleep(1)
+        try:
+            while True:
+                snap = query_status()
+                if snap is not None:
+                    monitor.apply_status(snap)
+                monitor.stats.maybe_sample()
+                monitor.draw()
+                time.sleep(FRAME_INTERVAL)
+        except KeyboardInterrupt:
+            sys.stdout.write(f"\n{CYAN}👋 Monitor stopped{RESET}\n")
+        finally:
+            sys.stdout.write(SHOW_CURSOR)
+            sys.stdout.flush()
+        return
+
     log_file = "build_ultra_reliable.log"
     if not os.path.exists(log_file):
         print(f"{RED}❌ Log file not found: {log_file}{RESET}")
@@ -319,26 +526,26 @@ def main():
     print(f"{DIM}Loading Ultimate Dashboard...{RESET}\n")
     time.sleep(1)
     
-    monitor = BuildMonitor()
-    proc = subprocess.Popen(["tail", "-f", "-n", "100", log_file], stdout=subprocess.PIPE, text=True, bufsize=1)
+    follower = LogFollower(log_file)
+    next_frame = 0.0
     
     try:
         while True:
-            line = proc.stdout.readline()
-            if line:
+            for line in follower.read_lines():
                 monitor.parse_log_line(line)
-                if "Regenerating ninja files" in line or "Regenerating ninja files" in monitor.current_action:
-                    monitor.current_action = "🔨 Regenerating build files (this takes a moment)..."
-                    monitor.remaining_str = "Configuring..."
-                    monitor.finish_time = "Please wait..."
-            monitor.draw()
-            time.sleep(0.3)
+            monitor.stats.maybe_sample()
+
+            now = time.monotonic()
+            if now >= next_frame:
+                monitor.draw()
+                next_frame = now + FRAME_INTERVAL
+            follower.wait(next_frame - time.monotonic())
     except KeyboardInterrupt:
         sys.stdout.write(SHOW_CURSOR)
         sys.stdout.write(f"\n{CYAN}👋 Monitor stopped{RESET}\n")
         sys.stdout.flush()
-        proc.kill()
     finally:
+        follower.close()
         sys.stdout.write(SHOW_CURSOR)
         sys.stdout.flush()
 
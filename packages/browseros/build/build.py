@@ -30,8 +30,8 @@ load_env_file()
 
 # Import shared components
 from context import BuildContext
+from modules.build_config import cli_overrides, load_build_config
 from utils import (
-    load_config,
     log_info,
     log_warning,
     log_error,
@@ -39,31 +39,44 @@ from utils import (
     IS_MACOS,
     IS_WINDOWS,
     IS_LINUX,
+    lazy_import,
 )
 
-# Import modules
-from modules.clean import clean
-from modules.git import setup_git, setup_sparkle
-from modules.patches import apply_patches
-from modules.resources import copy_resources
-from modules.chromium_replace import replace_chromium_files, add_file_to_replacements
-from modules.string_replaces import apply_string_replacements
-from modules.inject import inject_version
-from modules.configure import configure
-from modules.compile import build
-from modules.gcs import upload_package_artifacts, upload_signed_artifacts, handle_upload_dist
-
-# Platform-specific imports
+# Build steps are imported when first called: platform tooling, GCS
+# (google-cloud-storage) and Slack (requests) are heavy or optional, and
+# `build.py --help` shouldn't pay for any of them
+clean = lazy_import("modules.clean", "clean")
+setup_git = lazy_import("modules.git", "setup_git")
+setup_sparkle = lazy_import("modules.git", "setup_sparkle")
+apply_patches = lazy_import("modules.patches", "apply_patches")
+copy_resources = lazy_import("modules.resources", "copy_resources")
+replace_chromium_files = lazy_import("modules.chromium_replace", "replace_chromium_files")
+add_file_to_replacements = lazy_import(
+    "modules.chromium_replace", "add_file_to_replacements"
+)
+apply_string_replacements = lazy_import(
+    "modules.string_replaces", "apply_string_replacements"
+)
+inject_version = lazy_import("modules.inject", "inject_version")
+configure = lazy_import("modules.configure", "configure")
+build = lazy_import("modules.compile", "build")
+BuildProfiler = lazy_import("modules.profiler", "BuildProfiler")
+upload_package_artifacts = lazy_import("modules.gcs", "upload_package_artifacts")
+upload_signed_artifacts = lazy_import("modules.gcs", "upload_signed_artifacts")
+handle_upload_dist = lazy_import("modules.gcs", "handle_upload_dist")
+
+# Platform-specific steps
 if IS_MACOS:
-    from modules.sign import sign, sign_universal, check_signing_environment
-    from modules.package import package, package_universal
-    from modules.postbuild import run_postbuild
+    sign = lazy_import("modules.sign", "sign")
+    sign_universal = lazy_import("modules.sign", "sign_universal")
+    check_signing_environment = lazy_import("modules.sign", "check_signing_environment")
+    package = lazy_import("modules.package", "package")
+    package_universal = lazy_import("modules.package", "package_universal")
+    run_postbuild = lazy_import("modules.postbuild", "run_postbuild")
 elif IS_WINDOWS:
-    from modules.package_windows import (
-        package,
-        package_universal,
-        sign_binaries as sign,
-    )
+    package = lazy_import("modules.package_windows", "package")
+    package_universal = lazy_import("modules.package_windows", "package_universal")
+    sign = lazy_import("modules.package_windows", "sign_binaries")
 
     # Windows doesn't have universal signing
     def sign_universal(contexts: list[BuildContext]) -> bool:
@@ -74,7 +87,9 @@ elif IS_WINDOWS:
         log_warning("Post-build tasks are not implemented for Windows yet")
 
 elif IS_LINUX:
-    from modules.package_linux import package, package_universal, sign_binaries as sign
+    package = lazy_import("modules.package_linux", "package")
+    package_universal = lazy_import("modules.package_linux", "package_universal")
+    sign = lazy_import("modules.package_linux", "sign_binaries")
 
     # Linux doesn't have universal signing
     def sign_universal(contexts: list[BuildContext]) -> bool:
@@ -106,14 +121,12 @@ else:
         log_warning("Post-build tasks are not implemented for this platform")
 
 
-from modules.slack import (
-    notify_build_started,
-    notify_build_step,
-    notify_build_success,
-    notify_build_failure,
-    notify_build_interrupted,
-    notify_gcs_upload,
-)
+notify_build_started = lazy_import("modules.slack", "notify_build_started")
+notify_build_step = lazy_import("modules.slack", "notify_build_step")
+notify_build_success = lazy_import("modules.slack", "notify_build_success")
+notify_build_failure = lazy_import("modules.slack", "notify_build_failure")
+notify_build_interrupted = lazy_import("modules.slack", "notify_build_interrupted")
+notify_gcs_upload = lazy_import("modules.slack", "notify_gcs_upload")
 
 
 def build_main(
@@ -131,11 +144,58 @@ def build_main(
     patch_interactive: bool = False,
     patch_commit: bool = False,
     upload_gcs: bool = True,  # Default to uploading to GCS
+    profile: bool = False,
+    clean_mode: str = "full",
+    clean_out_dir: bool = False,
 ):
     """Main build orchestration"""
     log_info("🚀 Nxtscape Build System")
     log_info("=" * 50)
 
+    # Setup context
+    root_dir = Path(__file__).parent.parent
+
+    # Merge defaults < YAML config < CLI flags into one validated config
+    overrides = cli_overrides(
+        build_type=build_type,
+        architectures=(arch,) if arch else (),
+        clean=clean_flag,
+        clean_mode=clean_mode,
+        clean_out_dir=clean_out_dir,
+        git_setup=git_setup_flag,
+        apply_patches=apply_patches_flag,
+        build=build_flag,
+        sign=sign_flag,
+        package=package_flag,
+        slack_notifications=slack_notifications,
+        chromium_src=chromium_src_dir,
+    )
+    config = load_build_config(config_file, root_dir, overrides)
+    if config_file:
+        log_info(f"📄 Loaded config from: {config_file}")
+
+    build_type = config.build_type
+    architectures = list(config.architectures)
+    universal = config.universal
+    clean_flag = config.clean
+    clean_mode = config.clean_mode
+    clean_out_dir = config.clean_out_dir
+    git_setup_flag = config.git_setup
+    apply_patches_flag = config.apply_patches
+    build_flag = config.build
+    sign_flag = config.sign
+    package_flag = config.package
+    slack_notifications = config.slack_notifications
+    chromium_src = config.chromium_src
+    certificate_name = config.certificate_name if IS_WINDOWS else None
+
+    if chromium_src:
+        log_info(
+            f"📁 Using Chromium source from {config.chromium_src_from}: {chromium_src}"
+        )
+    if certificate_name:
+        log_info(f"🔏 Using certificate for signing: {certificate_name}")
+
     # Check if sign flag is enabled and required environment variables are set
     if sign_flag and IS_MACOS:
         if not check_signing_environment():
@@ -146,74 +206,6 @@ def build_main(
         os.environ["DEPOT_TOOLS_WIN_TOOLCHAIN"] = "0"
         log_info("🔧 Set DEPOT_TOOLS_WIN_TOOLCHAIN=0 for Windows build")
 
-    # Setup context
-    root_dir = Path(__file__).parent.parent
-
-    # Initialize chromium_src as None - will be set from CLI or config
-    chromium_src = None
-
-    # Load config if provided
-    config = None
-    gn_flags_file = None
-    architectures = [arch] if arch else []  # Empty list if no arch specified
-    universal = False
-    certificate_name = None  # For Windows signing
-    if config_file:
-        config = load_config(config_file)
-        log_info(f"📄 Loaded config from: {config_file}")
-
-        # Override parameters from config
-        if "build" in config:
-            build_type = config["build"].get("type", build_type)
-            arch = config["build"].get("architecture", arch)
-            # Check for multi-architecture builds
-            if "architectures" in config["build"]:
-                architectures = config["build"]["architectures"]
-            universal = config["build"].get("universal", False)
-
-        if "steps" in config:
-            clean_flag = config["steps"].get("clean", clean_flag)
-            git_setup_flag = config["steps"].get("git_setup", git_setup_flag)
-            apply_patches_flag = config["steps"].get(
-                "apply_patches", apply_patches_flag
-            )
-            build_flag = config["steps"].get("build", build_flag)
-            sign_flag = config["steps"].get("sign", sign_flag)
-            package_flag = config["steps"].get("package", package_flag)
-
-        # Override slack notifications from config if not explicitly set via CLI
-        if "notifications" in config:
-            slack_notifications = config["notifications"].get(
-                "slack", slack_notifications
-            )
-
-        if "gn_flags" in config and "file" in config["gn_flags"]:
-            gn_flags_file = Path(config["gn_flags"]["file"])
-
-        # Get chromium_src from config (only if not provided via CLI)
-        if (
-            not chromium_src_dir
-            and "paths" in config
-            and "chromium_src" in config["paths"]
-        ):
-            config_chromium_src = Path(config["paths"]["chromium_src"])
-            chromium_src = config_chromium_src
-            log_info(f"📁 Using Chromium source from config: {chromium_src}")
-
-        # Get Windows signing certificate name from config
-        if (
-            IS_WINDOWS
-            and "signing" in config
-            and "certificate_name" in config["signing"]
-        ):
-            certificate_name = config["signing"]["certificate_name"]
-            log_info(f"🔏 Using certificate for signing: {certificate_name}")
-
-    # CLI takes precedence over config
-    if chromium_src_dir:
-        chromium_src = chromium_src_dir
-        log_info(f"📁 Using Chromium source from CLI: {chromium_src}")
-
     # Enforce chromium_src requirement
     if not chromium_src:
         log_error("Chromium source directory is required!")
@@ -245,6 +237,7 @@ def build_main(
 
     # Start time for overall build
     start_time = time.time()
+    profiler = BuildProfiler()
 
     # Notify build started (if enabled)
     if slack_notifications:
@@ -278,41 +271,52 @@ def build_main(
 
             # Clean (only for first architecture to avoid conflicts)
             if clean_flag and arch_name == architectures[0]:
-                clean(ctx)
+                with profiler.span("clean", arch=arch_name, mode=clean_mode):
+                    clean(
+                        ctx,
+                        targeted=clean_mode == "targeted",
+                        clean_out_dir=clean_out_dir,
+                    )
                 if slack_notifications:
                     notify_build_step("Completed cleaning build artifacts")
 
             # Git setup (only once for first architecture)
             if git_setup_flag and arch_name == architectures[0]:
-                setup_git(ctx)
+                with profiler.span("git_setup", arch=arch_name):
+                    setup_git(ctx)
                 if slack_notifications:
                     notify_build_step("Completed Git setup and Chromium source")
 
             # Apply patches (only once for first architecture)
             if apply_patches_flag and arch_name == architectures[0]:
                 # First do chromium file replacements
-                replace_chromium_files(ctx)
+                with profiler.span("replace_chromium_files", arch=arch_name):
+                    replace_chromium_files(ctx)
 
                 # Then apply string replacements
-                apply_string_replacements(ctx)
+                with profiler.span("string_replacements", arch=arch_name):
+                    apply_string_replacements(ctx)
 
                 # Setup sparkle (macOS only)
                 if IS_MACOS:
-                    setup_sparkle(ctx)
+                    with profiler.span("setup_sparkle", arch=arch_name):
+                        setup_sparkle(ctx)
                 else:
                     log_info("Skipping Sparkle setup (macOS only)")
 
                 # Apply patches
-                apply_patches(
-                    ctx, interactive=patch_interactive, commit_each=patch_commit
-                )
+                with profiler.span("apply_patches", arch=arch_name):
+                    apply_patches(
+                        ctx, interactive=patch_interactive, commit_each=patch_commit
+                    )
 
                 if slack_notifications:
                     notify_build_step("Completed applying patches")
 
             # Copy resources for each architecture (YAML filters by arch)
             if apply_patches_flag:
-                copy_resources(ctx, commit_each=patch_commit)
+                with profiler.span("copy_resources", arch=arch_name):
+                    copy_resources(ctx, commit_each=patch_commit)
 
                 if slack_notifications:
                     notify_build_step(
@@ -323,8 +327,10 @@ def build_main(
             if build_flag:
                 if slack_notifications:
                     notify_build_step(f"Started building for {arch_name}")
-                configure(ctx, gn_flags_file)
-                build(ctx)
+                with profiler.span("configure", arch=arch_name):
+                    configure(ctx, config.gn_flags_file, config.gn_flags)
+                with profiler.span("compile", arch=arch_name):
+                    build(ctx)
 
                 # Run post-build tasks
                 # run_postbuild(ctx)
@@ -338,10 +344,11 @@ def build_main(
                 if slack_notifications:
                     notify_build_step(f"[{ctx.architecture}] Started signing")
                 # Pass certificate_name for Windows signing
-                if IS_WINDOWS:
-                    sign(ctx, certificate_name)
-                else:
-                    sign(ctx)
+                with profiler.span("sign", arch=arch_name):
+                    if IS_WINDOWS:
+                        sign(ctx, certificate_name)
+                    else:
+                        sign(ctx)
                 if slack_notifications:
                     notify_build_step(f"[{ctx.architecture}] Completed signing")
 
@@ -354,7 +361,8 @@ def build_main(
                     notify_build_step(
                         f"[{ctx.architecture}] Started {package_type} creation"
                     )
-                package(ctx)
+                with profiler.span("package", arch=arch_name):
+                    package(ctx)
                 if slack_notifications:
                     package_type = (
                         "DMG" if IS_MACOS else "installer" if IS_WINDOWS else "AppImage"
@@ -366,7 +374,8 @@ def build_main(
                 # Upload to GCS after packaging
                 gcs_uris = []
                 if upload_gcs:
-                    success, gcs_uris = upload_package_artifacts(ctx)
+                    with profiler.span("upload_gcs", arch=arch_name):
+                        success, gcs_uris = upload_package_artifacts(ctx)
                     if not success:
                         log_warning("Failed to upload package artifacts to GCS")
                     elif gcs_uris and slack_notifications:
@@ -395,7 +404,7 @@ def build_main(
                 log_info("🧹 Cleaning up old universal output directory...")
                 from utils import safe_rmtree
 
-                safe_rmtree(universal_dir)
+                safe_rmtree(universal_dir, background=True)
 
             # Create fresh universal output path
             universal_dir.mkdir(parents=True, exist_ok=True)
@@ -405,9 +414,11 @@ def build_main(
             universalizer_script = root_dir / "build" / "universalizer_patched.py"
 
             # Merge the architectures
-            if not merge_architectures(
-                arch1_app, arch2_app, universal_app_path, universalizer_script
-            ):
+            with profiler.span("merge_universal", arch="universal"):
+                merged = merge_architectures(
+                    arch1_app, arch2_app, universal_app_path, universalizer_script
+                )
+            if not merged:
                 raise RuntimeError(
                     "Failed to merge architectures into universal binary"
                 )
@@ -420,7 +431,8 @@ def build_main(
             if sign_flag:
                 if slack_notifications:
                     notify_build_step("[Universal] Started signing and notarization")
-                sign_universal(built_contexts)
+                with profiler.span("sign", arch="universal"):
+                    sign_universal(built_contexts)
                 if slack_notifications:
                     notify_build_step("[Universal] Completed signing and notarization")
 
@@ -430,7 +442,8 @@ def build_main(
                         "DMG" if IS_MACOS else "installer" if IS_WINDOWS else "AppImage"
                     )
                     notify_build_step(f"[Universal] Started {package_type} creation")
-                package_universal(built_contexts)
+                with profiler.span("package", arch="universal"):
+                    package_universal(built_contexts)
                 if slack_notifications:
                     package_type = (
                         "DMG" if IS_MACOS else "installer" if IS_WINDOWS else "AppImage"
@@ -444,9 +457,10 @@ def build_main(
                     universal_ctx = built_contexts[0]
                     original_arch = universal_ctx.architecture
                     universal_ctx.architecture = "universal"
-                    success, universal_gcs_uris = upload_package_artifacts(
-                        universal_ctx
-                    )
+                    with profiler.span("upload_gcs", arch="universal"):
+                        success, universal_gcs_uris = upload_package_artifacts(
+                            universal_ctx
+                        )
                     if not success:
                         log_warning(
                             "Failed to upload universal package artifacts to GCS"
@@ -483,6 +497,12 @@ def build_main(
         if slack_notifications:
             notify_build_failure(str(e))
         sys.exit(1)
+    finally:
+        # Profiled builds (including failed ones) get a summary table plus a
+        # JSON report and Chrome trace in logs/
+        if profile:
+            profiler.write_reports()
+            profiler.log_summary()
 
 
 @click.command()
@@ -493,6 +513,19 @@ def build_main(
     help="Load configuration from YAML file",
 )
 @click.option("--clean", "-C", is_flag=True, default=False, help="Clean before build")
+@click.option(
+    "--clean-mode",
+    type=click.Choice(["full", "targeted"]),
+    default="full",
+    help="full: reset the checkout and delete the out dir; "
+    "targeted: revert only files the build tooling touched and keep the out dir",
+)
+@click.option(
+    "--clean-out-dir",
+    is_flag=True,
+    default=False,
+    help="Also delete the out dir in targeted clean mode",
+)
 @click.option("--git-setup", "-g", is_flag=True, default=False, help="Git setup")
 @click.option(
     "--apply-patches", "-p", is_flag=True, default=False, help="Apply patches"
@@ -577,6 +610,13 @@ def build_main(
     type=click.Path(exists=True, path_type=Path),
     help="Upload pre-built artifacts from dist/<version> directory to GCS: --upload-dist dist/61",
 )
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Print a per-step timing and resource summary at the end of the build "
+    "and write a JSON report and Chrome trace to logs/",
+)
 @click.option(
     "--platform",
     type=click.Choice(["macos", "linux", "win"]),
@@ -586,6 +626,8 @@ def build_main(
 def main(
     config,
     clean,
+    clean_mode,
+    clean_out_dir,
     git_setup,
     apply_patches,
     sign,
@@ -602,6 +644,7 @@ def main(
     patch_commit,
     no_gcs_upload,
     upload_dist,
+    profile,
     platform,
 ):
     """Simple build system for Nxtscape Browser"""
@@ -706,6 +749,9 @@ def main(
         patch_interactive=patch_interactive,
         patch_commit=patch_commit,
         upload_gcs=not no_gcs_upload,  # Invert the flag
+        profile=profile,
+        clean_mode=clean_mode,
+        clean_out_dir=clean_out_dir,
     )
 
 
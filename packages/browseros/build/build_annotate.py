@@ -8,23 +8,23 @@ for each feature, using the feature's files and description.
 
 import sys
 import subprocess
-import yaml
 import click
 from pathlib import Path
+from typing import Optional
 
 # Import shared utilities
 from utils import log_info, log_error, log_success, log_warning
+from modules.dev_cli.utils import CommitWriter, GitError, parse_porcelain_z
+from modules.feature_registry import FeatureRegistry
 
 
-def load_features(features_file: Path) -> dict:
+def load_features(features_file: Path) -> FeatureRegistry:
     """Load features from YAML file"""
     try:
-        with open(features_file, 'r') as f:
-            data = yaml.safe_load(f)
-            return data.get('features', {})
+        return FeatureRegistry.load(features_file)
     except Exception as e:
         log_error(f"Failed to load features file: {e}")
-        return {}
+        return FeatureRegistry(features_file)
 
 
 def check_git_repo(chromium_src: Path) -> bool:
@@ -33,70 +33,43 @@ def check_git_repo(chromium_src: Path) -> bool:
     return git_dir.exists()
 
 
-def get_modified_files(chromium_src: Path, files: list[str]) -> list[str]:
-    """Get list of files that have modifications or are untracked"""
-    modified = []
+# Paths per `git status` invocation, to stay under argv limits
+STATUS_CHUNK = 500
 
-    for file_path in files:
-        full_path = chromium_src / file_path
 
-        # Check if file exists
-        if not full_path.exists():
-            continue
-
-        try:
-            # Check git status for this file
-            result = subprocess.run(
-                ['git', 'status', '--porcelain', str(file_path)],
-                cwd=chromium_src,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            # If output exists, file has changes
-            if result.stdout.strip():
-                modified.append(file_path)
-
-        except subprocess.CalledProcessError:
-            # If git status fails, skip this file
-            continue
-
-    return modified
+def get_status_table(chromium_src: Path, paths: list[str]) -> dict[str, str]:
+    """Map changed or untracked paths to their porcelain status code
 
+    Runs one `git status --porcelain -z` over all paths (chunked only if
+    the list is huge) instead of one index scan per file.
+    """
+    table = {}
+    paths = sorted(set(paths))
+    for i in range(0, len(paths), STATUS_CHUNK):
+        result = subprocess.run(
+            ['git', 'status', '--porcelain', '-z', '--untracked-files=all',
+             '--', *paths[i:i + STATUS_CHUNK]],
+            cwd=chromium_src,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        table.update(parse_porcelain_z(result.stdout))
+    return table
 
-def git_add_and_commit(chromium_src: Path, files: list[str], commit_message: str) -> bool:
-    """Add files and create commit"""
 
-    # First, add all files
-    try:
-        for file_path in files:
-            subprocess.run(
-                ['git', 'add', str(file_path)],
-                cwd=chromium_src,
-                check=True,
-                capture_output=True
-            )
-    except subprocess.CalledProcessError as e:
-        log_error(f"Failed to add files: {e}")
-        return False
+def git_add_and_commit(chromium_src: Path, files: list[str], commit_message: str,
+                       writer: Optional[CommitWriter] = None) -> bool:
+    """Add files and create commit
 
-    # Then commit
+    `files` are the changed paths themselves (not directories). The
+    commit is written with git plumbing, so no full-tree scan happens.
+    """
+    writer = writer or CommitWriter(chromium_src)
     try:
-        subprocess.run(
-            ['git', 'commit', '-m', commit_message],
-            cwd=chromium_src,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return True
-    except subprocess.CalledProcessError as e:
-        # Check if it's because nothing was staged
-        stderr = e.stderr or ''
-        if 'nothing to commit' in stderr or 'nothing added to commit' in stderr:
-            return False
-        log_error(f"Failed to commit: {stderr}")
+        return writer.commit(files, commit_message) is not None
+    except GitError as e:
+        log_error(f"Failed to commit: {e}")
         return False
 
 
@@ -111,34 +84,51 @@ def process_features(chromium_src: Path, features_file: Path) -> int:
     log_info(f"📋 Found {len(features)} features")
     log_info("=" * 60)
 
+    # One status scan for every feature's files
+    all_files = [file_path for feature in features for file_path in feature.files]
+    try:
+        status_table = get_status_table(chromium_src, all_files)
+    except subprocess.CalledProcessError as e:
+        log_error(f"Failed to read git status: {e.stderr or e}")
+        return 0
+
+    # Route each changed file to the first feature that owns it
+    changed = [path for path in sorted(status_table) if (chromium_src / path).exists()]
+    changed_by_feature, _ = features.group_by_feature(changed)
+
+    try:
+        writer = CommitWriter(chromium_src)
+    except GitError as e:
+        log_error(f"Failed to read HEAD: {e}")
+        return 0
+
     commits_created = 0
 
-    for feature_name, feature_data in features.items():
-        description = feature_data.get('description', feature_name)
-        files = feature_data.get('files', [])
+    for feature in features:
+        description = feature.description
+        files = feature.files
 
-        log_info(f"\n🔧 {feature_name}")
+        log_info(f"\n🔧 {feature.name}")
         log_info(f"   {description}")
 
         if not files:
             log_warning("   No files specified, skipping")
             continue
 
-        # Find files with modifications
-        modified_files = get_modified_files(chromium_src, files)
+        changed_paths = changed_by_feature.get(feature.name, [])
 
-        if not modified_files:
+        if not changed_paths:
             log_warning(f"   No modified files ({len(files)} files checked)")
             continue
 
-        log_info(f"   Found {len(modified_files)} modified file(s)")
+        log_info(f"   Found {len(changed_paths)} modified file(s)")
 
         # Create commit message
-        commit_message = f"{feature_name}: {description}"
+        commit_message = f"{feature.name}: {description}"
 
         # Add and commit
-        if git_add_and_commit(chromium_src, modified_files, commit_message):
-            log_success(f"   ✓ Committed {len(modified_files)} file(s)")
+        if git_add_and_commit(chromium_src, changed_paths, commit_message, writer):
+            log_success(f"   ✓ Committed {len(changed_paths)} file(s)")
             commits_created += 1
         else:
             log_warning("   No changes staged, skipping commit")
@@ -167,7 +157,7 @@ def main(chromium_src, features_file):
 
     For each feature, this script will:
     1. Check which files have modifications
-    2. Stage those files with 'git add'
+    2. Stage those files into the index
     3. Create a commit with the feature description
 
     Example:
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """
-Build context dataclass to hold all build state
+Build context to hold all build state
 """
 
+import functools
 import time
 from pathlib import Path
-from dataclasses import dataclass
+from typing import Any, Optional, Tuple
 from utils import (
     log_error,
     log_warning,
@@ -17,101 +18,180 @@ from utils import (
     IS_MACOS,
 )
 
+NXTSCAPE_APP_BASE_NAME = "E-Nation OS"  # Base name without extension
+
+# Platform-specific app names
+if IS_WINDOWS:
+    CHROMIUM_APP_NAME = f"chrome{get_executable_extension()}"
+    NXTSCAPE_APP_NAME = f"{NXTSCAPE_APP_BASE_NAME}{get_executable_extension()}"
+elif IS_MACOS:
+    CHROMIUM_APP_NAME = "Chromium.app"
+    NXTSCAPE_APP_NAME = f"{NXTSCAPE_APP_BASE_NAME}.app"
+else:
+    CHROMIUM_APP_NAME = "chrome"
+    NXTSCAPE_APP_NAME = NXTSCAPE_APP_BASE_NAME.lower()
+
+
+@functools.lru_cache(maxsize=None)
+def read_versions(root_dir: Path) -> Tuple[str, str]:
+    """Read (chromium_version, nxtscape_version) from the version files
+
+    Read once per root dir and shared by every context built from it.
+    Missing files give empty strings.
+    """
+    chromium_version = ""
+    version_file = join_paths(root_dir, "CHROMIUM_VERSION")
+    if version_file.exists():
+        # Parse VERSION file format: MAJOR=137\nMINOR=0\nBUILD=7151\nPATCH=69
+        version_dict = {}
+        for line in version_file.read_text().strip().split("\n"):
+            key, value = line.split("=")
+            version_dict[key] = value
+        chromium_version = f"{version_dict['MAJOR']}.{version_dict['MINOR']}.{version_dict['BUILD']}.{version_dict['PATCH']}"
+
+    nxtscape_version = ""
+    version_file = join_paths(root_dir, "build", "config", "NXTSCAPE_VERSION")
+    if version_file.exists():
+        nxtscape_version = version_file.read_text().strip()
+
+    return chromium_version, nxtscape_version
+
 
-@dataclass
 class BuildContext:
-    """Simple dataclass to hold all build state"""
-
-    root_dir: Path
-    chromium_src: Path = Path()
-    out_dir: str = "out/Default"
-    architecture: str = ""  # Will be set in __post_init__
-    build_type: str = "debug"
-    apply_patches: bool = False
-    sign_package: bool = False
-    package: bool = False
-    build: bool = False
-    chromium_version: str = ""
-    nxtscape_version: str = ""
-    nxtscape_chromium_version: str = ""
-    start_time: float = 0.0
-
-    # App names - will be set based on platform
-    CHROMIUM_APP_NAME: str = ""
-    NXTSCAPE_APP_NAME: str = ""
-    NXTSCAPE_APP_BASE_NAME: str = "E-Nation OS"  # Base name without extension
+    """Build state shared by the build steps
+
+    Construction only stores its arguments. Versions and the Chromium
+    source path are resolved on first use, so contexts for each
+    architecture or dev command are cheap to create.
+    """
+
+    __slots__ = (
+        "root_dir",
+        "out_dir",
+        "architecture",
+        "build_type",
+        "apply_patches",
+        "sign_package",
+        "package",
+        "build",
+        "start_time",
+        "app_path",  # Overrides get_app_path, e.g. for a merged universal app
+        "package_path",  # Set by packaging steps
+        "dev_config",  # Set by the dev CLI
+        "_chromium_src",
+        "_chromium_src_resolved",
+        "_chromium_version",
+        "_nxtscape_version",
+    )
+
+    CHROMIUM_APP_NAME = CHROMIUM_APP_NAME
+    NXTSCAPE_APP_NAME = NXTSCAPE_APP_NAME
+    NXTSCAPE_APP_BASE_NAME = NXTSCAPE_APP_BASE_NAME
 
     # Third party
-    SPARKLE_VERSION: str = "2.7.0"
-
-    def __post_init__(self):
-        """Load version files and set platform/architecture-specific configurations"""
-        # Set platform-specific defaults
-        if not self.architecture:
-            self.architecture = get_platform_arch()
-
-        # Set platform-specific app names
-        if IS_WINDOWS:
-            self.CHROMIUM_APP_NAME = f"chrome{get_executable_extension()}"
-            self.NXTSCAPE_APP_NAME = (
-                f"{self.NXTSCAPE_APP_BASE_NAME}{get_executable_extension()}"
-            )
-        elif IS_MACOS:
-            self.CHROMIUM_APP_NAME = "Chromium.app"
-            self.NXTSCAPE_APP_NAME = f"{self.NXTSCAPE_APP_BASE_NAME}.app"
-        else:
-            self.CHROMIUM_APP_NAME = "chrome"
-            self.NXTSCAPE_APP_NAME = self.NXTSCAPE_APP_BASE_NAME.lower()
-
-        # Set architecture-specific output directory with platform separator
-        if IS_WINDOWS:
+    SPARKLE_VERSION = "2.7.0"
+    # SHA-256 of the Sparkle release archive (NXTSCAPE_SPARKLE_SHA256
+    # overrides it). While unset, the first download's checksum is recorded
+    # in the archive cache and enforced after that.
+    SPARKLE_SHA256 = None
+
+    def __init__(
+        self,
+        root_dir: Path,
+        chromium_src: Path = Path(),
+        out_dir: str = "",  # Defaults to out/Default_<architecture>
+        architecture: str = "",  # Defaults to the platform architecture
+        build_type: str = "debug",
+        apply_patches: bool = False,
+        sign_package: bool = False,
+        package: bool = False,
+        build: bool = False,
+        app_path: Optional[Path] = None,
+    ):
+        self.root_dir = root_dir
+        self.architecture = architecture or get_platform_arch()
+        # Architecture-specific output directory with platform separator
+        if out_dir:
+            self.out_dir = out_dir
+        elif IS_WINDOWS:
             self.out_dir = f"out\\Default_{self.architecture}"
         else:
             self.out_dir = f"out/Default_{self.architecture}"
-
-        version_dict = {}
-
-        if not self.chromium_version:
-            # Read from VERSION file
-            version_file = join_paths(self.root_dir, "CHROMIUM_VERSION")
-            if version_file.exists():
-                # Parse VERSION file format: MAJOR=137\nMINOR=0\nBUILD=7151\nPATCH=69
-                for line in version_file.read_text().strip().split("\n"):
-                    key, value = line.split("=")
-                    version_dict[key] = value
-
-                # Construct chromium_version as MAJOR.MINOR.BUILD.PATCH
-                self.chromium_version = f"{version_dict['MAJOR']}.{version_dict['MINOR']}.{version_dict['BUILD']}.{version_dict['PATCH']}"
-
-        if not self.nxtscape_version:
-            # Read from NXTSCAPE_VERSION file
-            version_file = join_paths(
-                self.root_dir, "build", "config", "NXTSCAPE_VERSION"
-            )
-            if version_file.exists():
-                self.nxtscape_version = version_file.read_text().strip()
-
-        # Set nxtscape_chromium_version as chromium version with BUILD + nxtscape_version
-        if self.chromium_version and self.nxtscape_version and version_dict:
-            # Calculate new BUILD number by adding nxtscape_version to original BUILD
-            new_build = int(version_dict["BUILD"]) + int(self.nxtscape_version)
-            self.nxtscape_chromium_version = f"{version_dict['MAJOR']}.{version_dict['MINOR']}.{new_build}.{version_dict['PATCH']}"
-
-        # Determine chromium source directory
-        if self.chromium_src and self.chromium_src.exists():
-            log_warning(f"📁 Using provided Chromium source: {self.chromium_src}")
-        else:
-            log_warning(f"⚠️  Provided path does not exist: {self.chromium_src}")
-            self.chromium_src = join_paths(self.root_dir, "chromium_src")
-            if not self.chromium_src.exists():
-                log_error(
-                    f"⚠️  Default Chromium source path does not exist: {self.chromium_src}"
-                )
-                raise FileNotFoundError(
-                    f"Chromium source path does not exist: {self.chromium_src}"
-                )
-
+        self.build_type = build_type
+        self.apply_patches = apply_patches
+        self.sign_package = sign_package
+        self.package = package
+        self.build = build
+        self.app_path = app_path
+        self.package_path: Optional[Path] = None
+        self.dev_config: Any = None
         self.start_time = time.time()
+        self._chromium_src = chromium_src
+        self._chromium_src_resolved = False
+        self._chromium_version: Optional[str] = None
+        self._nxtscape_version: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"BuildContext(root_dir={self.root_dir!r}, "
+            f"chromium_src={self._chromium_src!r}, "
+            f"architecture={self.architecture!r}, build_type={self.build_type!r})"
+        )
+
+    @property
+    def chromium_src(self) -> Path:
+        """Chromium source dir, falling back to <root>/chromium_src
+
+        Checked on first access; raises FileNotFoundError if neither exists.
+        """
+        if not self._chromium_src_resolved:
+            if not (self._chromium_src and self._chromium_src.exists()):
+                log_warning(f"⚠️  Provided path does not exist: {self._chromium_src}")
+                fallback = join_paths(self.root_dir, "chromium_src")
+                if not fallback.exists():
+                    log_error(
+                        f"⚠️  Default Chromium source path does not exist: {fallback}"
+                    )
+                    raise FileNotFoundError(
+                        f"Chromium source path does not exist: {fallback}"
+                    )
+                self._chromium_src = fallback
+            self._chromium_src_resolved = True
+        return self._chromium_src
+
+    @chromium_src.setter
+    def chromium_src(self, value: Path):
+        self._chromium_src = value
+        self._chromium_src_resolved = False
+
+    @property
+    def chromium_version(self) -> str:
+        if self._chromium_version is None:
+            self._chromium_version = read_versions(self.root_dir)[0]
+        return self._chromium_version
+
+    @chromium_version.setter
+    def chromium_version(self, value: str):
+        self._chromium_version = value
+
+    @property
+    def nxtscape_version(self) -> str:
+        if self._nxtscape_version is None:
+            self._nxtscape_version = read_versions(self.root_dir)[1]
+        return self._nxtscape_version
+
+    @nxtscape_version.setter
+    def nxtscape_version(self, value: str):
+        self._nxtscape_version = value
+
+    @property
+    def nxtscape_chromium_version(self) -> str:
+        """Chromium version with nxtscape_version added to its BUILD number"""
+        parts = self.chromium_version.split(".")
+        if len(parts) != 4 or not self.nxtscape_version:
+            return ""
+        parts[2] = str(int(parts[2]) + int(self.nxtscape_version))
+        return ".".join(parts)
 
     # Path getter methods
     def get_config_dir(self) -> Path:
@@ -187,6 +267,8 @@ class BuildContext:
 
     def get_app_path(self) -> Path:
         """Get built app path"""
+        if self.app_path:
+            return self.app_path
         # For debug builds, check if the app has a different name
         if self.build_type == "debug" and IS_MACOS:
             # Check for debug-branded app name
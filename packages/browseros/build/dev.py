@@ -7,9 +7,9 @@ Enables extracting, applying, and managing patches across Chromium upgrades.
 """
 
 import click
+import importlib
 import os
 import sys
-import yaml
 from pathlib import Path
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
@@ -42,6 +42,8 @@ class DevCliConfig:
         # Load from config file if exists
         config_file = Path.cwd() / ".dev-cli.yaml"
         if config_file.exists():
+            import yaml
+
             try:
                 with open(config_file, "r") as f:
                     file_config = yaml.safe_load(f)
@@ -113,7 +115,37 @@ def create_build_context(chromium_src: Optional[Path] = None) -> Optional[BuildC
         return None
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """Click group whose subcommand modules are imported only when used
+
+    Subcommand modules pull in yaml, git helpers and the ninja analysis
+    code; `dev status` and plain startup shouldn't pay for them.
+    """
+
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # command name -> "module.path:attribute"
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            module_name, attr = self.lazy_subcommands[cmd_name].split(":")
+            self.add_command(getattr(importlib.import_module(module_name), attr), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "extract": "modules.dev_cli.extract:extract_group",
+        "apply": "modules.dev_cli.apply:apply_group",
+        "feature": "modules.dev_cli.feature:feature_group",
+        "ninja": "modules.dev_cli.ninja:ninja_group",
+    },
+)
 @click.option(
     "--chromium-src",
     "-S",
@@ -143,6 +175,11 @@ def cli(ctx, chromium_src, verbose, quiet):
       dev feature list
       dev feature add my-feature HEAD
       dev feature show my-feature
+
+    \b
+    Analyze builds:
+      dev ninja report -o before.json
+      dev ninja diff before.json after.json
     """
     # Store options in context for subcommands
     ctx.ensure_object(dict)
@@ -151,49 +188,36 @@ def cli(ctx, chromium_src, verbose, quiet):
     ctx.obj["quiet"] = quiet
 
 
-# Import and register subcommand groups
-# These will be created in the next step
-try:
-    from modules.dev_cli import extract, apply, feature
-
-    cli.add_command(extract.extract_group)
-    cli.add_command(apply.apply_group)
-    cli.add_command(feature.feature_group)
-except ImportError as e:
-    # During initial setup, modules might not exist yet
-    log_warning(f"Some modules not yet available: {e}")
-
-    # Add placeholder commands for testing
-    @cli.command()
-    @click.pass_context
-    def status(ctx):
-        """Show dev CLI status"""
-        log_info("Dev CLI Status")
-        log_info("-" * 40)
-
-        build_ctx = create_build_context(ctx.obj.get("chromium_src"))
-        if build_ctx:
-            log_success(f"Chromium source: {build_ctx.chromium_src}")
-
-            # Check for patches directory
-            patches_dir = build_ctx.root_dir / "chromium_src"
-            if patches_dir.exists():
-                patch_count = len(list(patches_dir.rglob("*.patch")))
-                log_info(f"Individual patches: {patch_count}")
-            else:
-                log_warning("No patches directory found")
-
-            # Check for features.yaml
-            features_file = build_ctx.root_dir / "features.yaml"
-            if features_file.exists():
-                with open(features_file) as f:
-                    features = yaml.safe_load(f)
-                    feature_count = len(features.get("features", {}))
-                    log_info(f"Features defined: {feature_count}")
-            else:
-                log_warning("No features.yaml found")
+@cli.command()
+@click.pass_context
+def status(ctx):
+    """Show dev CLI status"""
+    log_info("Dev CLI Status")
+    log_info("-" * 40)
+
+    build_ctx = create_build_context(ctx.obj.get("chromium_src"))
+    if build_ctx:
+        log_success(f"Chromium source: {build_ctx.chromium_src}")
+
+        # Check for patches directory
+        patches_dir = build_ctx.root_dir / "chromium_src"
+        if patches_dir.exists():
+            patch_count = len(list(patches_dir.rglob("*.patch")))
+            log_info(f"Individual patches: {patch_count}")
+        else:
+            log_warning("No patches directory found")
+
+        # Check for features.yaml
+        features_file = build_ctx.root_dir / "features.yaml"
+        if features_file.exists():
+            from modules.feature_registry import FeatureRegistry
+
+            feature_count = len(FeatureRegistry.load(features_file))
+            log_info(f"Features defined: {feature_count}")
         else:
-            log_error("Failed to create build context")
+            log_warning("No features.yaml found")
+    else:
+        log_error("Failed to create build context")
 
 
 def main():
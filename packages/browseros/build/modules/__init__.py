@@ -1,2 +1,10 @@
 # Build system modules
-from .string_replaces import apply_string_replacements
+
+
+def __getattr__(name):
+    # Imported on demand so loading one module doesn't load them all
+    if name == "apply_string_replacements":
+        from .string_replaces import apply_string_replacements
+
+        return apply_string_replacements
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
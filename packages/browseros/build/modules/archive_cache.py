@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Third-party archive cache module for Nxtscape build system
+
+Archives are identified by version and SHA-256. Downloads are verified
+against the pinned checksum and stored content-addressed by it; an
+unpinned archive has the checksum of its first download recorded and
+enforced from then on. Each archive is unpacked once into a versioned
+directory that later builds copy from, and install stamps kept in the
+cache make reinstalling the same version a no-op.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from utils import log_info, log_warning, safe_rmtree
+
+CHUNK_SIZE = 1 << 20
+# Seconds a download may stall (connect or between reads) before failing
+DOWNLOAD_TIMEOUT = 60
+
+
+@dataclass(frozen=True)
+class ArchiveSpec:
+    """A pinned third-party archive"""
+
+    name: str
+    version: str
+    url: str
+    sha256: Optional[str] = None  # None records the first download's
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}-{self.version}"
+
+
+class ArchiveCache:
+    """Local cache of downloaded and unpacked third-party archives"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(
+            root
+            or os.environ.get("NXTSCAPE_ARCHIVE_CACHE_DIR")
+            or Path.home() / ".cache" / "nxtscape" / "archives"
+        )
+        self.blobs_dir = self.root / "sha256"
+        self.extracted_dir = self.root / "extracted"
+        self.index_file = self.root / "index.json"
+        self.installs_file = self.root / "installs.json"
+
+    def _load_json(self, path: Path) -> Dict[str, str]:
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _update_json(self, path: Path, key: str, value: str):
+        data = self._load_json(path)
+        data[key] = value
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(data, indent=2, sort_keys=True))
+        os.replace(tmp_file, path)
+
+    def digest_for(self, spec: ArchiveSpec) -> Optional[str]:
+        """The pinned checksum, or the one recorded for this version"""
+        return spec.sha256 or self._load_json(self.index_file).get(spec.key)
+
+    def fetch(self, spec: ArchiveSpec) -> Tuple[Path, str]:
+        """Return (verified archive, sha256), downloading on a cache miss"""
+        expected = self.digest_for(spec)
+        if expected and (self.blobs_dir / expected).exists():
+            return self.blobs_dir / expected, expected
+
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.blobs_dir / f".{spec.key}.{os.getpid()}.tmp"
+        log_info(f"Downloading {spec.name} from {spec.url}...")
+        sha256 = hashlib.sha256()
+        try:
+            with urllib.request.urlopen(
+                spec.url, timeout=DOWNLOAD_TIMEOUT
+            ) as response, open(tmp_file, "wb") as f:
+                while chunk := response.read(CHUNK_SIZE):
+                    sha256.update(chunk)
+                    f.write(chunk)
+            digest = sha256.hexdigest()
+            if expected and digest != expected:
+                raise ValueError(
+                    f"Checksum mismatch for {spec.key}: "
+                    f"expected {expected}, got {digest}"
+                )
+            os.replace(tmp_file, self.blobs_dir / digest)
+        finally:
+            tmp_file.unlink(missing_ok=True)
+
+        if not expected:
+            self._update_json(self.index_file, spec.key, digest)
+            log_warning(
+                f"{spec.key} has no pinned checksum; recorded sha256 {digest} "
+                "and will require it from now on"
+            )
+        return self.blobs_dir / digest, digest
+
+    def extract(self, spec: ArchiveSpec) -> Tuple[Path, str]:
+        """Return (versioned directory holding the unpacked archive, sha256)"""
+        archive, digest = self.fetch(spec)
+        target = self.extracted_dir / f"{spec.key}-{digest[:12]}"
+        if target.exists():
+            return target, digest
+
+        # Unpack next to the target and rename, so a directory that exists
+        # is always complete
+        self.extracted_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.extracted_dir / f".{target.name}.{os.getpid()}.tmp"
+        safe_rmtree(tmp_dir)
+        log_info(f"Extracting {spec.name} {spec.version}...")
+        with tarfile.open(archive) as tar:
+            tar.extractall(tmp_dir, filter="data")
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # Another build unpacked it first
+            safe_rmtree(tmp_dir)
+        return target, digest
+
+    def install(self, spec: ArchiveSpec, dest: Path) -> bool:
+        """Make `dest` hold the unpacked archive
+
+        Returns False without touching anything when `dest` already holds
+        this version and checksum. Stamps live in the cache, keyed by the
+        destination, so nothing extra is written into the checkout.
+        """
+        dest_key = str(Path(dest).resolve())
+        digest = self.digest_for(spec)
+        stamps = self._load_json(self.installs_file)
+        if digest and dest.is_dir() and stamps.get(dest_key) == f"{spec.key} {digest}":
+            return False
+
+        source, digest = self.extract(spec)
+        if dest.exists():
+            safe_rmtree(dest)
+        shutil.copytree(source, dest, symlinks=True)
+        self._update_json(self.installs_file, dest_key, f"{spec.key} {digest}")
+        return True
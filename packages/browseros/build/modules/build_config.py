@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Build configuration loader for Nxtscape build system
+
+Merges the defaults, a YAML build config, the gn flags file it selects
+and CLI overrides into one validated, immutable BuildConfig. The
+compiled result is cached as JSON keyed by the hashes of every input
+file, so an unchanged config is loaded without parsing YAML.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from utils import get_platform, join_paths, log_warning
+
+# Bump when BuildConfig or the merge rules change to drop old cache entries
+SCHEMA_VERSION = 2
+
+BUILD_TYPES = ("debug", "release")
+ARCHITECTURES = ("arm64", "x64")
+CLEAN_MODES = ("full", "targeted")
+
+# YAML section -> {key: BuildConfig field}
+STEP_KEYS = {
+    "clean": "clean",
+    "clean_mode": "clean_mode",
+    "clean_out_dir": "clean_out_dir",
+    "git_setup": "git_setup",
+    "apply_patches": "apply_patches",
+    "build": "build",
+    "sign": "sign",
+    "package": "package",
+}
+
+
+class ConfigError(ValueError):
+    """Raised when a build configuration is invalid"""
+
+
+@dataclass(frozen=True)
+class BuildConfig:
+    """Fully merged build configuration"""
+
+    build_type: str = "debug"
+    architectures: Tuple[str, ...] = ()  # Empty: platform default
+    universal: bool = False
+    clean: bool = False
+    clean_mode: str = "full"
+    clean_out_dir: bool = False  # Targeted clean also deletes the out dir
+    git_setup: bool = False
+    apply_patches: bool = False
+    build: bool = False
+    sign: bool = False
+    package: bool = False
+    slack_notifications: bool = False
+    chromium_src: Optional[Path] = None
+    chromium_src_from: str = ""  # "config" or "cli"
+    certificate_name: Optional[str] = None
+    gn_flags_file: Optional[Path] = None
+    gn_flags: str = ""  # Contents of gn_flags_file
+
+    def to_json(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for key in ("chromium_src", "gn_flags_file"):
+            if data[key] is not None:
+                data[key] = str(data[key])
+        return data
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "BuildConfig":
+        data = dict(data)
+        for key in ("chromium_src", "gn_flags_file"):
+            if data.get(key) is not None:
+                data[key] = Path(data[key])
+        data["architectures"] = tuple(data["architectures"])
+        return cls(**data)
+
+
+def parse_gn_args(content: str) -> List[Tuple[str, str]]:
+    """Parse `name = value` assignments from a gn args file"""
+    args = []
+    for line in content.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if "=" not in line:
+            continue
+        name, value = line.split("=", 1)
+        args.append((name.strip(), value.strip()))
+    return args
+
+
+def _merge_yaml(values: Dict[str, Any], config: Dict[str, Any], root_dir: Path):
+    """Apply a YAML build config on top of `values`"""
+    build = config.get("build") or {}
+    if "type" in build:
+        values["build_type"] = build["type"]
+    if "architectures" in build:
+        values["architectures"] = tuple(build["architectures"] or ())
+    elif "architecture" in build:
+        values["architectures"] = (build["architecture"],)
+    if "universal" in build:
+        values["universal"] = build["universal"]
+
+    steps = config.get("steps") or {}
+    for key, field_name in STEP_KEYS.items():
+        if key in steps:
+            values[field_name] = steps[key]
+
+    notifications = config.get("notifications") or {}
+    if "slack" in notifications:
+        values["slack_notifications"] = notifications["slack"]
+
+    gn_flags = config.get("gn_flags") or {}
+    if "file" in gn_flags:
+        values["gn_flags_file"] = join_paths(root_dir, gn_flags["file"])
+
+    paths = config.get("paths") or {}
+    if "chromium_src" in paths:
+        values["chromium_src"] = Path(paths["chromium_src"])
+        values["chromium_src_from"] = "config"
+
+    signing = config.get("signing") or {}
+    if "certificate_name" in signing:
+        values["certificate_name"] = signing["certificate_name"]
+
+
+def _validate(values: Dict[str, Any]):
+    errors = []
+    if values["build_type"] not in BUILD_TYPES:
+        errors.append(f"build.type must be one of {BUILD_TYPES}, got {values['build_type']!r}")
+    for arch in values["architectures"]:
+        if arch not in ARCHITECTURES:
+            errors.append(f"unknown architecture {arch!r} (expected {ARCHITECTURES})")
+    if values["clean_mode"] not in CLEAN_MODES:
+        errors.append(f"steps.clean_mode must be one of {CLEAN_MODES}")
+    for name in (
+        "universal",
+        "clean",
+        "clean_out_dir",
+        "git_setup",
+        "apply_patches",
+        "build",
+        "sign",
+        "package",
+        "slack_notifications",
+    ):
+        if not isinstance(values[name], bool):
+            errors.append(f"{name} must be true or false, got {values[name]!r}")
+    if values["universal"] and len(values["architectures"]) < 2:
+        log_warning("universal: true has no effect with fewer than two architectures")
+    if errors:
+        raise ConfigError("Invalid build configuration:\n  " + "\n  ".join(errors))
+
+
+def compile_build_config(
+    config_file: Optional[Path],
+    root_dir: Path,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Tuple[BuildConfig, List[Path]]:
+    """Merge defaults < YAML < CLI overrides and read the gn flags
+
+    Returns the config and the files it was built from.
+    """
+    values = {f.name: f.default for f in fields(BuildConfig)}
+    deps = []
+
+    if config_file:
+        import yaml
+
+        with open(config_file, "r") as f:
+            _merge_yaml(values, yaml.safe_load(f) or {}, root_dir)
+        deps.append(Path(config_file))
+
+    for name, value in (overrides or {}).items():
+        if name == "architectures":
+            value = tuple(value)
+        values[name] = value
+        if name == "chromium_src":
+            values["chromium_src_from"] = "cli"
+
+    _validate(values)
+
+    if values["gn_flags_file"] is None:
+        values["gn_flags_file"] = join_paths(
+            root_dir,
+            "build",
+            "config",
+            "gn",
+            f"flags.{get_platform()}.{values['build_type']}.gn",
+        )
+    gn_flags_file = values["gn_flags_file"]
+    if gn_flags_file.exists():
+        values["gn_flags"] = gn_flags_file.read_text()
+        seen = set()
+        for name, _ in parse_gn_args(values["gn_flags"]):
+            if name in seen:
+                log_warning(f"gn arg '{name}' is set more than once in {gn_flags_file.name}")
+            seen.add(name)
+        deps.append(gn_flags_file)
+    elif values["build"]:
+        raise ConfigError(f"GN flags file not found: {gn_flags_file}")
+
+    return BuildConfig(**values), deps
+
+
+def cli_overrides(**values) -> Dict[str, Any]:
+    """Keep the CLI values that differ from the BuildConfig defaults
+
+    Flags left at their defaults don't override the YAML config.
+    """
+    defaults = {f.name: f.default for f in fields(BuildConfig)}
+    return {
+        name: value
+        for name, value in values.items()
+        if value is not None and value != defaults[name]
+    }
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_build_config(
+    config_file: Optional[Path],
+    root_dir: Path,
+    overrides: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[Path] = None,
+) -> BuildConfig:
+    """Return the compiled build config, from cache when inputs are unchanged
+
+    The cache entry is keyed by the config file's hash and the overrides,
+    and is only used while every file it was compiled from (the config
+    and its gn flags file) still has the recorded hash.
+    """
+    cache_dir = cache_dir or Path.home() / ".cache" / "nxtscape" / "build_config"
+    key_data = {
+        "schema": SCHEMA_VERSION,
+        "platform": get_platform(),
+        "root_dir": str(Path(root_dir).resolve()),
+        "config_file": str(Path(config_file).resolve()) if config_file else None,
+        "config_hash": _file_hash(Path(config_file)) if config_file else None,
+        "overrides": {k: str(v) for k, v in sorted((overrides or {}).items())},
+    }
+    key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+    cache_file = cache_dir / f"{key}.json"
+
+    try:
+        entry = json.loads(cache_file.read_text())
+        if all(
+            Path(path).exists() and _file_hash(Path(path)) == digest
+            for path, digest in entry["deps"].items()
+        ):
+            return BuildConfig.from_json(entry["config"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    config, deps = compile_build_config(config_file, root_dir, overrides)
+
+    entry = {
+        "deps": {str(path.resolve()): _file_hash(path) for path in deps},
+        "config": config.to_json(),
+    }
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(entry, sort_keys=True))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        log_warning(f"Could not cache build config: {e}")
+    return config
@@ -6,6 +6,7 @@ Chromium file replacement module for Nxtscape build system
 import sys
 import shutil
 from pathlib import Path
+from typing import List
 from context import BuildContext
 from utils import log_info, log_success, log_error, log_warning
 
@@ -88,6 +89,21 @@ def replace_chromium_files(ctx: BuildContext, replacements=None) -> bool:
     return True
 
 
+def list_replacement_targets(ctx: BuildContext) -> List[str]:
+    """Chromium paths that chromium_files/ may overwrite (any build type)"""
+    replacement_dir = ctx.get_chromium_replace_files_dir()
+    if not replacement_dir.exists():
+        return []
+    targets = set()
+    for src_file in replacement_dir.rglob("*"):
+        if src_file.is_file():
+            relative = src_file.relative_to(replacement_dir).as_posix()
+            if src_file.suffix in [".debug", ".release"]:
+                relative = relative.rsplit(".", 1)[0]
+            targets.add(relative)
+    return sorted(targets)
+
+
 def add_file_to_replacements(
     file_path: Path, chromium_src: Path, root_dir: Path
 ) -> bool:
@@ -1,26 +1,50 @@
 #!/usr/bin/env python3
 """
 Clean module for Nxtscape build system
+
+The full clean resets the whole checkout and deletes the out dir. The
+targeted clean only reverts the paths our tooling writes (chromium_patches,
+chromium_files replacements, string replacements and copied resources)
+and keeps the out dir, so the next build stays incremental.
 """
 
 import os
-import shutil
+import subprocess
 from pathlib import Path
+from typing import List
 from context import BuildContext
-from utils import run_command, log_info, log_success, safe_rmtree
+from utils import (
+    run_command,
+    log_info,
+    log_success,
+    prune_empty_dirs,
+    safe_rmtree,
+)
+
 
+def clean(
+    ctx: BuildContext, targeted: bool = False, clean_out_dir: bool = False
+) -> bool:
+    """Clean build artifacts
 
-def clean(ctx: BuildContext) -> bool:
-    """Clean build artifacts"""
+    A targeted clean keeps the out dir unless `clean_out_dir` is set.
+    """
     log_info("🧹 Cleaning build artifacts...")
 
     out_path = ctx.chromium_src / ctx.out_dir
-    if out_path.exists():
-        safe_rmtree(out_path)
+    if out_path.exists() and (clean_out_dir or not targeted):
+        # Renamed away instantly, deleted by a background process
+        safe_rmtree(out_path, background=True)
         log_success("Cleaned build directory")
+    elif out_path.exists():
+        log_info(f"Keeping build directory: {ctx.out_dir}")
 
-    log_info("\n🔀 Resetting git branch and removing all tracked files...")
-    git_reset(ctx)
+    if targeted:
+        log_info("\n🔀 Reverting files touched by the build tooling...")
+        targeted_git_reset(ctx)
+    else:
+        log_info("\n🔀 Resetting git branch and removing all tracked files...")
+        git_reset(ctx)
 
     log_info("\n🧹 Cleaning Sparkle build artifacts...")
     clean_sparkle(ctx)
@@ -64,3 +88,100 @@ def git_reset(ctx: BuildContext) -> bool:
     os.chdir(ctx.root_dir)
     log_success("Git reset and clean complete")
     return True
+
+
+def get_touched_paths(ctx: BuildContext) -> List[str]:
+    """Chromium paths (files or directories) our build steps write to"""
+    from modules.chromium_replace import list_replacement_targets
+    from modules.dev_cli.apply import list_patched_paths
+    from modules.resources import list_resource_destinations
+    from modules.string_replaces import list_target_files
+
+    paths = set(list_patched_paths(ctx.get_dev_patches_dir()))
+    paths.update(list_replacement_targets(ctx))
+    paths.update(list_target_files(ctx))
+    paths.update(list_resource_destinations(ctx))
+    return sorted(p for p in paths if p)
+
+
+# Pathspecs per git invocation (keeps argv well below OS limits)
+PATHSPEC_CHUNK = 500
+
+
+def git_pathspec_output(
+    chromium_src: Path, args: List[str], pathspecs: List[str]
+) -> List[str]:
+    """Run a git query over pathspecs in chunks, return NUL-separated fields"""
+    fields = []
+    for i in range(0, len(pathspecs), PATHSPEC_CHUNK):
+        result = subprocess.run(
+            ["git", *args, "-z", "--", *pathspecs[i : i + PATHSPEC_CHUNK]],
+            capture_output=True,
+            text=True,
+            cwd=chromium_src,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        fields.extend(f for f in result.stdout.split("\0") if f)
+    return fields
+
+
+def git_with_pathspecs(chromium_src: Path, args: List[str], paths: List[str]):
+    """Run a git command with literal pathspecs passed on stdin"""
+    subprocess.run(
+        ["git", *args, "--pathspec-from-file=-", "--pathspec-file-nul"],
+        input="\0".join(f":(literal){p}" for p in paths),
+        capture_output=True,
+        text=True,
+        cwd=chromium_src,
+        check=True,
+    )
+
+
+def targeted_git_reset(ctx: BuildContext) -> bool:
+    """Revert only the paths our tooling touched
+
+    Git only looks at the given pathspecs, so nothing outside them is
+    stat'ed. Modified, deleted or staged tracked files are checked out from
+    HEAD; added and untracked (including ignored) files under them are
+    removed.
+    """
+    pathspecs = [f":(literal){p}" for p in get_touched_paths(ctx)]
+    if not pathspecs:
+        log_info("No touched paths to revert")
+        return True
+
+    # --name-status -z yields alternating status and path fields
+    status = git_pathspec_output(
+        ctx.chromium_src, ["diff", "HEAD", "--name-status", "--no-renames"], pathspecs
+    )
+    changes = list(zip(status[::2], status[1::2]))
+    restored = [path for code, path in changes if code != "A"]
+    added = [path for code, path in changes if code == "A"]
+    untracked = git_pathspec_output(
+        ctx.chromium_src, ["ls-files", "--others"], pathspecs
+    )
+
+    if changes:
+        # Unstage first so the checkout and removals leave a clean index
+        git_with_pathspecs(
+            ctx.chromium_src, ["reset", "-q", "HEAD"], restored + added
+        )
+    if restored:
+        git_with_pathspecs(ctx.chromium_src, ["checkout", "HEAD"], restored)
+
+    removed = 0
+    for relative in added + untracked:
+        path = ctx.chromium_src / relative
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        prune_empty_dirs(path.parent, ctx.chromium_src)
+
+    log_success(
+        f"Reverted {len(restored)} tracked file(s), removed {removed} "
+        f"untracked file(s) across {len(pathspecs)} touched path(s)"
+    )
+    return True
@@ -9,8 +9,10 @@ import shutil
 import multiprocessing
 from pathlib import Path
 from context import BuildContext
+from modules.compiler_cache import CompilerCache, log_cache_stats
+from modules.job_control import JobController, run_with_adaptive_jobs
+from modules.ninja_log import NinjaLog, report_build_hotspots
 from utils import (
-    run_command,
     log_info,
     log_success,
     log_warning,
@@ -51,12 +53,39 @@ def build(ctx: BuildContext) -> bool:
 
     os.chdir(ctx.chromium_src)
 
-    # Use default autoninja parallelism (it handles this automatically)
+    # Size -j to available memory and adapt it to memory pressure during the
+    # build (JOBS=N in the environment pins it instead)
     autoninja_cmd = "autoninja.bat" if IS_WINDOWS else "autoninja"
-    log_info("Using default autoninja parallelism")
+    controller = JobController.from_env()
+    mode = "adaptive" if controller.adaptive else "fixed"
+    if controller.ninja_args():
+        log_info(f"Using {' '.join(controller.ninja_args())} ({mode})")
+    else:
+        log_info(f"Using autoninja's default job count ({mode})")
+
+    # Shared compiler cache (cc_wrapper is set by configure)
+    cache = CompilerCache.detect(ctx)
+    if cache:
+        cache.setup_environment(ctx)
+        cache_stats = cache.read_stats()
+
+    # Build chrome and chromedriver on Windows. The hotspot report covers
+    # what ninja logs from here on, across job controller restarts.
+    ninja_log = NinjaLog.for_context(ctx)
+    run_with_adaptive_jobs(
+        lambda jobs: [autoninja_cmd, "-C", ctx.out_dir, *jobs, "chrome", "chromedriver"],
+        controller,
+        before_run=ninja_log.mark_run,
+    )
+
+    if cache:
+        log_cache_stats(cache_stats, cache.read_stats(), cache.tool)
 
-    # Build chrome and chromedriver on Windows
-    run_command([autoninja_cmd, "-C", ctx.out_dir, "chrome", "chromedriver"])
+    # Post-build hotspot report from .ninja_log (never fails the build)
+    try:
+        report_build_hotspots(ctx, ninja_log)
+    except Exception as e:
+        log_warning(f"Failed to analyze ninja log: {e}")
 
     # Rename Chromium.app to Nxtscape.app
     app_path = ctx.get_chromium_app_path()
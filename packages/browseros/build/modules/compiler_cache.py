@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Compiler cache module for Nxtscape build system
+
+Wires a local compiler cache (ccache or sccache) into the build through
+gn's cc_wrapper. One cache directory is shared by every out dir and
+architecture, and paths are hashed relative to the Chromium checkout so
+a clean rebuild of an unchanged tree is served from the cache.
+
+Environment:
+  NXTSCAPE_CC_WRAPPER       ccache, sccache or none (default: auto-detect)
+  NXTSCAPE_CACHE_DIR        Shared cache directory
+  NXTSCAPE_CACHE_MAX_SIZE   Cache size limit (default: 50G)
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+from context import BuildContext
+from utils import log_info, log_warning
+
+# Preferred order when auto-detecting
+CACHE_TOOLS = ("ccache", "sccache")
+
+DEFAULT_MAX_SIZE = "50G"
+
+_CC_WRAPPER_RE = re.compile(r"^\s*cc_wrapper\s*=.*$\n?", re.MULTILINE)
+
+
+@dataclass
+class CompilerCache:
+    """A detected compiler cache and its shared cache directory"""
+
+    tool: str
+    path: str
+    cache_dir: Path
+    max_size: str = DEFAULT_MAX_SIZE
+
+    @classmethod
+    def detect(cls, ctx: BuildContext) -> Optional["CompilerCache"]:
+        """Find the configured or first installed cache tool"""
+        wanted = os.environ.get("NXTSCAPE_CC_WRAPPER", "").strip().lower()
+        if wanted in ("none", "off", "0"):
+            return None
+
+        for tool in (wanted,) if wanted else CACHE_TOOLS:
+            path = shutil.which(tool)
+            if path:
+                cache_dir = Path(
+                    os.environ.get("NXTSCAPE_CACHE_DIR")
+                    or Path.home() / ".cache" / "nxtscape" / tool
+                )
+                max_size = os.environ.get("NXTSCAPE_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE)
+                return cls(tool, path, cache_dir, max_size)
+
+        if wanted:
+            log_warning(f"Compiler cache '{wanted}' not found on PATH")
+        return None
+
+    def setup_environment(self, ctx: BuildContext):
+        """Point the cache at the shared directory and apply the size limit"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if self.tool == "ccache":
+            os.environ["CCACHE_DIR"] = str(self.cache_dir)
+            # Hash paths relative to the checkout so out dirs share entries
+            # (ccache ignores a relative base dir)
+            os.environ["CCACHE_BASEDIR"] = str(ctx.chromium_src.resolve())
+            os.environ["CCACHE_NOHASHDIR"] = "1"
+            os.environ.setdefault("CCACHE_CPP2", "yes")
+            os.environ.setdefault(
+                "CCACHE_SLOPPINESS", "time_macros,include_file_mtime,include_file_ctime"
+            )
+            subprocess.run(
+                [self.path, f"--max-size={self.max_size}"],
+                capture_output=True,
+                text=True,
+            )
+        else:
+            os.environ["SCCACHE_DIR"] = str(self.cache_dir)
+            os.environ["SCCACHE_CACHE_SIZE"] = self.max_size
+            os.environ.setdefault("SCCACHE_IDLE_TIMEOUT", "0")
+            subprocess.run([self.path, "--start-server"], capture_output=True)
+
+    def read_stats(self) -> Dict[str, int]:
+        """Return cumulative hit/miss counters from the cache tool"""
+        try:
+            if self.tool == "ccache":
+                result = subprocess.run(
+                    [self.path, "--print-stats"], capture_output=True, text=True
+                )
+                return parse_ccache_stats(result.stdout)
+            result = subprocess.run(
+                [self.path, "--show-stats", "--stats-format=json"],
+                capture_output=True,
+                text=True,
+            )
+            return parse_sccache_stats(result.stdout)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+
+def parse_ccache_stats(output: str) -> Dict[str, int]:
+    """Parse `ccache --print-stats` (ccache 3.7 and 4.x key names)"""
+    values = {}
+    for line in output.splitlines():
+        parts = line.split("\t")
+        if len(parts) == 2 and parts[1].strip().isdigit():
+            values[parts[0]] = int(parts[1])
+    hits = sum(
+        values.get(key, 0)
+        for key in (
+            "direct_cache_hit",
+            "preprocessed_cache_hit",
+            "cache_hit_direct",
+            "cache_hit_preprocessed",
+        )
+    )
+    return {"hits": hits, "misses": values.get("cache_miss", 0)}
+
+
+def parse_sccache_stats(output: str) -> Dict[str, int]:
+    """Parse `sccache --show-stats --stats-format=json`"""
+    if not output.strip():
+        return {"hits": 0, "misses": 0}
+    stats = json.loads(output).get("stats", {})
+
+    def total(key):
+        counts = stats.get(key, {}).get("counts", {})
+        return sum(counts.values())
+
+    return {"hits": total("cache_hits"), "misses": total("cache_misses")}
+
+
+def apply_cc_wrapper(args_content: str, cache: Optional[CompilerCache]) -> str:
+    """Replace any cc_wrapper in the gn args with the detected cache
+
+    Flag files may hard-code cc_wrapper; it is dropped when the tool is
+    not installed so gn gen doesn't produce an unbuildable out dir.
+    """
+    args_content = _CC_WRAPPER_RE.sub("", args_content)
+    if cache:
+        args_content += f'cc_wrapper = "{cache.tool}"\n'
+    return args_content
+
+
+def log_cache_stats(before: Dict[str, int], after: Dict[str, int], tool: str):
+    """Log the hit rate of one build from two stats snapshots"""
+    hits = after["hits"] - before["hits"]
+    misses = after["misses"] - before["misses"]
+    total = hits + misses
+    if total <= 0:
+        log_info(f"🗄️  Compiler cache ({tool}): no cacheable compiles")
+        return
+    log_info(
+        f"🗄️  Compiler cache ({tool}): {hits} hits, {misses} misses "
+        f"({100.0 * hits / total:.1f}% hit rate)"
+    )
@@ -8,11 +8,20 @@ import sys
 from pathlib import Path
 from typing import Optional
 from context import BuildContext
+from modules.compiler_cache import CompilerCache, apply_cc_wrapper
 from utils import run_command, log_info, log_error, log_success, join_paths, IS_WINDOWS
 
 
-def configure(ctx: BuildContext, gn_flags_file: Optional[Path] = None) -> bool:
-    """Configure the build with GN"""
+def configure(
+    ctx: BuildContext,
+    gn_flags_file: Optional[Path] = None,
+    gn_flags: Optional[str] = None,
+) -> bool:
+    """Configure the build with GN
+
+    gn_flags is the already-read contents of gn_flags_file, as carried by
+    the compiled BuildConfig; without it the flags file is read here.
+    """
     log_info(f"\n⚙️  Configuring {ctx.build_type} build for {ctx.architecture}...")
 
     # Create output directory
@@ -25,15 +34,23 @@ def configure(ctx: BuildContext, gn_flags_file: Optional[Path] = None) -> bool:
     else:
         flags_file = join_paths(ctx.root_dir, gn_flags_file)
 
-    if not flags_file.exists():
-        log_error(f"GN flags file not found: {flags_file}")
-        raise FileNotFoundError(f"GN flags file not found: {flags_file}")
+    if gn_flags is None:
+        if not flags_file.exists():
+            log_error(f"GN flags file not found: {flags_file}")
+            raise FileNotFoundError(f"GN flags file not found: {flags_file}")
+        gn_flags = flags_file.read_text()
 
     args_file = ctx.get_gn_args_file()
 
-    args_content = flags_file.read_text()
+    args_content = gn_flags
     args_content += f'\ntarget_cpu = "{ctx.architecture}"\n'
 
+    # Compile through the local compiler cache when one is installed
+    cache = CompilerCache.detect(ctx)
+    args_content = apply_cc_wrapper(args_content, cache)
+    if cache:
+        log_info(f"🗄️  Using compiler cache: {cache.tool} ({cache.cache_dir})")
+
     args_file.write_text(args_content)
 
     # Run gn gen
@@ -3,4 +3,4 @@ Dev CLI modules for Chromium patch management
 """
 
 # This will be populated as modules are created
-__all__ = ["extract", "apply", "feature", "utils"]
+__all__ = ["extract", "apply", "feature", "ninja", "utils"]
@@ -4,15 +4,24 @@ Apply module - Apply patches to Chromium source
 Simple and straightforward patch application with minimal error handling.
 """
 
+import os
+import subprocess
+import threading
 import click
-import yaml
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from context import BuildContext
-from modules.dev_cli.utils import run_git_command, GitError
+from modules.dev_cli.utils import CommitWriter, run_git_command, GitError
+from modules.feature_registry import FeatureRegistry
 from utils import log_info, log_error, log_success, log_warning
 
 
+# `git apply --3way` writes the index, so only one may run at a time
+_index_lock = threading.Lock()
+
+
 # Core Functions - Can be called programmatically or from CLI
 def find_patch_files(patches_dir: Path) -> List[Path]:
     """Find all valid patch files in a directory.
@@ -39,6 +48,37 @@ def find_patch_files(patches_dir: Path) -> List[Path]:
     )
 
 
+def list_patched_paths(patches_dir: Path) -> List[str]:
+    """Chromium paths touched by the patches in a directory.
+
+    Besides the patched files this maps .deleted and .binary markers to
+    the file they stand for, and .rename markers to both the new and the
+    original path, so a reset can restore deleted and renamed files.
+
+    Args:
+        patches_dir: Directory to search for patches
+
+    Returns:
+        Sorted chromium-relative paths
+    """
+    if not patches_dir.exists():
+        return []
+
+    paths = {
+        p.relative_to(patches_dir).as_posix() for p in find_patch_files(patches_dir)
+    }
+    for suffix in (".deleted", ".binary", ".rename"):
+        for marker in patches_dir.rglob(f"*{suffix}"):
+            if not marker.is_file() or marker.name.startswith("."):
+                continue
+            paths.add(marker.relative_to(patches_dir).as_posix()[: -len(suffix)])
+            if suffix == ".rename":
+                for line in marker.read_text(errors="replace").splitlines():
+                    if line.startswith("Renamed from:"):
+                        paths.add(line.split(":", 1)[1].strip())
+    return sorted(paths)
+
+
 def apply_single_patch(
     patch_path: Path,
     chromium_src: Path,
@@ -85,18 +125,19 @@ def apply_single_patch(
 
         if result.returncode != 0:
             # Try with 3-way merge
-            result = run_git_command(
-                [
-                    "git",
-                    "apply",
-                    "--ignore-whitespace",
-                    "--whitespace=nowarn",
-                    "-p1",
-                    "--3way",
-                    str(patch_path),
-                ],
-                cwd=chromium_src,
-            )
+            with _index_lock:
+                result = run_git_command(
+                    [
+                        "git",
+                        "apply",
+                        "--ignore-whitespace",
+                        "--whitespace=nowarn",
+                        "-p1",
+                        "--3way",
+                        str(patch_path),
+                    ],
+                    cwd=chromium_src,
+                )
 
         if result.returncode == 0:
             log_success(f"  ✓ Applied: {display_path}")
@@ -327,19 +368,17 @@ def apply_feature_patches(
         log_error("No features.yaml found")
         return 0, []
 
-    with open(features_path) as f:
-        data = yaml.safe_load(f)
+    registry = FeatureRegistry.load(features_path)
+    feature = registry.get(feature_name)
 
-    features = data.get("features", {})
-
-    if feature_name not in features:
+    if not feature:
         log_error(f"Feature '{feature_name}' not found")
         log_info("Available features:")
-        for name in features:
+        for name in registry.features:
             log_info(f"  - {name}")
         return 0, []
 
-    file_list = features[feature_name].get("files", [])
+    file_list = feature.files
 
     if not file_list:
         log_warning(f"Feature '{feature_name}' has no files")
@@ -379,6 +418,184 @@ def apply_feature_patches(
     return applied, failed
 
 
+# Patches that no feature in features.yaml owns
+UNASSIGNED = "(unassigned)"
+
+
+@dataclass
+class FeatureApply:
+    """Patches routed to one feature and the outcome of applying them"""
+
+    name: str
+    description: str
+    # (patch path, Chromium-relative file path)
+    patches: List[Tuple[Path, str]]
+    applied: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+
+def plan_feature_apply(
+    registry: FeatureRegistry, patches_dir: Path
+) -> Tuple[List[FeatureApply], List[List[FeatureApply]]]:
+    """Route every patch to its feature and group features into chains
+
+    Each patch belongs to the first feature (in features.yaml order) that
+    lists its file, so no patch is applied twice. Features whose declared
+    files overlap, directly or through directory entries, share a chain
+    and are applied in series order; separate chains are independent.
+
+    Returns (features in series order, chains).
+    """
+    relative_paths = [
+        p.relative_to(patches_dir).as_posix() for p in find_patch_files(patches_dir)
+    ]
+    grouped, unowned = registry.group_by_feature(relative_paths)
+
+    plans = [
+        FeatureApply(
+            name,
+            registry.get(name).description,
+            [(patches_dir / path, path) for path in paths],
+        )
+        for name, paths in grouped.items()
+    ]
+    if unowned:
+        plans.append(
+            FeatureApply(
+                UNASSIGNED,
+                "patches not listed in features.yaml",
+                [(patches_dir / path, path) for path in unowned],
+            )
+        )
+
+    # Union features that share files; an entry's owners include features
+    # listing it or any directory above it
+    parent = {feature.name: feature.name for feature in registry}
+
+    def find(name: str) -> str:
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for feature in registry:
+        for entry in feature.files:
+            for other in registry.features_for_file(entry):
+                parent[find(other)] = find(feature.name)
+
+    chains: Dict[str, List[FeatureApply]] = {}
+    for plan in plans:
+        root = find(plan.name) if plan.name in parent else plan.name
+        chains.setdefault(root, []).append(plan)
+    return plans, list(chains.values())
+
+
+def _apply_chain(
+    chain: List[FeatureApply], chromium_src: Path, patches_dir: Path, dry_run: bool
+):
+    for plan in chain:
+        for patch_path, file_path in plan.patches:
+            success, _ = apply_single_patch(
+                patch_path, chromium_src, dry_run, patches_dir
+            )
+            (plan.applied if success else plan.failed).append(file_path)
+
+
+def _unstage(chromium_src: Path, paths: List[str]):
+    """Drop index entries `git apply --3way` staged, without a refresh"""
+    result = subprocess.run(
+        ["git", "reset", "-q", "--pathspec-from-file=-", "--pathspec-file-nul"],
+        cwd=chromium_src,
+        input="".join(f"{path}\0" for path in paths),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise GitError(f"git reset failed: {result.stderr.strip()}")
+
+
+def apply_features_patches(
+    build_ctx: BuildContext,
+    commit_each: bool = False,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+) -> Tuple[int, List[str]]:
+    """Apply all patches grouped by feature, independent features in parallel
+
+    With commit_each, one commit per feature is created after everything
+    is applied, in features.yaml order (unassigned patches last), so the
+    history doesn't depend on which feature finished first.
+
+    Returns:
+        Tuple of (applied_count, failed_list)
+    """
+    patches_dir = build_ctx.get_dev_patches_dir()
+    if not patches_dir.exists():
+        log_warning(f"Patches directory does not exist: {patches_dir}")
+        return 0, []
+
+    registry = FeatureRegistry.load(build_ctx.get_features_yaml_path())
+    plans, chains = plan_feature_apply(registry, patches_dir)
+
+    if not plans:
+        log_warning("No patch files found")
+        return 0, []
+
+    total = sum(len(plan.patches) for plan in plans)
+    log_info(
+        f"Found {total} patches in {len(plans)} feature(s), "
+        f"{len(chains)} independent chain(s)"
+    )
+    if dry_run:
+        log_info("DRY RUN - No changes will be made")
+
+    chromium_src = build_ctx.chromium_src
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        # list() re-raises any worker exception
+        list(
+            pool.map(
+                lambda chain: _apply_chain(chain, chromium_src, patches_dir, dry_run),
+                chains,
+            )
+        )
+
+    if commit_each and not dry_run:
+        applied_paths = [path for plan in plans for path in plan.applied]
+        try:
+            if applied_paths:
+                _unstage(chromium_src, applied_paths)
+            writer = CommitWriter(chromium_src)
+            for plan in plans:
+                if not plan.applied:
+                    continue
+                message = f"Apply {plan.name}: {plan.description}"
+                if writer.commit(plan.applied, message):
+                    log_success(f"📝 Created commit: {message}")
+        except GitError as e:
+            log_error(f"Failed to create feature commits: {e}")
+
+    # Summary, in series order
+    applied = 0
+    failed = []
+    for plan in plans:
+        applied += len(plan.applied)
+        failed.extend(plan.failed)
+        status = f"{len(plan.applied)}/{len(plan.patches)} applied"
+        if plan.failed:
+            log_warning(f"  {plan.name}: {status}")
+        else:
+            log_info(f"  {plan.name}: {status}")
+
+    log_info(f"\nSummary: {applied} applied, {len(failed)} failed")
+
+    if failed:
+        log_error("Failed patches:")
+        for p in failed:
+            log_error(f"  - {p}")
+
+    return applied, failed
+
+
 # CLI Commands - Thin wrappers around core functions
 @click.group(name="apply")
 def apply_group():
@@ -414,6 +631,38 @@ def apply_all(ctx, commit_each, dry_run):
         ctx.exit(1)
 
 
+@apply_group.command(name="features")
+@click.option(
+    "--commit-each", is_flag=True, help="Create one git commit per feature"
+)
+@click.option("--dry-run", is_flag=True, help="Test patches without applying")
+@click.option("--jobs", "-j", type=int, help="Features applied in parallel")
+@click.pass_context
+def apply_features(ctx, commit_each, dry_run, jobs):
+    """Apply all patches grouped by features.yaml
+
+    Features that share no files are applied in parallel.
+
+    \b
+    Examples:
+      dev apply features
+      dev apply features --commit-each -j 8
+    """
+    chromium_src = ctx.parent.obj.get("chromium_src")
+
+    from dev import create_build_context
+
+    build_ctx = create_build_context(chromium_src)
+    if not build_ctx:
+        return
+
+    applied, failed = apply_features_patches(build_ctx, commit_each, dry_run, jobs)
+
+    # Exit with error code if any patches failed
+    if failed:
+        ctx.exit(1)
+
+
 @apply_group.command(name="feature")
 @click.argument("feature_name")
 @click.option("--commit-each", is_flag=True, help="Create git commit after each patch")
@@ -25,6 +25,7 @@ from modules.dev_cli.utils import (
     get_commit_info,
     get_commit_changed_files,
 )
+from modules.feature_registry import FeatureRegistry
 from utils import log_info, log_error, log_success, log_warning
 
 
@@ -452,6 +453,7 @@ def write_patches(
 
     # Log summary
     log_extraction_summary(file_patches)
+    log_feature_routing(ctx, list(file_patches))
 
     if fail_count > 0:
         log_warning(f"Failed to extract {fail_count} patches")
@@ -461,6 +463,26 @@ def write_patches(
     return success_count
 
 
+def log_feature_routing(ctx: BuildContext, file_paths: List[str]):
+    """Report which features the extracted files belong to"""
+    registry = FeatureRegistry.load(ctx.get_features_yaml_path())
+    if not registry or not file_paths:
+        return
+
+    grouped, unowned = registry.group_by_feature(file_paths)
+    for name, files in grouped.items():
+        log_info(f"  Feature {name}: {len(files)} file(s)")
+    if unowned:
+        log_warning(
+            f"  {len(unowned)} file(s) not in any feature "
+            "(add them with 'dev feature add'):"
+        )
+        for file_path in unowned[:5]:
+            log_warning(f"    - {file_path}")
+        if len(unowned) > 5:
+            log_warning(f"    ... and {len(unowned) - 5} more")
+
+
 def extract_commit_range(
     ctx: BuildContext,
     base_commit: str,
@@ -4,12 +4,15 @@ Feature module - Manage feature-to-file mappings
 Simple feature management with YAML persistence.
 """
 
+import os
+import shutil
 import click
-import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import BinaryIO, Dict, List, Optional, Tuple
 from context import BuildContext
 from modules.dev_cli.utils import get_commit_changed_files, run_git_command
+from modules.feature_registry import Feature, FeatureRegistry, save_features
 from utils import log_info, log_error, log_success, log_warning
 
 
@@ -50,11 +53,8 @@ def add_feature(ctx, feature_name, commit, description):
     # Load or create features.yaml
     features_path = build_ctx.get_features_yaml_path()
 
-    if features_path.exists():
-        with open(features_path) as f:
-            data = yaml.safe_load(f) or {}
-    else:
-        data = {"version": "1.0", "features": {}}
+    registry = FeatureRegistry.load(features_path)
+    data = registry.to_data() if registry.exists else {"version": "1.0", "features": {}}
 
     features = data.get("features", {})
 
@@ -73,8 +73,7 @@ def add_feature(ctx, feature_name, commit, description):
 
     # Save back
     data["features"] = features
-    with open(features_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    save_features(features_path, data)
 
     log_success(f"Feature '{feature_name}' saved")
 
@@ -90,20 +89,15 @@ def list_features(ctx):
         log_warning("No features defined (features.yaml not found)")
         return
 
-    with open(features_path) as f:
-        data = yaml.safe_load(f) or {}
-
-    features = data.get("features", {})
+    registry = FeatureRegistry.load(features_path)
 
-    if not features:
+    if not registry:
         log_warning("No features defined")
         return
 
     log_info("Features:")
-    for name, info in features.items():
-        file_count = len(info.get("files", []))
-        description = info.get("description", "No description")
-        log_info(f"  {name} ({file_count} files) - {description}")
+    for feature in registry:
+        log_info(f"  {feature.name} ({len(feature.files)} files) - {feature.description}")
 
 
 @feature_group.command(name="show")
@@ -117,38 +111,142 @@ def show_feature(ctx, feature_name):
         log_error("No features.yaml found")
         ctx.exit(1)
 
-    with open(features_path) as f:
-        data = yaml.safe_load(f)
-
-    features = data.get("features", {})
+    feature = FeatureRegistry.load(features_path).get(feature_name)
 
-    if feature_name not in features:
+    if not feature:
         log_error(f"Feature '{feature_name}' not found")
         ctx.exit(1)
 
-    info = features[feature_name]
-    files = info.get("files", [])
+    files = feature.files
 
     log_info(f"Feature: {feature_name}")
-    log_info(f"Description: {info.get('description', 'No description')}")
+    log_info(f"Description: {feature.description}")
     log_info(f"Files ({len(files)}):")
 
     for file_path in files:
         log_info(f"  - {file_path}")
 
 
+# Read size when copying patch files into the combined output
+STREAM_CHUNK = 1024 * 1024
+
+
+def collect_feature_patches(
+    feature: Feature, patches_dir: Path
+) -> Tuple[List[Path], List[str]]:
+    """Find a feature's patch files in feature order
+
+    Directory entries expand to every patch below them, sorted. Returns
+    (patch paths, entries without a patch).
+    """
+    patches = []
+    missing = []
+    for file_path in feature.files:
+        if file_path.endswith("/"):
+            found = sorted((patches_dir / file_path).rglob("*.patch"))
+        else:
+            patch_path = patches_dir / f"{file_path}.patch"
+            found = [patch_path] if patch_path.is_file() else []
+        if found:
+            patches.extend(found)
+        else:
+            missing.append(file_path)
+    return patches, missing
+
+
+def stream_feature_patch(feature: Feature, patches: List[Path], out: BinaryIO):
+    """Write the combined patch to `out` one file at a time"""
+    header = f"# Combined patch for feature: {feature.name}\n"
+    header += f"# Files: {len(feature.files)}\n"
+    header += f"# Description: {feature.description}\n\n"
+    out.write(header.encode("utf-8"))
+
+    for i, patch_path in enumerate(patches):
+        if i:
+            out.write(b"\n")
+        with open(patch_path, "rb") as f:
+            shutil.copyfileobj(f, out, STREAM_CHUNK)
+
+
+def write_feature_patch(feature: Feature, patches: List[Path], output_path: Path):
+    """Stream the combined patch into a file, replacing it atomically"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "wb") as out:
+        stream_feature_patch(feature, patches, out)
+    os.replace(tmp_path, output_path)
+
+
+def _log_missing(missing: List[str], prefix: str = ""):
+    log_warning(f"{prefix}Missing patches for {len(missing)} files:")
+    for m in missing[:5]:
+        log_warning(f"{prefix}  - {m}")
+    if len(missing) > 5:
+        log_warning(f"{prefix}  ... and {len(missing) - 5} more")
+
+
+def generate_all_patches(
+    registry: FeatureRegistry,
+    patches_dir: Path,
+    output_dir: Path,
+    workers: Optional[int] = None,
+) -> Tuple[List[str], List[str]]:
+    """Write <feature>.patch for every feature into output_dir in parallel
+
+    Returns (generated feature names, features without any patch), both
+    in features.yaml order.
+    """
+
+    def generate(feature: Feature) -> Tuple[bool, List[str]]:
+        patches, missing = collect_feature_patches(feature, patches_dir)
+        if patches:
+            write_feature_patch(feature, patches, output_dir / f"{feature.name}.patch")
+        return bool(patches), missing
+
+    features = list(registry)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        results = list(pool.map(generate, features))
+
+    generated, empty = [], []
+    for feature, (written, missing) in zip(features, results):
+        if written:
+            generated.append(feature.name)
+            if missing:
+                _log_missing(missing, prefix=f"{feature.name}: ")
+        else:
+            empty.append(feature.name)
+    return generated, empty
+
+
 @feature_group.command(name="generate-patch")
-@click.argument("feature_name")
+@click.argument("feature_name", required=False)
 @click.option("--output", "-o", type=click.Path(), help="Output file path")
+@click.option(
+    "--all", "all_features", is_flag=True, help="Generate a patch for every feature"
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Directory for --all output (one <feature>.patch per feature)",
+)
+@click.option("--jobs", "-j", type=int, help="Parallel workers for --all")
 @click.pass_context
-def generate_patch(ctx, feature_name, output):
+def generate_patch(ctx, feature_name, output, all_features, output_dir, jobs):
     """Generate combined patch for a feature
 
     \b
     Examples:
       dev feature generate-patch llm-chat
       dev feature generate-patch my-feature -o combined.patch
+      dev feature generate-patch --all --output-dir out/feature_patches
     """
+    if all_features == bool(feature_name):
+        log_error("Specify either FEATURE_NAME or --all")
+        ctx.exit(1)
+    if all_features and not output_dir:
+        log_error("--all requires --output-dir")
+        ctx.exit(1)
+
     # Load feature
     features_path = Path.cwd() / "features.yaml"
 
@@ -156,20 +254,7 @@ def generate_patch(ctx, feature_name, output):
         log_error("No features.yaml found")
         ctx.exit(1)
 
-    with open(features_path) as f:
-        data = yaml.safe_load(f)
-
-    features = data.get("features", {})
-
-    if feature_name not in features:
-        log_error(f"Feature '{feature_name}' not found")
-        ctx.exit(1)
-
-    file_list = features[feature_name].get("files", [])
-
-    if not file_list:
-        log_error(f"Feature '{feature_name}' has no files")
-        ctx.exit(1)
+    registry = FeatureRegistry.load(features_path)
 
     # Find patches directory
     patches_dir = Path.cwd() / "chromium_src"
@@ -177,45 +262,74 @@ def generate_patch(ctx, feature_name, output):
         log_error(f"Patches directory not found: {patches_dir}")
         ctx.exit(1)
 
-    # Collect all patches
-    combined_patches = []
-    missing = []
+    if all_features:
+        generated, empty = generate_all_patches(
+            registry, patches_dir, Path(output_dir), jobs
+        )
+        if empty:
+            log_warning(f"No patches found for {len(empty)} feature(s):")
+            for name in empty:
+                log_warning(f"  - {name}")
+        log_success(f"Generated {len(generated)} patch(es) in {output_dir}")
+        return
 
-    for file_path in file_list:
-        patch_path = patches_dir / f"{file_path}.patch"
+    feature = registry.get(feature_name)
 
-        if patch_path.exists():
-            with open(patch_path) as f:
-                combined_patches.append(f.read())
-        else:
-            missing.append(file_path)
+    if not feature:
+        log_error(f"Feature '{feature_name}' not found")
+        ctx.exit(1)
+
+    if not feature.files:
+        log_error(f"Feature '{feature_name}' has no files")
+        ctx.exit(1)
+
+    patches, missing = collect_feature_patches(feature, patches_dir)
 
     if missing:
-        log_warning(f"Missing patches for {len(missing)} files:")
-        for m in missing[:5]:
-            log_warning(f"  - {m}")
-        if len(missing) > 5:
-            log_warning(f"  ... and {len(missing) - 5} more")
+        _log_missing(missing)
 
-    if not combined_patches:
+    if not patches:
         log_error("No patches found to combine")
         ctx.exit(1)
 
-    # Create combined patch with headers
-    header = f"# Combined patch for feature: {feature_name}\n"
-    header += f"# Files: {len(file_list)}\n"
-    header += f"# Description: {features[feature_name].get('description', 'No description')}\n\n"
-
-    combined = header + "\n".join(combined_patches)
-
     # Write output
     if output:
         output_path = Path(output)
-        output_path.write_text(combined)
+        write_feature_patch(feature, patches, output_path)
         log_success(f"Generated patch: {output_path}")
     else:
         # Output to stdout
-        click.echo(combined)
+        click.get_text_stream("stdout").flush()  # Keep log lines before the patch
+        stdout = click.get_binary_stream("stdout")
+        stream_feature_patch(feature, patches, stdout)
+        stdout.write(b"\n")
+        stdout.flush()
+
+
+@feature_group.command(name="owner")
+@click.argument("file_paths", nargs=-1, required=True)
+@click.pass_context
+def feature_owner(ctx, file_paths):
+    """Show which features own files
+
+    \b
+    Examples:
+      dev feature owner chrome/app/theme/chromium/linux/product_logo_64.png
+    """
+    features_path = Path.cwd() / "features.yaml"
+
+    if not features_path.exists():
+        log_error("No features.yaml found")
+        ctx.exit(1)
+
+    registry = FeatureRegistry.load(features_path)
+
+    for file_path in file_paths:
+        owners = registry.features_for_file(file_path)
+        if owners:
+            log_info(f"{file_path}: {', '.join(owners)}")
+        else:
+            log_warning(f"{file_path}: not in any feature")
 
 
 @feature_group.command(name="remove")
@@ -229,20 +343,15 @@ def remove_feature(ctx, feature_name):
         log_error("No features.yaml found")
         ctx.exit(1)
 
-    with open(features_path) as f:
-        data = yaml.safe_load(f)
+    registry = FeatureRegistry.load(features_path)
 
-    features = data.get("features", {})
-
-    if feature_name not in features:
+    if feature_name not in registry:
         log_error(f"Feature '{feature_name}' not found")
         ctx.exit(1)
 
     # Remove and save
-    del features[feature_name]
-    data["features"] = features
-
-    with open(features_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    data = registry.to_data()
+    del data["features"][feature_name]
+    save_features(features_path, data)
 
     log_success(f"Removed feature '{feature_name}'")
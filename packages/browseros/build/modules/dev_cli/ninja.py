@@ -0,0 +1,181 @@
+"""
+Ninja module - Build performance reports and rebuild cost estimates
+
+Thin CLI wrappers around modules.ninja_log and modules.rebuild_cost.
+"""
+
+import json
+import click
+from pathlib import Path
+from modules.ninja_log import (
+    NinjaLog,
+    build_report,
+    diff_reports,
+    list_patched_sources,
+    log_report_summary,
+    write_report,
+)
+from modules.rebuild_cost import estimate_rebuild_cost, log_cost_report
+from modules.dev_cli.utils import get_commit_changed_files, get_range_changed_files
+from utils import log_info, log_error, log_success, log_warning
+
+
+def _select_out_dir(build_ctx, arch):
+    """Point the context at the out dir of another architecture"""
+    if arch:
+        build_ctx.architecture = arch
+        build_ctx.out_dir = str(Path("out") / f"Default_{arch}")
+
+
+@click.group(name="ninja")
+def ninja_group():
+    """Analyze ninja builds and rebuild costs"""
+    pass
+
+
+@ninja_group.command(name="report")
+@click.option("--arch", "-a", help="Architecture of the out dir (default: platform)")
+@click.option("--output", "-o", type=click.Path(path_type=Path), help="Write JSON here")
+@click.option("--limit", "-n", default=20, show_default=True, help="Rows per section")
+@click.pass_context
+def report(ctx, arch, output, limit):
+    """Report hotspots of the last build in the out dir
+
+    \b
+    Examples:
+      dev ninja report
+      dev ninja report --arch arm64 -o before.json
+    """
+    chromium_src = ctx.parent.obj.get("chromium_src")
+
+    from dev import create_build_context
+
+    build_ctx = create_build_context(chromium_src)
+    if not build_ctx:
+        ctx.exit(1)
+
+    _select_out_dir(build_ctx, arch)
+
+    log = NinjaLog.for_context(build_ctx)
+    if not log.refresh():
+        log_error(f"No ninja log entries found at {log.path}")
+        ctx.exit(1)
+
+    result = build_report(log, list_patched_sources(build_ctx), limit=limit)
+    log_report_summary(result, limit=limit)
+
+    if output:
+        write_report(result, output)
+        log_success(f"Report written: {output}")
+
+
+@ninja_group.command(name="diff")
+@click.argument("old_report", type=click.Path(exists=True, path_type=Path))
+@click.argument("new_report", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--threshold",
+    default=0.25,
+    show_default=True,
+    help="Relative slowdown that counts as a regression",
+)
+@click.option(
+    "--min-seconds",
+    default=1.0,
+    show_default=True,
+    help="Ignore changes smaller than this many seconds",
+)
+@click.option("--limit", "-n", default=20, show_default=True, help="Rows to show")
+@click.pass_context
+def diff(ctx, old_report, new_report, threshold, min_seconds, limit):
+    """Compare two ninja reports and list regressions
+
+    \b
+    Examples:
+      dev ninja diff before.json after.json
+      dev ninja diff before.json after.json --threshold 0.1
+    """
+    old = json.loads(old_report.read_text())
+    new = json.loads(new_report.read_text())
+    result = diff_reports(old, new, threshold=threshold, min_seconds=min_seconds)
+
+    for key in ("wall_seconds", "total_step_seconds", "critical_path_seconds"):
+        before, after = result[key]
+        log_info(f"{key:<24} {before:>10.1f}s -> {after:>10.1f}s")
+    log_info(
+        f"Targets: +{result['new_targets']} new, -{result['removed_targets']} removed"
+    )
+
+    if result["regressions"]:
+        log_warning(f"{len(result['regressions'])} target(s) got slower:")
+        for item in result["regressions"][:limit]:
+            log_warning(
+                f"  {item['before']:>8.1f}s -> {item['after']:>8.1f}s  {item['output']}"
+            )
+    else:
+        log_success("No regressions")
+
+    if result["improvements"]:
+        log_info(f"{len(result['improvements'])} target(s) got faster")
+
+
+@ninja_group.command(name="cost")
+@click.argument("files", nargs=-1)
+@click.option("--commit", help="Use the files changed in this commit")
+@click.option(
+    "--range",
+    "commit_range",
+    nargs=2,
+    metavar="BASE HEAD",
+    help="Use the files changed between two commits",
+)
+@click.option("--arch", "-a", help="Architecture of the out dir (default: platform)")
+@click.option("--output", "-o", type=click.Path(path_type=Path), help="Write JSON here")
+@click.option("--limit", "-n", default=20, show_default=True, help="Rows to show")
+@click.pass_context
+def cost(ctx, files, commit, commit_range, arch, output, limit):
+    """Estimate how much a change forces ninja to rebuild
+
+    Without FILES, --commit or --range, all files in chromium_patches/ are
+    estimated.
+
+    \b
+    Examples:
+      dev ninja cost
+      dev ninja cost chrome/browser/ui/browser.h
+      dev ninja cost --commit HEAD
+      dev ninja cost --range HEAD~5 HEAD
+    """
+    chromium_src = ctx.parent.obj.get("chromium_src")
+
+    from dev import create_build_context
+
+    build_ctx = create_build_context(chromium_src)
+    if not build_ctx:
+        ctx.exit(1)
+
+    _select_out_dir(build_ctx, arch)
+
+    if files:
+        targets = list(files)
+    elif commit:
+        targets = get_commit_changed_files(commit, build_ctx.chromium_src)
+    elif commit_range:
+        targets = get_range_changed_files(*commit_range, build_ctx.chromium_src)
+    else:
+        targets = list_patched_sources(build_ctx)
+
+    if not targets:
+        log_error("No files to estimate")
+        ctx.exit(1)
+
+    try:
+        result = estimate_rebuild_cost(build_ctx, targets)
+    except FileNotFoundError as e:
+        log_error(str(e))
+        ctx.exit(1)
+
+    log_cost_report(result, limit=limit)
+
+    if output:
+        write_report(result, output)
+        log_success(f"Report written: {output}")
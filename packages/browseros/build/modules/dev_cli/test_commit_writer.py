@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the plumbing commit writer
+
+Creates commits in a throwaway repository and checks that they contain
+exactly the given files and leave the index consistent with HEAD.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from modules.dev_cli.utils import CommitWriter, create_git_commit, parse_porcelain_z
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _make_repo() -> Path:
+    repo = Path(tempfile.mkdtemp())
+    _git(repo, "init", "-q")
+    for name in ("a.txt", "b.txt", "gone.txt"):
+        (repo / name).write_text(f"{name}\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "base")
+    return repo
+
+
+def test_parse_porcelain_z():
+    """Test status parsing including rename source fields"""
+    output = " M a.txt\0R  new.txt\0old.txt\0?? dir/file name.txt\0"
+    assert parse_porcelain_z(output) == {
+        "a.txt": " M",
+        "new.txt": "R ",
+        "dir/file name.txt": "??",
+    }
+    print("✓ Porcelain parsing test passed")
+
+
+def test_commit_writer():
+    """Test per-feature commits from file lists"""
+    os.environ.update(GIT_ENV)
+    repo = _make_repo()
+    (repo / "a.txt").write_text("a changed\n")
+    (repo / "b.txt").write_text("b changed\n")
+    (repo / "sub").mkdir()
+    (repo / "sub" / "new.txt").write_text("new\n")
+    (repo / "gone.txt").unlink()
+
+    writer = CommitWriter(repo)
+    first = writer.commit(["a.txt", "sub/new.txt", "gone.txt"], "feature: one")
+    second = writer.commit(["b.txt"], "feature: two")
+    assert first and second
+    assert writer.commit(["b.txt"], "feature: empty") is None
+
+    assert _git(repo, "log", "--format=%s").splitlines() == [
+        "feature: two",
+        "feature: one",
+        "base",
+    ]
+    assert _git(repo, "show", "--name-status", "--format=", first).split() == [
+        "M", "a.txt", "D", "gone.txt", "A", "sub/new.txt",
+    ]
+    assert _git(repo, "status", "--porcelain") == ""
+    print("✓ Commit writer test passed")
+
+
+def test_create_git_commit_all_changes():
+    """Test committing every working tree change without a file list"""
+    os.environ.update(GIT_ENV)
+    repo = _make_repo()
+    (repo / "a.txt").write_text("a changed\n")
+    (repo / "untracked.txt").write_text("u\n")
+
+    assert create_git_commit(repo, "all changes")
+    assert _git(repo, "status", "--porcelain") == ""
+    assert _git(repo, "show", "--name-only", "--format=").split() == [
+        "a.txt",
+        "untracked.txt",
+    ]
+    print("✓ Create commit test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_parse_porcelain_z,
+        test_commit_writer,
+        test_create_git_commit_all_changes,
+    ]
+
+    print("Running commit writer tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for per-feature parallel patch application
+
+Checks feature routing and chain scheduling, and that per-feature
+commits come out in features.yaml order.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from context import BuildContext
+from modules.dev_cli.apply import UNASSIGNED, apply_features_patches, plan_feature_apply
+from modules.feature_registry import FeatureRegistry
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+FEATURES_YAML = """features:
+  icons:
+    description: 'patch: icons'
+    files:
+    - chrome/app/theme/
+  sidebar:
+    description: 'patch: sidebar'
+    files:
+    - chrome/browser/sidebar.cc
+  theme-tweak:
+    description: 'patch: theme tweak'
+    files:
+    - chrome/app/theme/logo.txt
+    - chrome/app/theme/extra.txt
+"""
+
+FILES = [
+    "chrome/app/theme/logo.txt",
+    "chrome/app/theme/extra.txt",
+    "chrome/browser/sidebar.cc",
+    "base/other.cc",
+]
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, **GIT_ENV},
+    ).stdout
+
+
+def _make_checkout() -> BuildContext:
+    """A Chromium-like repo plus one patch per file in chromium_patches"""
+    base = Path(tempfile.mkdtemp())
+    root, src = base / "root", base / "src"
+    root.mkdir()
+    (root / "features.yaml").write_text(FEATURES_YAML)
+
+    for relative in FILES:
+        (src / relative).parent.mkdir(parents=True, exist_ok=True)
+        (src / relative).write_text("original\n")
+    _git(src, "init", "-q")
+    _git(src, "add", "-A")
+    _git(src, "commit", "-q", "-m", "base")
+
+    for relative in FILES:
+        (src / relative).write_text("patched\n")
+        patch = root / "chromium_patches" / relative
+        patch.parent.mkdir(parents=True, exist_ok=True)
+        patch.write_text(_git(src, "diff", "--", relative))
+    _git(src, "checkout", "-q", "--", ".")
+    return BuildContext(root_dir=root, chromium_src=src)
+
+
+def test_plan_feature_apply():
+    """Test routing to first owner and chains of overlapping features"""
+    ctx = _make_checkout()
+    registry = FeatureRegistry.load(ctx.get_features_yaml_path())
+    plans, chains = plan_feature_apply(registry, ctx.get_dev_patches_dir())
+
+    assert {plan.name: [path for _, path in plan.patches] for plan in plans} == {
+        "icons": ["chrome/app/theme/extra.txt", "chrome/app/theme/logo.txt"],
+        "sidebar": ["chrome/browser/sidebar.cc"],
+        UNASSIGNED: ["base/other.cc"],
+    }
+    assert sorted([plan.name for plan in chain] for chain in chains) == [
+        [UNASSIGNED],
+        ["icons"],
+        ["sidebar"],
+    ]
+    print("✓ Apply plan test passed")
+
+
+def test_apply_features_commits_in_order():
+    """Test parallel apply with one commit per feature in series order"""
+    ctx = _make_checkout()
+    # The per-feature commits need an author; scoped so it can't leak
+    with mock.patch.dict(os.environ, GIT_ENV):
+        applied, failed = apply_features_patches(ctx, commit_each=True, workers=4)
+
+    assert (applied, failed) == (4, [])
+    src = ctx.chromium_src
+    assert all((src / relative).read_text() == "patched\n" for relative in FILES)
+    assert _git(src, "log", "--format=%s").splitlines() == [
+        f"Apply {UNASSIGNED}: patches not listed in features.yaml",
+        "Apply sidebar: patch: sidebar",
+        "Apply icons: patch: icons",
+        "base",
+    ]
+    assert _git(src, "status", "--porcelain") == ""
+    print("✓ Feature apply test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_plan_feature_apply,
+        test_apply_features_commits_in_order,
+    ]
+
+    print("Running feature apply tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for feature patch generation
+
+Checks the streamed combined patch format, directory entries and
+parallel generation of every feature into an output directory.
+"""
+
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from modules.dev_cli.feature import (
+    collect_feature_patches,
+    generate_all_patches,
+    stream_feature_patch,
+)
+from modules.feature_registry import FeatureRegistry
+
+FEATURES_YAML = """features:
+  branding:
+    description: 'patch: branding'
+    files:
+    - chrome/app/chromium_strings.grd
+    - chrome/app/theme/linux/
+    - chrome/app/missing.cc
+  sidebar:
+    description: 'patch: sidebar'
+    files:
+    - chrome/browser/ui/sidebar.cc
+  empty:
+    description: 'patch: nothing yet'
+    files:
+    - chrome/browser/nothing.cc
+"""
+
+
+def _make_tree():
+    base = Path(tempfile.mkdtemp())
+    (base / "features.yaml").write_text(FEATURES_YAML)
+    patches_dir = base / "chromium_src"
+    for relative, content in (
+        ("chrome/app/chromium_strings.grd.patch", "strings\n"),
+        ("chrome/app/theme/linux/b.png.patch", "b\n"),
+        ("chrome/app/theme/linux/a.png.patch", "a\n"),
+        ("chrome/browser/ui/sidebar.cc.patch", "sidebar\n"),
+    ):
+        (patches_dir / relative).parent.mkdir(parents=True, exist_ok=True)
+        (patches_dir / relative).write_text(content)
+    return base, FeatureRegistry.load(base / "features.yaml"), patches_dir
+
+
+def test_stream_feature_patch():
+    """Test patch order, directory expansion and the combined format"""
+    _, registry, patches_dir = _make_tree()
+    feature = registry.get("branding")
+
+    patches, missing = collect_feature_patches(feature, patches_dir)
+    assert [p.name for p in patches] == ["chromium_strings.grd.patch", "a.png.patch", "b.png.patch"]
+    assert missing == ["chrome/app/missing.cc"]
+
+    out = io.BytesIO()
+    stream_feature_patch(feature, patches, out)
+    assert out.getvalue().decode() == (
+        "# Combined patch for feature: branding\n"
+        "# Files: 3\n"
+        "# Description: patch: branding\n\n"
+        "strings\n\na\n\nb\n"
+    )
+    print("✓ Stream patch test passed")
+
+
+def test_generate_all_patches():
+    """Test writing every feature's patch into an output directory"""
+    base, registry, patches_dir = _make_tree()
+    output_dir = base / "out"
+
+    generated, empty = generate_all_patches(registry, patches_dir, output_dir, workers=2)
+    assert generated == ["branding", "sidebar"]
+    assert empty == ["empty"]
+    assert sorted(p.name for p in output_dir.iterdir()) == ["branding.patch", "sidebar.patch"]
+    assert (output_dir / "sidebar.patch").read_text().endswith("\n\nsidebar\n")
+    print("✓ Generate all patches test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_stream_feature_patch,
+        test_generate_all_patches,
+    ]
+
+    print("Running feature patch tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
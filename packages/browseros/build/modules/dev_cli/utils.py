@@ -54,6 +54,7 @@ def run_git_command(
     check: bool = False,
     timeout: Optional[int] = None,
     binary_output: bool = False,
+    input: Optional[str] = None,
 ) -> subprocess.CompletedProcess:
     """Run a git command and return the result
 
@@ -64,6 +65,7 @@ def run_git_command(
         check: Whether to raise on non-zero return
         timeout: Command timeout in seconds
         binary_output: If True, handle binary output (don't decode as text)
+        input: Text to send to the command's stdin
 
     Returns:
         CompletedProcess result
@@ -80,6 +82,7 @@ def run_git_command(
                 result = subprocess.run(
                     cmd,
                     cwd=cwd,
+                    input=input,
                     capture_output=capture,
                     text=True,
                     check=False,
@@ -91,6 +94,7 @@ def run_git_command(
                 result = subprocess.run(
                     cmd,
                     cwd=cwd,
+                    input=input.encode() if input is not None else None,
                     capture_output=capture,
                     text=False,
                     check=False,
@@ -105,6 +109,7 @@ def run_git_command(
             result = subprocess.run(
                 cmd,
                 cwd=cwd,
+                input=input,
                 capture_output=capture,
                 text=True,
                 check=False,
@@ -171,6 +176,26 @@ def get_commit_changed_files(commit_hash: str, chromium_src: Path) -> List[str]:
         return []
 
 
+def get_range_changed_files(
+    base_commit: str, head_commit: str, chromium_src: Path
+) -> List[str]:
+    """Get list of files changed between two commits"""
+    try:
+        result = run_git_command(
+            ["git", "diff", "--name-only", f"{base_commit}..{head_commit}"],
+            cwd=chromium_src,
+        )
+
+        if result.returncode != 0:
+            log_error(f"Failed to get changed files for {base_commit}..{head_commit}")
+            return []
+
+        return [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
+    except GitError as e:
+        log_error(f"Error getting changed files: {e}")
+        return []
+
+
 def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
     """
     Parse git diff output into individual file patches with full metadata.
@@ -520,30 +545,101 @@ def handle_patch_conflict(
             click.echo("Invalid choice. Please enter 1-5.")
 
 
-def create_git_commit(chromium_src: Path, message: str) -> bool:
-    """Create a git commit with the given message"""
-    # Check if there are changes to commit
-    result = run_git_command(["git", "status", "--porcelain"], cwd=chromium_src)
+def parse_porcelain_z(output: str) -> Dict[str, str]:
+    """Parse `git status --porcelain -z` into a path -> status code table"""
+    table = {}
+    fields = iter(output.split("\0"))
+    for entry in fields:
+        if not entry:
+            continue
+        status, path = entry[:2], entry[3:]
+        table[path] = status
+        if "R" in status or "C" in status:
+            next(fields, None)  # Rename/copy source path
+    return table
+
+
+class CommitWriter:
+    """Create commits from known file lists with git plumbing
+
+    `git add` + `git commit` refresh the whole index on every commit.
+    Here only the given paths are hashed into the index
+    (update-index), the tree is written from the index's cached subtrees
+    (write-tree) and the commit is created and HEAD moved directly
+    (commit-tree, update-ref), so N commits cost no full-tree scans.
+    Commit hooks are not run.
+    """
 
-    if not result.stdout.strip():
-        log_warning("Nothing to commit, working tree clean")
-        return True
+    def __init__(self, chromium_src: Path):
+        self.chromium_src = chromium_src
+        result = self._git(["rev-parse", "--verify", "-q", "HEAD"], check=False)
+        self.head: Optional[str] = result.stdout.strip() or None
+        self.head_tree: Optional[str] = None
+        if self.head:
+            self.head_tree = self._git(["rev-parse", f"{self.head}^{{tree}}"]).stdout.strip()
+
+    def _git(
+        self, args: List[str], input: Optional[str] = None, check: bool = True
+    ) -> subprocess.CompletedProcess:
+        return run_git_command(
+            ["git", *args], cwd=self.chromium_src, check=check, input=input
+        )
 
-    # Stage all changes
-    result = run_git_command(["git", "add", "-A"], cwd=chromium_src)
+    def commit(self, files: List[str], message: str) -> Optional[str]:
+        """Stage `files` (additions, edits and deletions) and commit them
 
-    if result.returncode != 0:
-        log_error("Failed to stage changes")
-        return False
+        Anything staged before is included too, as with `git commit`.
+        Returns the new commit hash, or None if the tree is unchanged.
+        """
+        if files:
+            self._git(
+                ["update-index", "--add", "--remove", "-z", "--stdin"],
+                input="".join(f"{path}\0" for path in files),
+            )
+        tree = self._git(["write-tree"]).stdout.strip()
+        if tree == self.head_tree:
+            return None
 
-    # Create commit
-    result = run_git_command(["git", "commit", "-m", message], cwd=chromium_src)
+        parents = ["-p", self.head] if self.head else []
+        commit = self._git(
+            ["commit-tree", tree, *parents, "-F", "-"], input=message + "\n"
+        ).stdout.strip()
+        update = ["update-ref", "-m", f"commit: {message.splitlines()[0]}", "HEAD", commit]
+        if self.head:
+            update.append(self.head)  # Fail if HEAD moved under us
+        self._git(update)
 
-    if result.returncode != 0:
-        if "nothing to commit" in result.stdout:
-            log_warning("Nothing to commit")
-        else:
-            log_error(f"Failed to create commit: {result.stderr}")
+        self.head, self.head_tree = commit, tree
+        return commit
+
+
+def create_git_commit(
+    chromium_src: Path, message: str, files: Optional[List[str]] = None
+) -> bool:
+    """Create a git commit with the given message
+
+    Commits `files` if given, otherwise every change in the working tree
+    (like `git add -A`), found with a single status scan.
+    """
+    try:
+        if files is None:
+            result = run_git_command(
+                ["git", "status", "--porcelain", "-z", "--untracked-files=all"],
+                cwd=chromium_src,
+                check=True,
+            )
+            files = sorted(parse_porcelain_z(result.stdout))
+            if not files:
+                log_warning("Nothing to commit, working tree clean")
+                return True
+
+        commit = CommitWriter(chromium_src).commit(files, message)
+    except GitError as e:
+        log_error(f"Failed to create commit: {e}")
+        return False
+
+    if not commit:
+        log_warning("Nothing to commit")
         return False
 
     log_success(f"Created commit: {message}")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Feature registry module for Nxtscape build system
+
+Loads features.yaml and compiles it into forward (feature -> files) and
+reverse (file -> features) indexes. Directory entries (ending in '/')
+own every file below them. The parsed file is cached on disk as JSON
+keyed by its content hash, so separate dev CLI runs don't parse YAML
+again, and loaded registries are kept per process until the file's mtime
+or size changes.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_cache: Dict[Path, Tuple[Tuple[int, int], "FeatureRegistry"]] = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Feature:
+    """One entry of features.yaml"""
+
+    name: str
+    description: str
+    files: Tuple[str, ...]
+
+
+class FeatureRegistry:
+    """Compiled, read-only view of features.yaml"""
+
+    def __init__(self, path: Path, data: Optional[Dict] = None):
+        self.path = path
+        self._data = data or {}
+        self.features: Dict[str, Feature] = {}
+        # Exact file entries and directory entries (without trailing '/')
+        self._files: Dict[str, List[str]] = {}
+        self._dirs: Dict[str, List[str]] = {}
+
+        for name, info in (self._data.get("features") or {}).items():
+            info = info or {}
+            files = tuple(info.get("files") or [])
+            # Annotate commits read "<name>: <description>"; fall back to the name
+            self.features[name] = Feature(name, info.get("description", name), files)
+            for entry in files:
+                if entry.endswith("/"):
+                    index, key = self._dirs, entry.rstrip("/")
+                else:
+                    index, key = self._files, entry
+                owners = index.setdefault(key, [])
+                if name not in owners:
+                    owners.append(name)
+
+    @classmethod
+    def load(cls, path: Path, cache_dir: Optional[Path] = None) -> "FeatureRegistry":
+        """Load a registry, reusing the cached one if the file is unchanged
+
+        A missing file gives an empty registry.
+        """
+        path = Path(path).resolve()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return cls(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with _cache_lock:
+            cached = _cache.get(path)
+            if cached and cached[0] == key:
+                return cached[1]
+
+        registry = cls(path, _load_data(path, cache_dir))
+        with _cache_lock:
+            _cache[path] = (key, registry)
+        return registry
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.features
+
+    def __iter__(self) -> Iterator[Feature]:
+        return iter(self.features.values())
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def get(self, name: str) -> Optional[Feature]:
+        return self.features.get(name)
+
+    def features_for_file(self, file_path: str) -> List[str]:
+        """Names of the features owning a file, in features.yaml order
+
+        One exact lookup plus one per parent directory, so the cost
+        depends on path depth, not on the number of features.
+        """
+        owners = list(self._files.get(file_path, ()))
+        parent = file_path
+        while "/" in parent:
+            parent = parent.rsplit("/", 1)[0]
+            for name in self._dirs.get(parent, ()):
+                if name not in owners:
+                    owners.append(name)
+        if len(owners) > 1:
+            order = list(self.features)
+            owners.sort(key=order.index)
+        return owners
+
+    def owner(self, file_path: str) -> Optional[str]:
+        """The first feature owning a file, or None"""
+        owners = self.features_for_file(file_path)
+        return owners[0] if owners else None
+
+    def group_by_feature(self, file_paths) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Route files to their first owning feature
+
+        Returns (feature -> files in input order, files no feature owns),
+        with features in features.yaml order.
+        """
+        grouped: Dict[str, List[str]] = {}
+        unowned = []
+        for file_path in file_paths:
+            name = self.owner(file_path)
+            if name:
+                grouped.setdefault(name, []).append(file_path)
+            else:
+                unowned.append(file_path)
+        order = {name: i for i, name in enumerate(self.features)}
+        return dict(sorted(grouped.items(), key=lambda item: order[item[0]])), unowned
+
+    def to_data(self) -> Dict:
+        """A mutable copy of the raw YAML data, for editing and saving"""
+        return copy.deepcopy(self._data)
+
+
+def _load_data(path: Path, cache_dir: Optional[Path] = None) -> Dict:
+    """Parse features.yaml through the on-disk cache of parsed contents"""
+    content = path.read_bytes()
+    cache_dir = cache_dir or Path.home() / ".cache" / "nxtscape" / "features"
+    cache_file = cache_dir / f"{hashlib.sha256(content).hexdigest()}.json"
+    try:
+        return json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        pass
+
+    import yaml
+
+    # The C loader is several times faster when libyaml is available
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    data = yaml.load(content, Loader=loader) or {}
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(data))
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError):
+        # Unwritable cache dir or data JSON can't represent; parse next time
+        pass
+    return data
+
+
+def save_features(path: Path, data: Dict):
+    """Write features.yaml and drop the cached registry for it"""
+    import yaml
+
+    path = Path(path)
+    with open(path, "w") as f:
+        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    with _cache_lock:
+        _cache.pop(path.resolve(), None)
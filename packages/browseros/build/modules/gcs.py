@@ -327,30 +327,10 @@ def handle_upload_dist(
     log_info(f"\nTotal size: {total_size:.2f} MB")
     log_info(f"Upload destination: gs://{GCS_BUCKET_NAME}/resources/{version}/{platform_dir}/")
 
-    # 6. Create minimal BuildContext for upload
-    # BuildContext will try to load chromium_src, but we'll provide a dummy one
-    # since we don't need it for uploads
-    try:
-        ctx = BuildContext(
-            root_dir=root_dir,
-            chromium_src=Path("/dev/null"),  # Dummy path, won't be used
-            architecture="",  # Not needed for upload
-            build_type="release",  # Not needed for upload
-        )
-        # Override the version with what we detected
-        ctx.nxtscape_version = version
-    except Exception as e:
-        # If BuildContext fails, we can still upload with minimal info
-        log_warning(f"Could not create full BuildContext: {e}")
-        log_info("Creating minimal context for upload...")
-
-        # Create a simple object with just what we need
-        class MinimalContext:
-            def __init__(self, root_dir: Path, version: str):
-                self.root_dir = root_dir
-                self.nxtscape_version = version
-
-        ctx = MinimalContext(root_dir, version)
+    # 6. Create BuildContext for upload (chromium_src is never resolved)
+    ctx = BuildContext(root_dir=root_dir, build_type="release")
+    # Override the version with what we detected
+    ctx.nxtscape_version = version
 
     # 7. Upload using existing upload_to_gcs function
     success, gcs_uris = upload_to_gcs(ctx, artifacts, platform_override=platform_override)
@@ -7,11 +7,10 @@ import os
 import sys
 import subprocess
 import shutil
-import tarfile
-import urllib.request
 from pathlib import Path
 from context import BuildContext
-from utils import run_command, log_info, log_error, log_success, IS_WINDOWS, safe_rmtree
+from modules.archive_cache import ArchiveCache, ArchiveSpec
+from utils import run_command, log_info, log_error, log_success, IS_WINDOWS
 
 
 def setup_git(ctx: BuildContext) -> bool:
@@ -61,32 +60,17 @@ def setup_git(ctx: BuildContext) -> bool:
 
 
 def setup_sparkle(ctx: BuildContext) -> bool:
-    """Download and setup Sparkle framework"""
-    log_info("\n✨ Setting up Sparkle framework...")
-
-    sparkle_dir = ctx.get_sparkle_dir()
-
-    # Clean existing
-    if sparkle_dir.exists():
-        safe_rmtree(sparkle_dir)
-
-    sparkle_dir.mkdir(parents=True)
+    """Install the Sparkle framework from the local archive cache
 
-    # Download Sparkle
-    sparkle_url = ctx.get_sparkle_url()
-    sparkle_archive = sparkle_dir / "sparkle.tar.xz"
-
-    # Download using urllib (cross-platform)
-    log_info(f"Downloading Sparkle from {sparkle_url}...")
-    urllib.request.urlretrieve(sparkle_url, sparkle_archive)
-
-    # Extract using tarfile module (cross-platform)
-    log_info("Extracting Sparkle...")
-    with tarfile.open(sparkle_archive, "r:xz") as tar:
-        tar.extractall(sparkle_dir)
+    A no-op when the checkout already has this Sparkle version.
+    """
+    log_info("\n✨ Setting up Sparkle framework...")
 
-    # Clean up
-    sparkle_archive.unlink()
+    sha256 = os.environ.get("NXTSCAPE_SPARKLE_SHA256") or ctx.SPARKLE_SHA256
+    spec = ArchiveSpec("Sparkle", ctx.SPARKLE_VERSION, ctx.get_sparkle_url(), sha256)
+    if not ArchiveCache().install(spec, ctx.get_sparkle_dir()):
+        log_info(f"Sparkle {ctx.SPARKLE_VERSION} is already set up")
+        return True
 
     log_success("Sparkle setup complete")
     return True
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Job control module for Nxtscape build system
+
+Chooses ninja's -j/-l from the memory that is actually available and
+keeps watching memory pressure (PSI on Linux, memorystatus on macOS)
+while the build runs. When the build is swapping, or has a lot of
+headroom for a sustained period, ninja is interrupted and restarted with
+a better job count. Restarts are rate limited because each one costs a
+graph reload.
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from utils import run_command, log_warning, log_error, IS_WINDOWS, IS_MACOS
+
+GB = 1024**3
+
+# Peak RSS of a Chromium clang/lld job is 1-2GB; plan for the high end
+MEMORY_PER_JOB = 2 * GB
+
+# PSI "some" avg10 (% of time tasks stalled on memory) thresholds
+PSI_HIGH = 20.0
+PSI_LOW = 1.0
+
+# Available memory below this fraction of RAM counts as pressure
+LOW_MEMORY_FRACTION = 0.05
+
+SAMPLE_INTERVAL = 30.0  # Seconds between samples
+HIGH_SAMPLES = 2  # Consecutive pressured samples before shrinking
+LOW_SAMPLES = 10  # Consecutive relaxed samples before growing
+RESTART_COOLDOWN = 600.0  # Minimum seconds between restarts for growth
+
+
+def _read_proc_meminfo() -> Dict[str, int]:
+    """Read /proc/meminfo in bytes"""
+    info = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, value = line.split(":", 1)
+            info[key] = int(value.split()[0]) * 1024
+    return info
+
+
+def _read_psi() -> Optional[float]:
+    """Read the memory PSI 'some avg10' value (Linux 4.20+)"""
+    try:
+        with open("/proc/pressure/memory") as f:
+            for line in f:
+                if line.startswith("some"):
+                    fields = dict(item.split("=") for item in line.split()[1:])
+                    return float(fields["avg10"])
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+def _sysctl(name: str) -> Optional[int]:
+    try:
+        result = subprocess.run(
+            ["sysctl", "-n", name], capture_output=True, text=True, timeout=5
+        )
+        return int(result.stdout.strip())
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def read_memory_status() -> Dict[str, Optional[float]]:
+    """Return total/available memory in bytes and a pressure percentage
+
+    `pressure` is the PSI 'some avg10' percentage on Linux and None where
+    the kernel doesn't expose it.
+    """
+    if os.path.exists("/proc/meminfo"):
+        info = _read_proc_meminfo()
+        total = info.get("MemTotal", 0)
+        available = info.get("MemAvailable", info.get("MemFree", 0))
+        return {"total": total, "available": available, "pressure": _read_psi()}
+
+    if IS_MACOS:
+        total = _sysctl("hw.memsize") or 0
+        # memorystatus_level is the percentage of memory the kernel still
+        # considers available (free, inactive and compressible)
+        level = _sysctl("kern.memorystatus_level")
+        available = total * level / 100 if level is not None else total
+        return {"total": total, "available": available, "pressure": None}
+
+    return {"total": 0, "available": 0, "pressure": None}
+
+
+def choose_jobs(
+    cpu_count: int, available: float, memory_per_job: float = MEMORY_PER_JOB
+) -> int:
+    """Pick a job count that fits in available memory without swapping"""
+    if available <= 0:
+        return cpu_count
+    return max(1, min(cpu_count, int(available // memory_per_job)))
+
+
+class JobController:
+    """Adjusts ninja parallelism to memory pressure during a build"""
+
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        cpu_count: Optional[int] = None,
+        memory_per_job: float = MEMORY_PER_JOB,
+        read_status: Callable[[], Dict] = read_memory_status,
+    ):
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.memory_per_job = memory_per_job
+        self.read_status = read_status
+        self.min_jobs = max(1, self.cpu_count // 4)
+        self.max_jobs = self.cpu_count
+        # A fixed job count (e.g. JOBS=14) disables adaptation
+        self.adaptive = jobs is None
+        if jobs is None:
+            status = self.read_status()
+            jobs = choose_jobs(self.cpu_count, status["available"], memory_per_job)
+        self.jobs = max(1, jobs)
+        self.load = float(self.cpu_count)
+        self.high_samples = 0
+        self.low_samples = 0
+        self.last_restart = time.monotonic()
+
+    @classmethod
+    def from_env(cls) -> "JobController":
+        """Honor JOBS from the environment as a fixed job count"""
+        jobs = os.environ.get("JOBS")
+        return cls(jobs=int(jobs) if jobs and jobs.isdigit() else None)
+
+    def ninja_args(self) -> List[str]:
+        """-j/-l for ninja, or none while autoninja's own defaults apply
+
+        They're only passed when the job count was pinned or the
+        controller lowered it below the CPU count.
+        """
+        if self.adaptive and self.jobs >= self.max_jobs:
+            return []
+        return [f"-j{self.jobs}", f"-l{self.load:g}"]
+
+    def sample(self) -> Optional[int]:
+        """Take one sample; return the new job count if ninja should restart"""
+        if not self.adaptive:
+            return None
+
+        status = self.read_status()
+        total, available = status["total"], status["available"]
+        pressure = status["pressure"]
+
+        high = (pressure is not None and pressure >= PSI_HIGH) or (
+            total > 0 and available < total * LOW_MEMORY_FRACTION
+        )
+        low = (pressure is None or pressure < PSI_LOW) and (
+            available > 4 * self.memory_per_job
+        )
+        self.high_samples = self.high_samples + 1 if high else 0
+        self.low_samples = self.low_samples + 1 if low and not high else 0
+
+        target = self.jobs
+        if self.high_samples >= HIGH_SAMPLES and self.jobs > self.min_jobs:
+            target = max(self.min_jobs, self.jobs * 2 // 3)
+        elif (
+            self.low_samples >= LOW_SAMPLES
+            and self.jobs < self.max_jobs
+            and time.monotonic() - self.last_restart >= RESTART_COOLDOWN
+        ):
+            headroom = int(available // self.memory_per_job) // 2
+            target = min(self.max_jobs, self.jobs + max(1, headroom))
+
+        # Small changes aren't worth a graph reload
+        if abs(target - self.jobs) < max(2, self.jobs // 5):
+            return None
+
+        self.jobs = target
+        self.high_samples = self.low_samples = 0
+        self.last_restart = time.monotonic()
+        return target
+
+
+def interrupt_process_group(process: subprocess.Popen):
+    """Interrupt ninja (and its wrapper) like Ctrl-C; ninja stops its jobs"""
+    try:
+        os.killpg(process.pid, signal.SIGINT)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_with_adaptive_jobs(
+    make_cmd: Callable[[List[str]], List[str]],
+    controller: JobController,
+    interval: float = SAMPLE_INTERVAL,
+    before_run: Optional[Callable[[], None]] = None,
+) -> subprocess.CompletedProcess:
+    """Run a ninja command, restarting it when the controller changes -j
+
+    `make_cmd` receives the -j/-l arguments and returns the full command.
+    `before_run` is called before every ninja start, restarts included.
+    """
+    while True:
+        restart = threading.Event()
+        stop = threading.Event()
+
+        def watch(process: subprocess.Popen):
+            def loop():
+                while not stop.wait(interval):
+                    jobs = controller.sample()
+                    if jobs is not None:
+                        log_warning(
+                            f"⚖️  Memory pressure changed, restarting ninja with -j{jobs}"
+                        )
+                        restart.set()
+                        interrupt_process_group(process)
+                        return
+
+            threading.Thread(target=loop, name="job-controller", daemon=True).start()
+
+        # Only a watched ninja runs detached in its own process group; a
+        # fixed -j leaves it in ours so Ctrl-C reaches it directly
+        on_start = watch if controller.adaptive and not IS_WINDOWS else None
+        if before_run:
+            before_run()
+        try:
+            result = run_command(
+                make_cmd(controller.ninja_args()), check=False, on_start=on_start
+            )
+        finally:
+            stop.set()
+
+        if restart.is_set():
+            continue
+        if result.returncode != 0:
+            log_error(f"Command failed: {' '.join(result.args)}")
+            raise subprocess.CalledProcessError(
+                result.returncode, result.args, result.stdout
+            )
+        return result
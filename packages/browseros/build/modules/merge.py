@@ -90,44 +90,21 @@ def merge_architectures(
         return False
 
 
-def create_minimal_context(
-    app_path: Path, chromium_src: Path, root_dir: Path, architecture: str = "universal"
+def universal_context(
+    app_path: Path, chromium_src: Path, root_dir: Path
 ) -> BuildContext:
-    """Create a minimal BuildContext for signing/packaging operations"""
-
-    out_dir_path = app_path.parent  # out/Default_universal
-
-    log_info(f"Creating context from app path: {app_path}")
-    log_info(f"  Out dir: {out_dir_path}")
-    log_info(f"  Chromium src: {chromium_src}")
-    log_info(f"  Root dir: {root_dir}")
-
-    ctx = BuildContext(
+    """BuildContext for signing/packaging a merged universal app"""
+    return BuildContext(
         root_dir=root_dir,
         chromium_src=chromium_src,
-        architecture=architecture,
+        out_dir=os.path.relpath(app_path.parent, chromium_src),
+        architecture="universal",
         build_type="release",  # Assume release for universal builds
-        apply_patches=False,
         sign_package=True,
         package=True,
-        build=False,
+        app_path=app_path,
     )
 
-    # Override out_dir to match the actual location
-    ctx.out_dir = out_dir_path.name
-
-    # Override get_app_path to return the actual app path for merge operations
-    def get_app_path_override():
-        return app_path
-
-    ctx.get_app_path = get_app_path_override
-
-    log_info(f"Context created with out_dir: {ctx.out_dir}")
-    log_info(f"App path: {ctx.get_app_path()}")
-    log_info(f"PKG-DMG path: {ctx.get_pkg_dmg_path()}")
-
-    return ctx
-
 
 def merge_sign_package(
     arch1_path: Path,
@@ -174,7 +151,7 @@ def merge_sign_package(
         try:
             from modules.sign import sign_app
 
-            ctx = create_minimal_context(output_path, chromium_src, root_dir)
+            ctx = universal_context(output_path, chromium_src, root_dir)
             if not sign_app(ctx, create_dmg=False):
                 log_error("Failed to sign universal binary")
                 return False
@@ -197,7 +174,7 @@ def merge_sign_package(
         try:
             from modules.package import create_dmg
 
-            ctx = create_minimal_context(output_path, chromium_src, root_dir)
+            ctx = universal_context(output_path, chromium_src, root_dir)
 
             # Create DMG in parent directory
             dmg_dir = ctx.root_dir / "dmg"
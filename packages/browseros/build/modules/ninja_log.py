@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Ninja log analysis module for Nxtscape build system
+
+Parses the .ninja_log in the output directory incrementally and reports
+the slowest targets, an estimated critical path, parallelism over time
+and which chromium_patches files map to the most expensive objects.
+Reports are plain JSON with sorted keys so two builds can be diffed.
+"""
+
+import bisect
+import json
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from context import BuildContext
+from utils import log_info, log_warning, get_logs_dir, join_paths
+
+NINJA_LOG_NAME = ".ninja_log"
+
+# Source file types that compile into their own object file
+COMPILED_SUFFIXES = {".c", ".cc", ".cpp", ".cxx", ".m", ".mm", ".S", ".asm"}
+
+
+class NinjaLogEntry(NamedTuple):
+    """One line of .ninja_log (times are milliseconds since the run started)"""
+
+    start_ms: int
+    end_ms: int
+    mtime: int
+    output: str
+    cmd_hash: str
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds"""
+        return (self.end_ms - self.start_ms) / 1000.0
+
+
+class NinjaLog:
+    """Incremental reader for a .ninja_log file
+
+    refresh() only reads bytes appended since the previous call, and starts
+    over when the file shrinks or is replaced. `history` keeps the latest
+    entry for every output ever seen (used for time estimates), and
+    `current` holds the latest build.
+
+    A build driven by us calls mark_run() before each ninja invocation:
+    `current` is then exactly what was logged after the first mark, with
+    each restarted run shifted to begin where the previous one ended.
+    Without marks the log has no run boundaries, so `current` is the run
+    after the last point where end times went backwards (ninja's clock
+    restarts with every run).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.offset = 0
+        self.version = 0
+        self.current: Dict[str, NinjaLogEntry] = {}
+        self.history: Dict[str, NinjaLogEntry] = {}
+        self._last_end = -1
+        self._marked = False
+        self._time_offset = 0
+        self._file_id = None
+        self._partial = b""
+
+    @classmethod
+    def for_context(cls, ctx: BuildContext) -> "NinjaLog":
+        """Create a reader for the context's output directory"""
+        return cls(join_paths(ctx.chromium_src, ctx.out_dir, NINJA_LOG_NAME))
+
+    def reset(self):
+        """Forget everything read so far"""
+        self.offset = 0
+        self.version = 0
+        self.current.clear()
+        self.history.clear()
+        self._new_run()
+        self._marked = False
+        self._time_offset = 0
+        self._file_id = None
+        self._partial = b""
+
+    def _new_run(self):
+        self.current = {}
+        self._last_end = -1
+
+    def mark_run(self):
+        """Note that a ninja run is about to start
+
+        The first mark skips everything logged so far without parsing it.
+        Later marks (ninja restarted mid-build) keep `current` and shift
+        the next run's times past its end.
+        """
+        if self._marked:
+            self.refresh()
+            self._time_offset = max(
+                (e.end_ms for e in self.current.values()), default=self._time_offset
+            )
+            return
+
+        self.reset()
+        try:
+            stat = self.path.stat()
+            self.offset = stat.st_size
+            self._file_id = (stat.st_dev, stat.st_ino)
+        except FileNotFoundError:
+            pass
+        self._marked = True
+
+    def refresh(self) -> int:
+        """Read newly appended lines, returning the number of new entries"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return 0
+        size = stat.st_size
+
+        # Ninja rewrites (recompacts) the log from time to time, replacing
+        # the file; a shorter file also means it was rewritten. Marks can't
+        # be placed in a rewritten log, so they are dropped as well.
+        file_id = (stat.st_dev, stat.st_ino)
+        if size < self.offset or (self._file_id and file_id != self._file_id):
+            self.reset()
+        self._file_id = file_id
+
+        if size == self.offset:
+            return 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = self._partial + f.read(size - self.offset)
+        self.offset = size
+
+        lines = data.split(b"\n")
+        self._partial = lines.pop()  # Incomplete last line, if any
+
+        added = 0
+        for raw in lines:
+            entry = self._parse_line(raw.decode("utf-8", errors="replace"))
+            if entry is None:
+                continue
+            self.history[entry.output] = entry
+            if self._marked:
+                entry = entry._replace(
+                    start_ms=entry.start_ms + self._time_offset,
+                    end_ms=entry.end_ms + self._time_offset,
+                )
+            elif entry.end_ms < self._last_end:
+                self._new_run()
+            self._last_end = entry.end_ms
+            self.current[entry.output] = entry
+            added += 1
+        return added
+
+    def _parse_line(self, line: str) -> Optional[NinjaLogEntry]:
+        if line.startswith("# ninja log v"):
+            try:
+                self.version = int(line[len("# ninja log v") :].strip())
+            except ValueError:
+                pass
+            # A header means a fresh log (e.g. after recompaction)
+            if not self._marked:
+                self._new_run()
+            return None
+        parts = line.split("\t")
+        if len(parts) < 5:
+            return None
+        try:
+            return NinjaLogEntry(
+                int(parts[0]), int(parts[1]), int(parts[2]), parts[3], parts[4]
+            )
+        except ValueError:
+            return None
+
+    def expected_duration(self, output: str) -> Optional[float]:
+        """Historical duration of an output in seconds, if known"""
+        entry = self.history.get(output)
+        return entry.duration if entry else None
+
+
+def unique_steps(entries: Iterable[NinjaLogEntry]) -> List[NinjaLogEntry]:
+    """Collapse multi-output edges (same command and times) into one step"""
+    seen = {}
+    for entry in entries:
+        key = (entry.start_ms, entry.end_ms, entry.cmd_hash)
+        if key not in seen:
+            seen[key] = entry
+    return sorted(seen.values(), key=lambda e: (e.start_ms, e.end_ms))
+
+
+def slowest_steps(
+    steps: List[NinjaLogEntry], limit: int = 20
+) -> List[NinjaLogEntry]:
+    """Steps sorted by duration, longest first"""
+    ranked = sorted(steps, key=lambda e: (e.start_ms - e.end_ms, e.output))
+    return ranked[:limit]
+
+
+def estimate_critical_path(steps: List[NinjaLogEntry]) -> List[NinjaLogEntry]:
+    """Estimate the critical path from timings alone
+
+    Starting from the step that finished last, repeatedly pick the step that
+    finished closest to (but not after) the current step's start: that is
+    the most likely thing it was waiting for. Without the dependency graph
+    this is a heuristic, but it reliably finds long serial link chains.
+    """
+    if not steps:
+        return []
+    by_end = sorted(steps, key=lambda e: e.end_ms)
+    ends = [e.end_ms for e in by_end]
+
+    index = len(by_end) - 1
+    path = [by_end[index]]
+    while True:
+        # Only look at earlier steps so zero-length steps can't loop forever
+        index = min(bisect.bisect_right(ends, path[-1].start_ms), index) - 1
+        if index < 0:
+            break
+        path.append(by_end[index])
+    path.reverse()
+    return path
+
+
+def parallelism_over_time(
+    steps: List[NinjaLogEntry], bucket_seconds: float = 60.0
+) -> List[Tuple[float, float]]:
+    """Average number of running steps per time bucket
+
+    Returns (bucket start in seconds, average parallelism) pairs.
+    """
+    if not steps:
+        return []
+    bucket_ms = int(bucket_seconds * 1000)
+    origin = min(e.start_ms for e in steps)
+    last = max(e.end_ms for e in steps)
+    busy = [0] * ((last - origin) // bucket_ms + 1)
+    for entry in steps:
+        start = entry.start_ms - origin
+        end = entry.end_ms - origin
+        while start < end:
+            bucket = start // bucket_ms
+            bucket_end = (bucket + 1) * bucket_ms
+            chunk_end = min(end, bucket_end)
+            busy[bucket] += chunk_end - start
+            start = chunk_end
+    return [
+        (round(i * bucket_seconds, 3), round(total / bucket_ms, 2))
+        for i, total in enumerate(busy)
+    ]
+
+
+def source_object_candidates(source: str) -> Tuple[str, str]:
+    """Return (source dir, object stem) used to match a source to its .o"""
+    path = PurePosixPath(source)
+    return str(path.parent), path.stem
+
+
+def map_sources_to_outputs(
+    sources: Iterable[str], outputs: Iterable[str]
+) -> Dict[str, List[str]]:
+    """Map compiled source files to the object files built from them
+
+    Chromium objects live at obj/<BUILD.gn dir>/<target>/<stem>.o, and the
+    source sits at or below the BUILD.gn dir. Outputs are indexed by stem so
+    each lookup is a dict hit plus a prefix check.
+    """
+    by_stem: Dict[str, List[Tuple[str, str]]] = {}
+    for output in outputs:
+        if not output.startswith("obj/") or not output.endswith((".o", ".obj")):
+            continue
+        path = PurePosixPath(output)
+        stem = path.name.rsplit(".", 1)[0]
+        # Drop "obj/" and the target directory to get the BUILD.gn dir
+        build_dir = "/".join(path.parts[1:-2])
+        by_stem.setdefault(stem, []).append((build_dir, output))
+
+    mapping: Dict[str, List[str]] = {}
+    for source in sources:
+        if PurePosixPath(source).suffix not in COMPILED_SUFFIXES:
+            continue
+        source_dir, stem = source_object_candidates(source)
+        matches = [
+            output
+            for build_dir, output in by_stem.get(stem, [])
+            if not build_dir
+            or source_dir == build_dir
+            or source_dir.startswith(build_dir + "/")
+        ]
+        if matches:
+            mapping[source] = sorted(matches)
+    return mapping
+
+
+def list_patched_sources(ctx: BuildContext) -> List[str]:
+    """Chromium paths of all files patched via chromium_patches/"""
+    patches_dir = ctx.get_dev_patches_dir()
+    if not patches_dir.exists():
+        return []
+    return sorted(
+        p.relative_to(patches_dir).as_posix()
+        for p in patches_dir.rglob("*")
+        if p.is_file() and not p.name.startswith(".")
+    )
+
+
+def build_report(
+    log: NinjaLog,
+    patched_sources: Optional[List[str]] = None,
+    limit: int = 20,
+    bucket_seconds: float = 60.0,
+) -> Dict:
+    """Build a JSON-serialisable hotspot report for the latest ninja run"""
+    steps = unique_steps(log.current.values())
+    if not steps:
+        return {"log": str(log.path), "steps": 0}
+
+    wall = (max(e.end_ms for e in steps) - min(e.start_ms for e in steps)) / 1000.0
+    cpu_total = sum(e.duration for e in steps)
+    critical = estimate_critical_path(steps)
+
+    report = {
+        "log": str(log.path),
+        "steps": len(steps),
+        "wall_seconds": round(wall, 3),
+        "total_step_seconds": round(cpu_total, 3),
+        "average_parallelism": round(cpu_total / wall, 2) if wall else 0.0,
+        "slowest": [
+            {"output": e.output, "seconds": round(e.duration, 3)}
+            for e in slowest_steps(steps, limit)
+        ],
+        "critical_path": {
+            "seconds": round(sum(e.duration for e in critical), 3),
+            "steps": [
+                {"output": e.output, "seconds": round(e.duration, 3)} for e in critical
+            ],
+        },
+        "parallelism": parallelism_over_time(steps, bucket_seconds),
+        "durations": {
+            output: round(entry.duration, 3)
+            for output, entry in sorted(log.current.items())
+        },
+    }
+
+    if patched_sources:
+        mapping = map_sources_to_outputs(patched_sources, log.current.keys())
+        patches = []
+        for source, outputs in mapping.items():
+            seconds = sum(log.current[o].duration for o in outputs)
+            patches.append(
+                {"source": source, "seconds": round(seconds, 3), "outputs": outputs}
+            )
+        patches.sort(key=lambda p: (-p["seconds"], p["source"]))
+        report["patches"] = patches[:limit]
+
+    return report
+
+
+def diff_reports(
+    old: Dict, new: Dict, threshold: float = 0.25, min_seconds: float = 1.0
+) -> Dict:
+    """Compare two reports and list targets that got meaningfully slower
+
+    A target regresses when it takes at least `min_seconds` longer and more
+    than `threshold` (fractional) longer than in the old report.
+    """
+    old_durations = old.get("durations", {})
+    new_durations = new.get("durations", {})
+
+    regressions = []
+    improvements = []
+    for output, seconds in new_durations.items():
+        before = old_durations.get(output)
+        if before is None:
+            continue
+        delta = seconds - before
+        if abs(delta) < min_seconds or abs(delta) <= before * threshold:
+            continue
+        item = {"output": output, "before": before, "after": seconds}
+        (regressions if delta > 0 else improvements).append(item)
+
+    regressions.sort(key=lambda r: (r["before"] - r["after"], r["output"]))
+    improvements.sort(key=lambda r: (r["after"] - r["before"], r["output"]))
+
+    def _total(report: Dict, key: str) -> float:
+        return report.get(key, 0.0)
+
+    return {
+        "wall_seconds": [_total(old, "wall_seconds"), _total(new, "wall_seconds")],
+        "total_step_seconds": [
+            _total(old, "total_step_seconds"),
+            _total(new, "total_step_seconds"),
+        ],
+        "critical_path_seconds": [
+            old.get("critical_path", {}).get("seconds", 0.0),
+            new.get("critical_path", {}).get("seconds", 0.0),
+        ],
+        "new_targets": len(set(new_durations) - set(old_durations)),
+        "removed_targets": len(set(old_durations) - set(new_durations)),
+        "regressions": regressions,
+        "improvements": improvements,
+    }
+
+
+def write_report(report: Dict, output_path: Path) -> Path:
+    """Write a report as sorted, indented JSON (stable for text diffs)"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    return output_path
+
+
+def log_report_summary(report: Dict, limit: int = 10):
+    """Log the headline numbers of a report"""
+    if not report.get("steps"):
+        log_warning("No ninja steps recorded for the last build")
+        return
+
+    log_info("\n🔥 Ninja hotspots")
+    log_info(
+        f"  {report['steps']} steps in {report['wall_seconds']:.0f}s "
+        f"(avg parallelism {report['average_parallelism']:.1f})"
+    )
+    critical = report["critical_path"]
+    log_info(
+        f"  Estimated critical path: {critical['seconds']:.0f}s "
+        f"over {len(critical['steps'])} steps"
+    )
+    log_info("  Slowest targets:")
+    for item in report["slowest"][:limit]:
+        log_info(f"    {item['seconds']:>8.1f}s  {item['output']}")
+    if report.get("patches"):
+        log_info("  Most expensive patched sources:")
+        for item in report["patches"][:limit]:
+            log_info(f"    {item['seconds']:>8.1f}s  {item['source']}")
+
+
+def report_build_hotspots(
+    ctx: BuildContext, log: Optional[NinjaLog] = None
+) -> Optional[Path]:
+    """Analyze the ninja log after a build and save a hotspot report
+
+    Pass the reader marked before the build to report all of it, including
+    runs restarted by the job controller.
+    """
+    log = log or NinjaLog.for_context(ctx)
+    log.refresh()
+    if not log.current:
+        log_warning(f"No ninja log entries found at {log.path}")
+        return None
+
+    report = build_report(log, list_patched_sources(ctx))
+    log_report_summary(report)
+
+    stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_path = get_logs_dir() / f"ninja_report_{ctx.architecture}_{stamp}.json"
+    write_report(report, output_path)
+    log_info(f"📈 Ninja report: {output_path}")
+    return output_path
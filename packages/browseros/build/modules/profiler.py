@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Build profiling module for Nxtscape build system
+
+Wraps build steps in spans that record wall time, CPU time, block I/O
+and peak child RSS. The OS only keeps a lifetime high-water mark of child
+RSS, so a step is credited with the new peak when the mark rose while it
+ran and left blank otherwise. Profiled builds write a JSON report and a
+Chrome trace (load it in chrome://tracing or https://ui.perfetto.dev).
+"""
+
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from utils import log_info, log_warning, get_logs_dir, IS_MACOS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# rusage block counts are in 512-byte units
+BLOCK_SIZE = 512
+
+
+@dataclass
+class Span:
+    """Resource usage of one profiled build step"""
+
+    name: str
+    start: float  # Seconds since the profiler started
+    depth: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    wall: float = 0.0
+    cpu_self: float = 0.0
+    cpu_children: float = 0.0
+    read_bytes: int = 0
+    write_bytes: int = 0
+    # New child RSS high-water mark reached during the span, if any
+    peak_child_rss: Optional[int] = None
+    status: str = "ok"
+
+
+def _snapshot() -> Dict[str, float]:
+    """Take a snapshot of the process and children resource counters"""
+    times = os.times()
+    snap = {
+        "wall": time.perf_counter(),
+        "cpu_self": times.user + times.system,
+        "cpu_children": times.children_user + times.children_system,
+        "peak_child_rss": 0,
+        "read_bytes": 0,
+        "write_bytes": 0,
+    }
+    if resource is not None:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        # ru_maxrss is bytes on macOS and kilobytes on Linux
+        rss_unit = 1 if IS_MACOS else 1024
+        snap["peak_child_rss"] = children.ru_maxrss * rss_unit
+        snap["read_bytes"] = (own.ru_inblock + children.ru_inblock) * BLOCK_SIZE
+        snap["write_bytes"] = (own.ru_oublock + children.ru_oublock) * BLOCK_SIZE
+    return snap
+
+
+def _format_bytes(size: float) -> str:
+    """Format a byte count for the summary table"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration as h:mm:ss or seconds for short spans"""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    mins, secs = divmod(int(seconds), 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours}:{mins:02d}:{secs:02d}"
+
+
+class BuildProfiler:
+    """Collects profiling spans for a single build"""
+
+    def __init__(self, name: str = "build"):
+        self.name = name
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        """Profile the enclosed block as a named step"""
+        before = _snapshot()
+        span = Span(
+            name=name,
+            start=before["wall"] - self.origin,
+            depth=self._depth,
+            attrs=attrs,
+        )
+        self.spans.append(span)
+        self._depth += 1
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            self._depth -= 1
+            after = _snapshot()
+            span.wall = after["wall"] - before["wall"]
+            span.cpu_self = after["cpu_self"] - before["cpu_self"]
+            span.cpu_children = after["cpu_children"] - before["cpu_children"]
+            span.read_bytes = int(after["read_bytes"] - before["read_bytes"])
+            span.write_bytes = int(after["write_bytes"] - before["write_bytes"])
+            if after["peak_child_rss"] > before["peak_child_rss"]:
+                span.peak_child_rss = int(after["peak_child_rss"])
+
+    def to_report(self) -> Dict[str, Any]:
+        """Build the JSON report structure"""
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_wall": time.perf_counter() - self.origin,
+            # High-water mark of all reaped children over the whole build
+            "peak_child_rss": int(_snapshot()["peak_child_rss"]),
+            "platform": sys.platform,
+            "spans": [asdict(span) for span in self.spans],
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome trace event file (complete 'X' events, microseconds)"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 0,
+                "args": {"name": self.name},
+            }
+        ]
+        for span in self.spans:
+            args = dict(span.attrs)
+            args.update(
+                cpu_self=round(span.cpu_self, 3),
+                cpu_children=round(span.cpu_children, 3),
+                read_bytes=span.read_bytes,
+                write_bytes=span.write_bytes,
+                peak_child_rss=span.peak_child_rss,
+                status=span.status,
+            )
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "build",
+                    "ph": "X",
+                    "ts": int(span.start * 1_000_000),
+                    "dur": int(span.wall * 1_000_000),
+                    "pid": pid,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_reports(self, output_dir: Optional[Path] = None) -> List[Path]:
+        """Write the JSON report and Chrome trace, returning their paths"""
+        output_dir = output_dir or get_logs_dir()
+        stamp = self.started_at.strftime("%Y-%m-%d_%H-%M-%S")
+        report_path = output_dir / f"profile_{stamp}.json"
+        trace_path = output_dir / f"trace_{stamp}.json"
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(json.dumps(self.to_report(), indent=2))
+            trace_path.write_text(json.dumps(self.to_chrome_trace()))
+        except OSError as e:
+            log_warning(f"Failed to write build profile: {e}")
+            return []
+        log_info(f"📈 Build profile: {report_path}")
+        log_info(f"📈 Chrome trace: {trace_path}")
+        return [report_path, trace_path]
+
+    def log_summary(self):
+        """Log a per-step summary table"""
+        if not self.spans:
+            return
+        header = (
+            f"{'Step':<40} {'Wall':>9} {'CPU':>9} {'Child CPU':>10} "
+            f"{'Read':>9} {'Write':>9} {'Peak RSS':>9}"
+        )
+        log_info("\n⏱️  Build profile")
+        log_info(header)
+        log_info("-" * len(header))
+        for span in self.spans:
+            peak = _format_bytes(span.peak_child_rss) if span.peak_child_rss else "-"
+            label = ("  " * span.depth + span.name)[:40]
+            if span.status != "ok":
+                label = f"{label[:38]} !"
+            log_info(
+                f"{label:<40} {_format_duration(span.wall):>9} "
+                f"{_format_duration(span.cpu_self):>9} "
+                f"{_format_duration(span.cpu_children):>10} "
+                f"{_format_bytes(span.read_bytes):>9} "
+                f"{_format_bytes(span.write_bytes):>9} "
+                f"{peak:>9}"
+            )
+        peak_child_rss = _snapshot()["peak_child_rss"]
+        if peak_child_rss:
+            log_info(f"Peak child RSS (whole build): {_format_bytes(peak_child_rss)}")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Rebuild cost estimation module for Nxtscape build system
+
+Given a set of Chromium source files (e.g. the files touched by
+chromium_patches/ or a git range), asks ninja which build steps depend on
+them and estimates how long the rebuild takes using historical timings
+from .ninja_log. Header dependencies come from `ninja -t deps`, direct
+inputs of actions (grd, mojom, ts, ...) from `ninja -t query`, run once
+over the files `ninja -t inputs` lists.
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from context import BuildContext
+from modules.ninja_log import NinjaLog, build_report
+from utils import log_info, log_warning, join_paths, IS_WINDOWS
+
+# Files that trigger a gn regeneration (build.ninja rewrite) when changed
+GN_FILE_SUFFIXES = (".gn", ".gni")
+
+# A file with more dependent compile actions than this is called out as
+# "heavy" so it can be batched with other expensive patches
+HEAVY_FILE_ACTIONS = 500
+
+@dataclass
+class FileCost:
+    """Rebuild cost of changing a single file"""
+
+    file: str
+    actions: Set[str] = field(default_factory=set)
+    seconds: float = 0.0
+    in_graph: bool = True
+    regenerates_gn: bool = False
+
+
+def get_ninja_command() -> str:
+    """Find the ninja binary (depot_tools provides it on PATH)"""
+    ninja = shutil.which("ninja")
+    if ninja:
+        return ninja
+    return "ninja.exe" if IS_WINDOWS else "ninja"
+
+
+def to_graph_path(chromium_src: Path, out_path: Path, file_path: str) -> str:
+    """Convert a src-relative path to the out-dir-relative path ninja uses"""
+    relative = os.path.relpath(chromium_src / file_path, out_path)
+    return relative.replace(os.sep, "/")
+
+
+def parse_query_output(lines: Iterable[str]) -> Dict[str, Set[str]]:
+    """Parse `ninja -t query` output into node -> direct outputs"""
+    outputs: Dict[str, Set[str]] = {}
+    node = None
+    in_outputs = False
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        if not line.startswith(" "):
+            node = line.rstrip(":")
+            outputs.setdefault(node, set())
+            in_outputs = False
+        elif line.startswith("    "):
+            if node is not None and in_outputs:
+                outputs[node].add(line.strip())
+        else:
+            in_outputs = line.strip() == "outputs:"
+    return outputs
+
+
+def parse_deps_output(
+    lines: Iterable[str], wanted: Set[str]
+) -> Dict[str, Set[str]]:
+    """Parse `ninja -t deps` output into dependency -> dependent outputs
+
+    Only dependencies in `wanted` are kept, so the (very large) deps dump
+    is streamed without building a full reverse index in memory.
+    """
+    dependents: Dict[str, Set[str]] = {path: set() for path in wanted}
+    target = None
+    for line in lines:
+        if line.startswith("    "):
+            dep = line.strip()
+            if target is not None and dep in dependents:
+                dependents[dep].add(target)
+        elif line.strip():
+            # "obj/foo/bar.o: #deps 12, deps mtime 123 (VALID)"
+            target = line.split(": #deps", 1)[0] if ": #deps" in line else None
+    return dependents
+
+
+def list_graph_inputs(ninja: str, out_path: Path) -> Optional[Set[str]]:
+    """Every input node of the build graph, from one `ninja -t inputs all`
+
+    None when the ninja in use doesn't have the inputs tool.
+    """
+    result = subprocess.run(
+        [ninja, "-C", str(out_path), "-t", "inputs", "all"],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    if result.returncode != 0:
+        log_warning(f"ninja -t inputs failed: {result.stderr.strip()}")
+        return None
+    return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+
+
+def query_direct_outputs(
+    ninja: str, out_path: Path, nodes: List[str], known: Set[str]
+) -> Dict[str, Set[str]]:
+    """Run one `ninja -t query` over the nodes the graph knows
+
+    Ninja stops at the first unknown target (new files, headers that are
+    only in the deps log), so those are filtered out against `known` first
+    instead of retrying with a full graph reload per unknown node.
+    """
+    queried = [node for node in nodes if node in known]
+    if not queried:
+        return {}
+    result = subprocess.run(
+        [ninja, "-C", str(out_path), "-t", "query", *queried],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    if result.returncode != 0:
+        log_warning(f"ninja -t query failed: {result.stderr.strip()}")
+        return {}
+    return parse_query_output(result.stdout.splitlines())
+
+
+def scan_deps(ninja: str, out_path: Path, wanted: Set[str]) -> Dict[str, Set[str]]:
+    """Stream `ninja -t deps` and collect dependents of the wanted nodes"""
+    process = subprocess.Popen(
+        [ninja, "-C", str(out_path), "-t", "deps"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+    )
+    try:
+        dependents = parse_deps_output(process.stdout, wanted)
+    finally:
+        process.stdout.close()
+        process.wait()
+    return dependents
+
+
+def estimate_rebuild_cost(ctx: BuildContext, files: List[str]) -> Dict:
+    """Estimate compile actions and time needed after changing `files`"""
+    out_path = join_paths(ctx.chromium_src, ctx.out_dir)
+    if not (out_path / "build.ninja").exists():
+        raise FileNotFoundError(f"No build.ninja in {out_path}, run configure first")
+
+    ninja = get_ninja_command()
+    nodes = {f: to_graph_path(ctx.chromium_src, out_path, f) for f in files}
+
+    log_info(f"🔎 Querying ninja graph for {len(files)} file(s)...")
+    known = list_graph_inputs(ninja, out_path) or set()
+    direct = query_direct_outputs(ninja, out_path, sorted(set(nodes.values())), known)
+
+    # Generated files (e.g. headers from .grd/.mojom) pull in their own
+    # compile dependents, so look those up in the deps log as well
+    wanted = set(nodes.values())
+    for outputs in direct.values():
+        wanted.update(outputs)
+    log_info("🔎 Scanning ninja deps log...")
+    dependents = scan_deps(ninja, out_path, wanted)
+
+    log = NinjaLog(out_path / ".ninja_log")
+    log.refresh()
+    known = [e.duration for e in log.history.values() if e.output.endswith(".o")]
+    fallback = statistics.median(known) if known else 1.0
+    history_report = build_report(log)
+    parallelism = history_report.get("average_parallelism") or os.cpu_count() or 1
+
+    def cost_of(actions: Set[str]) -> float:
+        total = 0.0
+        for output in actions:
+            duration = log.expected_duration(output)
+            total += fallback if duration is None else duration
+        return total
+
+    costs: List[FileCost] = []
+    all_actions: Set[str] = set()
+    for file_path, node in nodes.items():
+        actions = set(direct.get(node, set())) | dependents.get(node, set())
+        for output in direct.get(node, set()):
+            actions |= dependents.get(output, set())
+        cost = FileCost(
+            file=file_path,
+            actions=actions,
+            seconds=cost_of(actions),
+            in_graph=node in direct or bool(dependents.get(node)),
+            regenerates_gn=file_path.endswith(GN_FILE_SUFFIXES),
+        )
+        costs.append(cost)
+        all_actions |= actions
+
+    costs.sort(key=lambda c: (-len(c.actions), c.file))
+    total_seconds = cost_of(all_actions)
+
+    return {
+        "out_dir": str(out_path),
+        "files": [
+            {
+                "file": c.file,
+                "actions": len(c.actions),
+                "seconds": round(c.seconds, 1),
+                "in_graph": c.in_graph,
+                "regenerates_gn": c.regenerates_gn,
+                "heavy": len(c.actions) > HEAVY_FILE_ACTIONS,
+            }
+            for c in costs
+        ],
+        "total_actions": len(all_actions),
+        "total_step_seconds": round(total_seconds, 1),
+        "parallelism": round(parallelism, 2),
+        "estimated_wall_seconds": round(total_seconds / parallelism, 1),
+        "fallback_step_seconds": round(fallback, 3),
+    }
+
+
+def log_cost_report(report: Dict, limit: Optional[int] = 20):
+    """Log a rebuild cost report"""
+    files = report["files"]
+    log_info("\n🧮 Rebuild cost estimate")
+    log_info(f"{'Actions':>8} {'Est.':>9}  File")
+    for item in files[:limit]:
+        marks = []
+        if item["heavy"]:
+            marks.append("heavy")
+        if item["regenerates_gn"]:
+            marks.append("gn gen")
+        if not item["in_graph"]:
+            marks.append("not in graph")
+        suffix = f"  [{', '.join(marks)}]" if marks else ""
+        log_info(
+            f"{item['actions']:>8} {item['seconds'] / report['parallelism']:>8.0f}s"
+            f"  {item['file']}{suffix}"
+        )
+    if limit and len(files) > limit:
+        log_info(f"  ... and {len(files) - limit} more")
+
+    mins, secs = divmod(int(report["estimated_wall_seconds"]), 60)
+    log_info(
+        f"\nTotal: {report['total_actions']} compile/action steps, "
+        f"~{mins}m {secs}s at parallelism {report['parallelism']:.1f}"
+    )
+    if any(item["regenerates_gn"] for item in files):
+        log_warning("Some files are gn files: gn gen will rerun before compiling")
+    heavy = [item["file"] for item in files if item["heavy"]]
+    if heavy:
+        log_info(f"{len(heavy)} heavy file(s); batch these into one rebuild")
@@ -1,20 +1,292 @@
 #!/usr/bin/env python3
 """
 Resource management module for Nxtscape build system
+
+Copies are incremental: each operation keeps a manifest of the files it
+copied (size, mtime and hash), so unchanged files are left alone and
+files dropped from a source are removed from the Chromium tree.
 """
 
+import os
 import sys
 import glob
+import json
 import shutil
+import hashlib
 import yaml
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional
 from context import BuildContext
-from utils import log_info, log_success, log_error, log_warning, get_platform
+from utils import (
+    log_info,
+    log_success,
+    log_error,
+    log_warning,
+    get_platform,
+    prune_empty_dirs,
+)
+
+
+# Per-operation manifests live under out/, which Chromium's .gitignore covers
+MANIFEST_DIR_NAME = ".nxtscape_resource_manifests"
+
+HASH_CHUNK = 1024 * 1024
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _manifest_path(ctx: BuildContext, index: int) -> Path:
+    """Manifest of the operation at `index` in copy_operations
+
+    Names needn't be unique (or set at all), so the position in the config
+    is the key.
+    """
+    return ctx.chromium_src / "out" / MANIFEST_DIR_NAME / f"op_{index:03d}.json"
+
+
+def _load_manifest(path: Path) -> Dict[str, Dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: Path, manifest: Dict[str, Dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+
+
+@dataclass
+class CopyOperation:
+    """One copy operation from copy_resources.yaml, resolved to files"""
+
+    name: str
+    source: str
+    destination: str
+    op_type: str
+    # Chromium-relative destination -> source file, in sorted order
+    files: Dict[str, Path] = field(default_factory=dict)
+    manifest_path: Optional[Path] = None
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def describe(self) -> str:
+        counts = f"({self.updated} updated, {self.unchanged} unchanged"
+        if self.removed:
+            counts += f", {self.removed} removed"
+        counts += ")"
+        if self.op_type == "directory":
+            return f"Copied directory: {self.source} → {self.destination} {counts}"
+        if self.op_type == "files":
+            return (
+                f"Copied {len(self.files)} files: {self.source} → "
+                f"{self.destination} {counts}"
+            )
+        return f"Copied file: {self.source} → {self.destination} {counts}"
+
+
+def _operation_applies(ctx: BuildContext, operation: Dict) -> bool:
+    """Check the build_type/os/arch conditions of an operation"""
+    name = operation.get("name", "Unnamed operation")
+    build_type_condition = operation.get("build_type")
+    os_condition = operation.get("os")
+    arch_condition = operation.get("arch")
+
+    # Skip operation if build_type condition doesn't match
+    if build_type_condition and build_type_condition != ctx.build_type:
+        log_info(
+            f"  ⏭️  Skipping {name} (build_type: {build_type_condition}, current: {ctx.build_type})"
+        )
+        return False
+
+    # Skip operation if os condition doesn't match
+    if os_condition:
+        current_os = get_platform()
+        if current_os not in os_condition:
+            log_info(
+                f"  ⏭️  Skipping {name} (os: {os_condition}, current: {current_os})"
+            )
+            return False
+
+    # Skip operation if arch condition doesn't match
+    if arch_condition:
+        if ctx.architecture not in arch_condition:
+            log_info(
+                f"  ⏭️  Skipping {name} (arch: {arch_condition}, current: {ctx.architecture})"
+            )
+            return False
+
+    return True
+
+
+def _plan_operation(
+    ctx: BuildContext, index: int, operation: Dict
+) -> Optional[CopyOperation]:
+    """Resolve an operation's source files, or None if the source is missing"""
+    op = CopyOperation(
+        name=operation.get("name", "Unnamed operation"),
+        source=operation["source"],
+        destination=operation["destination"],
+        op_type=operation.get("type", "directory"),
+    )
+    op.manifest_path = _manifest_path(ctx, index)
+    src_path = ctx.root_dir / op.source
+    dst_base = op.destination.rstrip("/")
+
+    if op.op_type == "directory":
+        if not src_path.is_dir():
+            log_warning(f"    Source directory not found: {op.source}")
+            return None
+        for file_path in sorted(src_path.rglob("*")):
+            if file_path.is_file():
+                relative = file_path.relative_to(src_path).as_posix()
+                op.files[f"{dst_base}/{relative}"] = file_path
+
+    elif op.op_type == "files":
+        matches = sorted(glob.glob(str(ctx.root_dir / op.source)))
+        if not matches:
+            log_warning(f"    No files found matching: {op.source}")
+            return None
+        for file_path in map(Path, matches):
+            if file_path.is_file():
+                op.files[f"{dst_base}/{file_path.name}"] = file_path
+
+    elif op.op_type == "file":
+        if not src_path.is_file():
+            log_warning(f"    Source file not found: {op.source}")
+            return None
+        op.files[dst_base] = src_path
+
+    return op
+
+
+def _is_current(src: Path, dst: Path, entry: Optional[Dict]) -> bool:
+    """Check a destination against the manifest entry of its last copy
+
+    The destination must still have the size and mtime recorded after the
+    copy, and the source must be unchanged: by stat, or failing that
+    (e.g. after a checkout touched it) by content hash.
+    """
+    if not entry:
+        return False
+    try:
+        dst_stat = dst.stat()
+    except FileNotFoundError:
+        return False
+    if dst_stat.st_size != entry["size"] or dst_stat.st_mtime_ns != entry["dst_mtime_ns"]:
+        return False
+    src_stat = src.stat()
+    if src_stat.st_size != entry["size"]:
+        return False
+    if src_stat.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    if _file_hash(src) == entry["hash"]:
+        entry["mtime_ns"] = src_stat.st_mtime_ns
+        return True
+    return False
+
+
+def _sync_operation(ctx: BuildContext, op: CopyOperation):
+    """Copy an operation's changed files and record them in its manifest"""
+    old_manifest = _load_manifest(op.manifest_path)
+    manifest = {}
+
+    for relative, src in op.files.items():
+        dst = ctx.chromium_src / relative
+        entry = old_manifest.get(relative)
+        if _is_current(src, dst, entry):
+            manifest[relative] = entry
+            op.unchanged += 1
+            continue
+
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dst)
+        src_stat = src.stat()
+        manifest[relative] = {
+            "size": src_stat.st_size,
+            "mtime_ns": src_stat.st_mtime_ns,
+            "hash": _file_hash(src),
+            "dst_mtime_ns": dst.stat().st_mtime_ns,
+        }
+        op.updated += 1
+
+    _save_manifest(op.manifest_path, manifest)
+
+
+def _remove_stale_files(
+    ctx: BuildContext, ops: List[CopyOperation], owned: set, op_count: int
+):
+    """Undo files earlier runs copied that no operation provides any more
+
+    Looks at the manifests of the applied operations and at those no
+    longer matching any configured operation (removed from the config,
+    or left from an older naming scheme), which are deleted afterwards.
+    Tracked Chromium files an operation had overwritten are checked out
+    from HEAD again; only files the copy created are deleted.
+    """
+    from modules.clean import git_pathspec_output, git_with_pathspecs
+
+    manifest_dir = _manifest_path(ctx, 0).parent
+    configured = {_manifest_path(ctx, i) for i in range(op_count)}
+    orphans = [
+        path
+        for path in sorted(manifest_dir.glob("*.json"))
+        if path not in configured
+    ]
+
+    stale: Dict[str, Optional[CopyOperation]] = {}
+    for op in ops:
+        for relative in _load_manifest(op.manifest_path):
+            if relative not in owned:
+                stale.setdefault(relative, op)
+    for path in orphans:
+        for relative in _load_manifest(path):
+            if relative not in owned:
+                stale.setdefault(relative, None)
+
+    tracked = set()
+    if (ctx.chromium_src / ".git").exists():
+        pathspecs = [f":(literal){p}" for p in sorted(stale)]
+        tracked = set(git_pathspec_output(ctx.chromium_src, ["ls-files"], pathspecs))
+    if tracked:
+        git_with_pathspecs(ctx.chromium_src, ["checkout", "HEAD"], sorted(tracked))
+
+    for relative, op in sorted(stale.items()):
+        if relative not in tracked:
+            path = ctx.chromium_src / relative
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            prune_empty_dirs(path.parent, ctx.chromium_src)
+        if op:
+            op.removed += 1
+
+    for path in orphans:
+        path.unlink(missing_ok=True)
 
 
-def copy_resources(ctx: BuildContext, commit_each: bool = False) -> bool:
-    """Copy AI extensions and icons based on YAML configuration"""
+def copy_resources(
+    ctx: BuildContext, commit_each: bool = False, workers: Optional[int] = None
+) -> bool:
+    """Copy AI extensions and icons based on YAML configuration
+
+    Every destination file is owned by the last operation (in config
+    order) that writes it, which matches copying the operations one after
+    another. With ownership settled up front the operations never write
+    the same file, so they run concurrently unless each needs its own
+    commit.
+    """
     log_info("\n📦 Copying resources...")
 
     # Load copy configuration
@@ -37,100 +309,79 @@ def copy_resources(ctx: BuildContext, commit_each: bool = False) -> bool:
             "📝 Git commit mode enabled - will create a commit after each resource copy"
         )
 
-    # Process each copy operation
-    for operation in config["copy_operations"]:
-        name = operation.get("name", "Unnamed operation")
-        source = operation["source"]
-        destination = operation["destination"]
-        op_type = operation.get("type", "directory")
-        build_type_condition = operation.get("build_type")
-        os_condition = operation.get("os")
-        arch_condition = operation.get("arch")
-
-        # Skip operation if build_type condition doesn't match
-        if build_type_condition and build_type_condition != ctx.build_type:
-            log_info(
-                f"  ⏭️  Skipping {name} (build_type: {build_type_condition}, current: {ctx.build_type})"
-            )
+    ops: List[CopyOperation] = []
+    for index, operation in enumerate(config["copy_operations"]):
+        if not _operation_applies(ctx, operation):
             continue
+        try:
+            op = _plan_operation(ctx, index, operation)
+        except Exception as e:
+            log_error(f"    Error: {e}")
+            continue
+        if op:
+            ops.append(op)
 
-        # Skip operation if os condition doesn't match
-        if os_condition:
-            current_os = get_platform()
-            if current_os not in os_condition:
-                log_info(
-                    f"  ⏭️  Skipping {name} (os: {os_condition}, current: {current_os})"
-                )
-                continue
-
-        # Skip operation if arch condition doesn't match
-        if arch_condition:
-            if ctx.architecture not in arch_condition:
-                log_info(
-                    f"  ⏭️  Skipping {name} (arch: {arch_condition}, current: {ctx.architecture})"
-                )
-                continue
-
-        # Resolve paths
-        src_path = ctx.root_dir / source
-        dst_base = ctx.chromium_src / destination
+    # Later operations take over destinations of earlier ones
+    owners: Dict[str, CopyOperation] = {}
+    for op in ops:
+        for relative in op.files:
+            owners[relative] = op
+    for op in ops:
+        op.files = {
+            relative: src
+            for relative, src in op.files.items()
+            if owners[relative] is op
+        }
 
-        log_info(f"  • {name}")
+    _remove_stale_files(ctx, ops, set(owners), len(config["copy_operations"]))
 
+    def run(op: CopyOperation) -> Optional[str]:
         try:
-            if op_type == "directory":
-                # Copy entire directory
-                if src_path.exists() and src_path.is_dir():
-                    dst_path = dst_base
-                    dst_path.mkdir(parents=True, exist_ok=True)
-                    shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
-                    log_info(f"    ✓ Copied directory: {source} → {destination}")
-                    if commit_each:
-                        commit_resource_copy(
-                            name, source, destination, ctx.chromium_src
-                        )
-                else:
-                    log_warning(f"    Source directory not found: {source}")
-
-            elif op_type == "files":
-                # Copy files matching pattern
-                files = glob.glob(str(ctx.root_dir / source))
-                if files:
-                    dst_base.mkdir(parents=True, exist_ok=True)
-                    for file_path in files:
-                        file_path = Path(file_path)
-                        if file_path.is_file():
-                            shutil.copy2(file_path, dst_base)
-                    log_info(
-                        f"    ✓ Copied {len(files)} files: {source} → {destination}"
-                    )
-                    if commit_each:
-                        commit_resource_copy(
-                            name, source, destination, ctx.chromium_src
-                        )
-                else:
-                    log_warning(f"    No files found matching: {source}")
-
-            elif op_type == "file":
-                # Copy single file
-                if src_path.exists() and src_path.is_file():
-                    dst_base.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src_path, dst_base)
-                    log_info(f"    ✓ Copied file: {source} → {destination}")
-                    if commit_each:
-                        commit_resource_copy(
-                            name, source, destination, ctx.chromium_src
-                        )
-                else:
-                    log_warning(f"    Source file not found: {source}")
-
+            _sync_operation(ctx, op)
         except Exception as e:
-            log_error(f"    Error: {e}")
+            return str(e)
+        return None
+
+    if commit_each:
+        for op in ops:
+            log_info(f"  • {op.name}")
+            error = run(op)
+            if error:
+                log_error(f"    Error: {error}")
+                continue
+            log_info(f"    ✓ {op.describe()}")
+            commit_resource_copy(op.name, op.source, op.destination, ctx.chromium_src)
+    else:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            errors = list(pool.map(run, ops))
+        # Report in config order regardless of completion order
+        for op, error in zip(ops, errors):
+            log_info(f"  • {op.name}")
+            if error:
+                log_error(f"    Error: {error}")
+            else:
+                log_info(f"    ✓ {op.describe()}")
 
     log_success("Resources copied")
     return True
 
 
+def list_resource_destinations(ctx: BuildContext) -> List[str]:
+    """Chromium paths written by any copy operation (conditions ignored)"""
+    copy_config_path = ctx.get_copy_resources_config()
+    if not copy_config_path.exists():
+        return []
+    with open(copy_config_path, "r") as f:
+        config = yaml.safe_load(f) or {}
+    return sorted(
+        {
+            operation["destination"].rstrip("/")
+            for operation in config.get("copy_operations") or []
+            if operation.get("destination")
+        }
+    )
+
+
 def commit_resource_copy(
     name: str, source: str, destination: str, chromium_src: Path
 ) -> bool:
@@ -820,6 +820,7 @@ def sign_universal(contexts: List[BuildContext]) -> bool:
         universal_ctx = BuildContext(
             root_dir=contexts[0].root_dir,
             chromium_src=contexts[0].chromium_src,
+            out_dir="out/Default_universal",
             architecture="universal",
             build_type=contexts[0].build_type,
             apply_patches=False,
@@ -827,8 +828,6 @@ def sign_universal(contexts: List[BuildContext]) -> bool:
             package=False,
             build=False,
         )
-        # Override out_dir for universal
-        universal_ctx.out_dir = "out/Default_universal"
 
         # Sign the universal binary
         if not sign_app(universal_ctx, create_dmg=False):
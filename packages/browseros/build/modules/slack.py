@@ -1,17 +1,35 @@
 #!/usr/bin/env python3
 """
 Slack notification module for Nxtscape build system
+
+Notifications are posted from a background thread so a slow or
+unreachable webhook never stalls the build. Step messages that arrive
+within a short window are coalesced into one post, every post has a
+timeout, and the queue is flushed (with a bounded wait) after the final
+build notification and at interpreter exit.
 """
 
-import os
+import atexit
 import json
-import requests
-from typing import Optional, List
-import sys
 import os
+import queue
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import requests
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from utils import log_info, log_warning, log_error, get_platform
+from utils import log_info, log_warning, get_platform
+
+# Step messages arriving within this many seconds are sent as one post
+COALESCE_WINDOW = 2.0
+# (connect, read) timeout for each webhook request
+POST_TIMEOUT = (3.0, 5.0)
+# Longest a flush waits for queued notifications to go out
+FLUSH_TIMEOUT = 15.0
+MAX_QUEUED = 100
 
 
 def get_slack_webhook_url() -> Optional[str]:
@@ -32,14 +50,8 @@ def get_os_info() -> tuple[str, str]:
         return "💻", platform.capitalize()
 
 
-def send_slack_notification(message: str, success: bool = True) -> bool:
-    """Send a notification to Slack if webhook URL is configured"""
-    webhook_url = get_slack_webhook_url()
-
-    if not webhook_url:
-        # Silently skip if no webhook configured
-        return True
-
+def build_payload(message: str, success: bool = True) -> dict:
+    """Create the Slack message payload"""
     # Choose emoji and color based on success status
     emoji = "✅" if success else "❌"
     color = "good" if success else "danger"
@@ -47,8 +59,7 @@ def send_slack_notification(message: str, success: bool = True) -> bool:
     # Get OS information
     os_emoji, os_name = get_os_info()
 
-    # Create Slack message payload
-    payload = {
+    return {
         "attachments": [
             {
                 "color": color,
@@ -65,12 +76,21 @@ def send_slack_notification(message: str, success: bool = True) -> bool:
         ]
     }
 
+
+def post_notification(
+    webhook_url: str,
+    message: str,
+    success: bool = True,
+    session: Optional[requests.Session] = None,
+    timeout=POST_TIMEOUT,
+) -> bool:
+    """POST one notification to the webhook, logging instead of raising"""
     try:
-        response = requests.post(
+        response = (session or requests).post(
             webhook_url,
-            data=json.dumps(payload),
+            data=json.dumps(build_payload(message, success)),
             headers={"Content-Type": "application/json"},
-            timeout=10,
+            timeout=timeout,
         )
 
         if response.status_code == 200:
@@ -85,17 +105,181 @@ def send_slack_notification(message: str, success: bool = True) -> bool:
         return False
 
 
+def send_slack_notification(message: str, success: bool = True) -> bool:
+    """Send a notification to Slack synchronously if a webhook is configured"""
+    webhook_url = get_slack_webhook_url()
+
+    if not webhook_url:
+        # Silently skip if no webhook configured
+        return True
+
+    return post_notification(webhook_url, message, success)
+
+
+class SlackNotifier:
+    """Background sender for Slack notifications
+
+    notify() only enqueues. A worker thread posts messages in order,
+    joining consecutive coalescible (step) messages that arrive within
+    coalesce_window into a single post.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        webhook_url: str,
+        coalesce_window: float = COALESCE_WINDOW,
+        timeout=POST_TIMEOUT,
+        max_queued: int = MAX_QUEUED,
+    ):
+        self.webhook_url = webhook_url
+        self.coalesce_window = coalesce_window
+        self.timeout = timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._session = requests.Session()
+        self._thread = threading.Thread(
+            target=self._run, name="slack-notifier", daemon=True
+        )
+        self._thread.start()
+
+    def notify(
+        self, message: str, success: bool = True, coalesce: bool = False
+    ) -> bool:
+        """Queue a notification; False if it had to be dropped"""
+        try:
+            self._queue.put_nowait((message, success, coalesce))
+            return True
+        except queue.Full:
+            log_warning(f"Slack queue full, dropping notification: {message}")
+            return False
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """Wait until everything queued so far has been sent"""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        if not done.wait(timeout):
+            log_warning("Timed out waiting for Slack notifications to be sent")
+            return False
+        return True
+
+    def close(self, timeout: float = FLUSH_TIMEOUT):
+        """Flush and stop the worker thread"""
+        if not self._thread.is_alive():
+            return
+        # A worker stuck on an unreachable webhook is a daemon thread and
+        # is left behind rather than waited on twice
+        if self.flush(timeout):
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+            self._session.close()
+
+    def _send(self, messages: List[Tuple[str, bool]]):
+        if not messages:
+            return
+        message = "\n".join(text for text, _ in messages)
+        success = all(ok for _, ok in messages)
+        try:
+            post_notification(
+                self.webhook_url, message, success, self._session, self.timeout
+            )
+        except Exception as e:
+            # Keep the worker alive, or every later notify and flush stalls
+            log_warning(f"Failed to send Slack notification: {e}")
+
+    def _run(self):
+        pending: List[Tuple[str, bool]] = []  # Coalesced messages not yet sent
+        deadline = 0.0
+        while True:
+            try:
+                if pending:
+                    wait = max(0.0, deadline - time.monotonic())
+                    item = self._queue.get(timeout=wait)
+                else:
+                    item = self._queue.get()
+            except queue.Empty:
+                self._send(pending)
+                pending = []
+                continue
+
+            if item is self._STOP:
+                self._send(pending)
+                return
+            if isinstance(item, threading.Event):
+                self._send(pending)
+                pending = []
+                item.set()
+                continue
+
+            message, success, coalesce = item
+            if coalesce:
+                if not pending:
+                    deadline = time.monotonic() + self.coalesce_window
+                pending.append((message, success))
+            else:
+                # Keep ordering: earlier step messages go out first
+                self._send(pending)
+                pending = []
+                self._send([(message, success)])
+
+
+_notifier: Optional[SlackNotifier] = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier() -> Optional[SlackNotifier]:
+    """The process-wide notifier, or None when no webhook is configured"""
+    global _notifier
+    webhook_url = get_slack_webhook_url()
+    if not webhook_url:
+        return None
+    with _notifier_lock:
+        if _notifier is None or _notifier.webhook_url != webhook_url:
+            if _notifier is not None:
+                _notifier.close()
+            _notifier = SlackNotifier(webhook_url)
+    return _notifier
+
+
+def flush_notifications(timeout: float = FLUSH_TIMEOUT) -> bool:
+    """Send everything queued, waiting at most `timeout` seconds"""
+    return _notifier.flush(timeout) if _notifier else True
+
+
+@atexit.register
+def _close_notifier():
+    if _notifier is not None:
+        _notifier.close()
+
+
+def _notify(
+    message: str, success: bool = True, coalesce: bool = False, final: bool = False
+) -> bool:
+    """Queue a notification; final ones flush the queue before returning"""
+    notifier = get_notifier()
+    if notifier is None:
+        # Silently skip if no webhook configured
+        return True
+    queued = notifier.notify(message, success, coalesce)
+    if final:
+        flush_notifications()
+    return queued
+
+
 def notify_build_started(build_type: str, arch: str) -> bool:
     """Notify that build has started"""
     _, os_name = get_os_info()
     message = f"Build started on {os_name} - {build_type} build for {arch}"
-    return send_slack_notification(message, success=True)
+    return _notify(message, success=True)
 
 
 def notify_build_step(step_name: str) -> bool:
     """Notify about a build step"""
     message = f"Running step: {step_name}"
-    return send_slack_notification(message, success=True)
+    return _notify(message, success=True, coalesce=True)
 
 
 def notify_build_success(
@@ -115,19 +299,19 @@ def notify_build_success(
             else:
                 message += f"\n• {uri}"
 
-    return send_slack_notification(message, success=True)
+    return _notify(message, success=True, final=True)
 
 
 def notify_build_failure(error_message: str) -> bool:
     """Notify that build failed"""
     message = f"Build failed: {error_message}"
-    return send_slack_notification(message, success=False)
+    return _notify(message, success=False, final=True)
 
 
 def notify_build_interrupted() -> bool:
     """Notify that build was interrupted"""
     message = "Build was interrupted by user"
-    return send_slack_notification(message, success=False)
+    return _notify(message, success=False, final=True)
 
 
 def notify_gcs_upload(architecture: str, gcs_uris: List[str]) -> bool:
@@ -146,4 +330,4 @@ def notify_gcs_upload(architecture: str, gcs_uris: List[str]) -> bool:
         else:
             message += f"\n• {uri}"
 
-    return send_slack_notification(message, success=True)
+    return _notify(message, success=True)
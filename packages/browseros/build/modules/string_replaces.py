@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 """
 String replacement module for BrowserOS build system
+
+All branding patterns are compiled into one alternation and applied in a
+single pass per file. At each position the first pattern in list order
+wins, which gives the same result as running the patterns one after the
+other as long as no replacement text matches a later pattern (checked
+by test_string_replaces.py). Files are processed in a worker pool and
+only written when their content changes; an index of what the last run
+produced skips translation files that haven't changed since.
 """
 
+import hashlib
+import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 from context import BuildContext
 from utils import log_info, log_success, log_error, log_warning
 
 
-# Strings we want to replace but that we also replace automatically
-# for XTB files
+# Strings we want to replace in the strings files and, automatically, in
+# every XTB translation
 branding_replacements = [
     (
         r"The Chromium Authors. All rights reserved.",
@@ -34,49 +47,249 @@ target_files = [
     "chrome/app/settings_chromium_strings.grdp",
 ]
 
+# Translation files branded along with target_files (globs under chromium_src)
+translation_globs = [
+    "chrome/app/resources/*.xtb",
+]
+
+BRANDING_INDEX_NAME = ".nxtscape_branding_index.json"
+
+
+# Below this many files the pool's startup costs more than it saves
+MIN_FILES_FOR_POOL = 8
+
+
+class ReplacementEngine:
+    """Apply an ordered list of (pattern, replacement) pairs in one pass"""
+
+    def __init__(self, replacements: Sequence[Tuple[str, str]]):
+        self.replacements = list(replacements)
+        self.patterns = [re.compile(pattern) for pattern, _ in self.replacements]
+        self.combined = re.compile(
+            "|".join(
+                f"(?P<p{i}>{pattern})"
+                for i, (pattern, _) in enumerate(self.replacements)
+            )
+        )
+
+    def apply(self, text: str) -> Tuple[str, List[int]]:
+        """Return the replaced text and the hit count of each pattern"""
+        counts = [0] * len(self.replacements)
+        parts = []
+        last = 0
+        for match in self.combined.finditer(text):
+            index = int(match.lastgroup[1:])
+            counts[index] += 1
+            # Re-match the single pattern in place so backreferences and
+            # lookarounds in the replacement behave as with re.sub
+            single = self.patterns[index].match(text, match.start())
+            parts.append(text[last : match.start()])
+            parts.append(single.expand(self.replacements[index][1]))
+            last = match.end()
+        if not parts:
+            return text, counts
+        parts.append(text[last:])
+        return "".join(parts), counts
+
+
+class FileResult(NamedTuple):
+    """Outcome of branding one file"""
+
+    path: str
+    changed: bool
+    counts: List[int]
+    error: Optional[str]
+    source_hash: Optional[str] = None  # Content before replacement
+    result_hash: Optional[str] = None  # Content after replacement
+
+
+_worker_engine: Optional[ReplacementEngine] = None
+
+
+def _init_worker(replacements: Sequence[Tuple[str, str]]):
+    global _worker_engine
+    _worker_engine = ReplacementEngine(replacements)
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _replace_file(job: Tuple[str, Optional[str]]) -> FileResult:
+    """Worker: brand one file, write it only if it changed
+
+    If the file's hash equals `branded_hash` (the result recorded by a
+    previous run) it is already branded and the patterns aren't run.
+    """
+    path, branded_hash = job
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        source_hash = _hash(data)
+        if source_hash == branded_hash:
+            return FileResult(path, False, [], None, source_hash, source_hash)
+
+        # Decoding bytes directly keeps the file's own line endings
+        content = data.decode("utf-8")
+        new_content, counts = _worker_engine.apply(content)
+        if new_content == content:
+            return FileResult(path, False, counts, None, source_hash, source_hash)
+
+        new_data = new_content.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(new_data)
+        return FileResult(path, True, counts, None, source_hash, _hash(new_data))
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(path, False, [], str(e))
+
+
+def replace_in_files(
+    paths: Sequence[Path],
+    replacements: Sequence[Tuple[str, str]],
+    workers: Optional[int] = None,
+    branded_hashes: Optional[Dict[str, str]] = None,
+) -> List[FileResult]:
+    """Apply replacements to many files in parallel
+
+    `branded_hashes` maps a path to the hash it had after branding last
+    time; files still at that hash are skipped. Results are in input order.
+    """
+    branded_hashes = branded_hashes or {}
+    jobs = [(str(p), branded_hashes.get(str(p))) for p in paths]
+    if len(jobs) < MIN_FILES_FOR_POOL or workers == 1:
+        _init_worker(replacements)
+        return [_replace_file(job) for job in jobs]
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(replacements,)
+    ) as pool:
+        return list(pool.map(_replace_file, jobs, chunksize=16))
+
+
+class BrandingIndex:
+    """Per-file record of what branding produced, to skip unchanged files
+
+    Entries hold the size and mtime after branding plus the source and
+    result hashes. A file whose size and mtime still match is skipped
+    without being read; otherwise a matching result hash skips the
+    patterns. The index is dropped when the replacement rules change.
+    """
+
+    def __init__(self, path: Path, replacements: Sequence[Tuple[str, str]]):
+        self.path = path
+        self.rules = _hash(json.dumps(list(replacements)).encode("utf-8"))
+        self.files: Dict[str, Dict] = {}
+        try:
+            data = json.loads(path.read_text())
+            if data.get("rules") == self.rules:
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def for_context(cls, ctx: BuildContext) -> "BrandingIndex":
+        # out/ is ignored by Chromium's .gitignore and survives out dir cleans
+        return cls(
+            ctx.chromium_src / "out" / BRANDING_INDEX_NAME, branding_replacements
+        )
+
+    def is_current(self, relative: str, stat: os.stat_result) -> bool:
+        entry = self.files.get(relative)
+        return bool(
+            entry
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        )
+
+    def branded_hash(self, relative: str) -> Optional[str]:
+        entry = self.files.get(relative)
+        return entry["result"] if entry else None
+
+    def record(self, relative: str, result: FileResult):
+        stat = os.stat(result.path)
+        self.files[relative] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "source": result.source_hash,
+            "result": result.result_hash,
+        }
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(
+                json.dumps({"rules": self.rules, "files": self.files}, sort_keys=True)
+            )
+        except OSError as e:
+            log_warning(f"Failed to save branding index: {e}")
+
+
+def list_target_files(ctx: BuildContext) -> List[str]:
+    """Chromium paths that string replacements may modify"""
+    files = list(target_files)
+    for pattern in translation_globs:
+        files.extend(
+            sorted(
+                p.relative_to(ctx.chromium_src).as_posix()
+                for p in ctx.chromium_src.glob(pattern)
+            )
+        )
+    return files
+
 
 def apply_string_replacements(ctx: BuildContext) -> bool:
-    """Apply string replacements to specified files"""
+    """Apply string replacements to the strings and translation files"""
     log_info("\n🔤 Applying string replacements...")
 
-    success = True
-
-    for file_path in target_files:
+    index = BrandingIndex.for_context(ctx)
+    paths = []
+    skipped = 0
+    for file_path in list_target_files(ctx):
         full_path = ctx.chromium_src / file_path
-
-        if not full_path.exists():
+        try:
+            stat = full_path.stat()
+        except FileNotFoundError:
             log_warning(f"  ⚠️  File not found: {file_path}")
             continue
+        if index.is_current(file_path, stat):
+            skipped += 1
+            continue
+        paths.append(full_path)
 
-        log_info(f"  • Processing: {file_path}")
+    branded_hashes = {
+        str(ctx.chromium_src / relative): index.branded_hash(relative)
+        for relative in index.files
+    }
+    results = replace_in_files(
+        paths, branding_replacements, branded_hashes=branded_hashes
+    )
 
-        try:
-            # Read the file content
-            with open(full_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            original_content = content
-            replacement_count = 0
-
-            # Apply each replacement
-            for pattern, replacement in branding_replacements:
-                matches = len(re.findall(pattern, content))
-                if matches > 0:
-                    content = re.sub(pattern, replacement, content)
-                    replacement_count += matches
-                    log_info(f"    ✓ Replaced {matches} occurrences of '{pattern}'")
-
-            # Write back if changes were made
-            if content != original_content:
-                with open(full_path, "w", encoding="utf-8") as f:
-                    f.write(content)
-                log_success(f"    Updated with {replacement_count} total replacements")
-            else:
-                log_info(f"    No replacements needed")
-
-        except Exception as e:
-            log_error(f"    Error processing {file_path}: {e}")
+    success = True
+    totals = [0] * len(branding_replacements)
+    changed_files = 0
+    for result in results:
+        relative = Path(result.path).relative_to(ctx.chromium_src).as_posix()
+        if result.error:
+            log_error(f"    Error processing {relative}: {result.error}")
             success = False
+            continue
+        index.record(relative, result)
+        for i, count in enumerate(result.counts):
+            totals[i] += count
+        if result.changed:
+            changed_files += 1
+            log_info(f"  • Updated {relative} ({sum(result.counts)} replacements)")
+
+    index.save()
+
+    for (pattern, _), count in zip(branding_replacements, totals):
+        if count:
+            log_info(f"    ✓ Replaced {count} occurrences of '{pattern}'")
+    log_info(
+        f"  {changed_files} file(s) changed, {len(results) - changed_files} "
+        f"already branded, {skipped} unchanged since last run"
+    )
 
     if success:
         log_success("String replacements completed")
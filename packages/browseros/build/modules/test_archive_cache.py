@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for the third-party archive cache
+
+Serves a small tar.xz from a file:// URL and checks that it is
+downloaded and unpacked once, that reinstalling the same version is a
+no-op, that unpinned archives have their first checksum recorded and
+that downloads not matching the expected checksum are rejected.
+"""
+
+import hashlib
+import io
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import archive_cache
+from modules.archive_cache import ArchiveCache, ArchiveSpec
+
+
+def _make_archive(directory: Path, version: str) -> Path:
+    """A tar.xz shaped like the Sparkle release, with a framework symlink"""
+    archive = directory / f"Sparkle-{version}.tar.xz"
+    with tarfile.open(archive, "w:xz") as tar:
+        data = f"sparkle {version}\n".encode()
+        info = tarfile.TarInfo("Sparkle.framework/Versions/B/Sparkle")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("Sparkle.framework/Versions/Current")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "B"
+        tar.addfile(link)
+    return archive
+
+
+def _spec(archive: Path, version: str) -> ArchiveSpec:
+    digest = hashlib.sha256(archive.read_bytes()).hexdigest()
+    return ArchiveSpec("Sparkle", version, archive.as_uri(), digest)
+
+
+def test_install_once_then_noop():
+    """Test download, versioned extraction and the no-op reinstall"""
+    base = Path(tempfile.mkdtemp())
+    archive = _make_archive(base, "2.7.0")
+    spec = _spec(archive, "2.7.0")
+    cache = ArchiveCache(base / "cache")
+    dest = base / "src" / "third_party" / "sparkle"
+
+    assert cache.install(spec, dest)
+    digest = spec.sha256
+    assert (cache.blobs_dir / digest).exists()
+    assert (cache.extracted_dir / f"Sparkle-2.7.0-{digest[:12]}").is_dir()
+    assert (dest / "Sparkle.framework/Versions/Current").is_symlink()
+    assert (dest / "Sparkle.framework/Versions/Current/Sparkle").read_text() == (
+        "sparkle 2.7.0\n"
+    )
+    # The install stamp is kept in the cache, not in the checkout
+    assert sorted(p.name for p in dest.iterdir()) == ["Sparkle.framework"]
+    assert f"Sparkle-2.7.0 {digest}" in cache.installs_file.read_text()
+
+    # Same version: nothing is downloaded, unpacked or copied
+    (dest / "BUILD.gn").write_text("patched\n")
+    with mock.patch.object(
+        archive_cache.urllib.request, "urlopen", side_effect=AssertionError
+    ), mock.patch.object(archive_cache.tarfile, "open", side_effect=AssertionError):
+        assert not cache.install(spec, dest)
+        assert (dest / "BUILD.gn").exists()
+
+        # After a clean the install comes from the unpacked cache
+        archive_cache.safe_rmtree(dest)
+        assert cache.install(spec, dest)
+    assert (dest / "Sparkle.framework/Versions/B/Sparkle").exists()
+
+    # A new version replaces the install
+    newer = _make_archive(base, "2.8.0")
+    assert cache.install(_spec(newer, "2.8.0"), dest)
+    assert (dest / "Sparkle.framework/Versions/B/Sparkle").read_text() == (
+        "sparkle 2.8.0\n"
+    )
+    assert len(list(cache.extracted_dir.iterdir())) == 2
+    print("✓ Install and no-op test passed")
+
+
+def test_checksum_mismatch():
+    """Test that a download not matching the pinned checksum is rejected"""
+    base = Path(tempfile.mkdtemp())
+    archive = _make_archive(base, "2.7.0")
+    cache = ArchiveCache(base / "cache")
+    spec = ArchiveSpec("Sparkle", "2.7.0", archive.as_uri(), sha256="0" * 64)
+
+    try:
+        cache.fetch(spec)
+        assert False, "Expected ValueError"
+    except ValueError as e:
+        assert "Checksum mismatch" in str(e)
+    assert list(cache.blobs_dir.iterdir()) == []
+    assert cache.digest_for(ArchiveSpec("Sparkle", "2.7.0", "")) is None
+
+    pinned = _spec(archive, "2.7.0")
+    with mock.patch.object(
+        archive_cache.urllib.request,
+        "urlopen",
+        wraps=archive_cache.urllib.request.urlopen,
+    ) as urlopen:
+        path, digest = cache.fetch(pinned)
+    assert urlopen.call_args.kwargs["timeout"] == archive_cache.DOWNLOAD_TIMEOUT
+    assert path == cache.blobs_dir / pinned.sha256 and digest == pinned.sha256
+    assert path.read_bytes() == archive.read_bytes()
+    print("✓ Checksum test passed")
+
+
+def test_unpinned_records_first_download():
+    """Test that an unpinned archive's first checksum is enforced afterwards"""
+    base = Path(tempfile.mkdtemp())
+    archive = _make_archive(base, "2.7.0")
+    spec = ArchiveSpec("Sparkle", "2.7.0", archive.as_uri())
+    cache = ArchiveCache(base / "cache")
+
+    with mock.patch.object(archive_cache, "log_warning") as warning:
+        _, digest = cache.fetch(spec)
+    assert digest == hashlib.sha256(archive.read_bytes()).hexdigest()
+    assert digest in warning.call_args[0][0]
+    assert cache.digest_for(spec) == digest
+
+    # A different archive served for the same version is rejected
+    (cache.blobs_dir / digest).unlink()
+    archive.write_bytes(archive.read_bytes() + b"\0")
+    try:
+        cache.fetch(spec)
+        assert False, "Expected ValueError"
+    except ValueError as e:
+        assert "Checksum mismatch" in str(e)
+    print("✓ Unpinned archive test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_install_once_then_noop,
+        test_checksum_mismatch,
+        test_unpinned_records_first_download,
+    ]
+
+    print("Running archive cache tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
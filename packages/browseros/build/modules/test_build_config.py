@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled build configuration
+
+Checks merge precedence (defaults < YAML < CLI), validation and that a
+cached config is reused without parsing YAML until an input changes.
+"""
+
+import sys
+import tempfile
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+from unittest import mock
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.build_config import (
+    BuildConfig,
+    ConfigError,
+    cli_overrides,
+    compile_build_config,
+    load_build_config,
+)
+
+CONFIG_YAML = """build:
+  type: release
+  architectures: [arm64, x64]
+  universal: true
+steps:
+  clean: false
+  clean_out_dir: true
+  build: true
+  package: true
+gn_flags:
+  file: build/config/gn/flags.test.gn
+paths:
+  chromium_src: /src/chromium
+notifications:
+  slack: true
+"""
+
+
+def _make_root() -> Path:
+    root = Path(tempfile.mkdtemp())
+    (root / "build" / "config" / "gn").mkdir(parents=True)
+    (root / "build" / "config" / "gn" / "flags.test.gn").write_text(
+        "is_debug = false\nsymbol_level = 0  # no symbols\n"
+    )
+    (root / "release.yaml").write_text(CONFIG_YAML)
+    return root
+
+
+def test_merge_precedence():
+    """Test that YAML overrides defaults and non-default CLI flags win"""
+    root = _make_root()
+    overrides = cli_overrides(
+        build_type="debug",
+        architectures=("x64",),
+        clean=True,
+        clean_out_dir=False,
+        package=False,
+        chromium_src=None,
+    )
+    assert overrides == {"architectures": ("x64",), "clean": True}
+
+    config, deps = compile_build_config(root / "release.yaml", root, overrides)
+    assert config.build_type == "release"
+    assert config.architectures == ("x64",)
+    assert config.universal and config.build and config.package and config.clean
+    # Like every step option, --clean-out-dir left unset keeps the YAML value
+    assert config.clean_out_dir
+    assert config.slack_notifications
+    assert config.chromium_src == Path("/src/chromium")
+    assert config.chromium_src_from == "config"
+    assert config.gn_flags_file == root / "build/config/gn/flags.test.gn"
+    assert config.gn_flags.startswith("is_debug = false\n")
+    assert deps == [root / "release.yaml", config.gn_flags_file]
+
+    config, _ = compile_build_config(
+        root / "release.yaml", root, {"chromium_src": Path("/cli/src")}
+    )
+    assert config.chromium_src == Path("/cli/src")
+    assert config.chromium_src_from == "cli"
+
+    try:
+        config.build = False
+        assert False, "BuildConfig should be immutable"
+    except FrozenInstanceError:
+        pass
+    print("✓ Merge precedence test passed")
+
+
+def test_validation():
+    """Test that invalid values are all reported together"""
+    root = _make_root()
+    (root / "bad.yaml").write_text(
+        "build:\n  type: fast\n  architecture: riscv\nsteps:\n  sign: yes please\n"
+    )
+    try:
+        compile_build_config(root / "bad.yaml", root)
+        assert False, "Expected ConfigError"
+    except ConfigError as e:
+        message = str(e)
+        assert "build.type" in message
+        assert "'riscv'" in message
+        assert "sign must be true or false" in message
+
+    # The build step needs its gn flags file
+    try:
+        compile_build_config(None, root, {"build": True, "build_type": "release"})
+        assert False, "Expected ConfigError"
+    except ConfigError as e:
+        assert "GN flags file not found" in str(e)
+    print("✓ Validation test passed")
+
+
+def test_cache_skips_yaml():
+    """Test that an unchanged config is loaded from cache without YAML"""
+    root = _make_root()
+    cache_dir = root / "cache"
+    config_file = root / "release.yaml"
+
+    first = load_build_config(config_file, root, {"clean": True}, cache_dir)
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    with mock.patch("yaml.safe_load", side_effect=AssertionError("parsed YAML")):
+        cached = load_build_config(config_file, root, {"clean": True}, cache_dir)
+    assert cached == first
+    assert isinstance(cached, BuildConfig)
+
+    # Different overrides and changed inputs compile again
+    other = load_build_config(config_file, root, {}, cache_dir)
+    assert not other.clean
+    first.gn_flags_file.write_text("is_debug = true\n")
+    updated = load_build_config(config_file, root, {"clean": True}, cache_dir)
+    assert updated.gn_flags == "is_debug = true\n"
+    print("✓ Config cache test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_merge_precedence,
+        test_validation,
+        test_cache_skips_yaml,
+    ]
+
+    print("Running build config tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
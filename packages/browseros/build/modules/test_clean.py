@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script for the targeted clean
+
+Builds a throwaway git checkout, touches files through the same paths
+the build tooling uses (including deleted and renamed files) and checks
+that only those are reverted.
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from context import BuildContext
+from modules.clean import clean, get_touched_paths
+
+
+def _git(cwd: Path, *args: str):
+    subprocess.run(
+        ["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _make_checkout() -> BuildContext:
+    """Create a root dir with tooling inputs and a chromium_src git repo"""
+    base = Path(tempfile.mkdtemp())
+    root = base / "root"
+    src = base / "src"
+
+    (root / "chromium_patches" / "chrome" / "browser").mkdir(parents=True)
+    (root / "chromium_patches" / "chrome" / "browser" / "patched.cc").write_text("p")
+    (root / "chromium_patches" / "chrome" / "browser" / "new_file.cc").write_text("n")
+    (root / "chromium_patches" / "chrome" / "browser" / "removed.cc.deleted").write_text(
+        "File deleted in patch\nOriginal path: chrome/browser/removed.cc\n"
+    )
+    (root / "chromium_patches" / "chrome" / "browser" / "renamed.cc.rename").write_text(
+        "Renamed from: chrome/browser/old_name.cc\nSimilarity: 100%\n"
+    )
+    (root / "chromium_files" / "chrome" / "app").mkdir(parents=True)
+    (root / "chromium_files" / "chrome" / "app" / "icon.png.release").write_text("i")
+    (root / "build" / "config").mkdir(parents=True)
+    (root / "build" / "config" / "copy_resources.yaml").write_text(
+        "copy_operations:\n"
+        "  - name: Extension\n"
+        "    source: resources/ext\n"
+        "    destination: chrome/browser/resources/ext/\n"
+        "    type: directory\n"
+    )
+
+    for relative in (
+        "chrome/browser/patched.cc",
+        "chrome/browser/removed.cc",
+        "chrome/browser/old_name.cc",
+        "chrome/browser/untouched.cc",
+        "chrome/app/icon.png",
+        "chrome/app/chromium_strings.grd",
+    ):
+        (src / relative).parent.mkdir(parents=True, exist_ok=True)
+        (src / relative).write_text("original\n")
+    _git(src, "init", "-q")
+    _git(src, "add", "-A")
+    _git(src, "commit", "-q", "-m", "base")
+
+    return BuildContext(root_dir=root, chromium_src=src)
+
+
+def test_touched_paths():
+    """Test that all tooling inputs contribute touched paths"""
+    ctx = _make_checkout()
+    assert get_touched_paths(ctx) == [
+        "chrome/app/chromium_strings.grd",
+        "chrome/app/icon.png",
+        "chrome/app/settings_chromium_strings.grdp",
+        "chrome/browser/new_file.cc",
+        "chrome/browser/old_name.cc",
+        "chrome/browser/patched.cc",
+        "chrome/browser/removed.cc",
+        "chrome/browser/renamed.cc",
+        "chrome/browser/resources/ext",
+    ]
+    print("✓ Touched paths test passed")
+
+
+def test_targeted_clean():
+    """Test that only touched paths are reverted and the out dir is kept"""
+    ctx = _make_checkout()
+    src = ctx.chromium_src
+
+    (src / "chrome/browser/patched.cc").write_text("patched\n")
+    (src / "chrome/app/icon.png").unlink()
+    (src / "chrome/app/chromium_strings.grd").write_text("E-Nation OS\n")
+    _git(src, "add", "chrome/app/chromium_strings.grd")
+    (src / "chrome/browser/new_file.cc").write_text("new\n")
+    (src / "chrome/browser/removed.cc").unlink()
+    (src / "chrome/browser/old_name.cc").rename(src / "chrome/browser/renamed.cc")
+    (src / "chrome/browser/resources/ext").mkdir(parents=True)
+    (src / "chrome/browser/resources/ext/manifest.json").write_text("{}")
+    (src / "chrome/browser/untouched.cc").write_text("local edit\n")
+    (src / ctx.out_dir).mkdir(parents=True)
+    (src / ctx.out_dir / "args.gn").write_text("")
+
+    clean(ctx, targeted=True)
+
+    assert (src / "chrome/browser/patched.cc").read_text() == "original\n"
+    assert (src / "chrome/app/icon.png").read_text() == "original\n"
+    assert (src / "chrome/app/chromium_strings.grd").read_text() == "original\n"
+    assert not (src / "chrome/browser/new_file.cc").exists()
+    assert (src / "chrome/browser/removed.cc").read_text() == "original\n"
+    assert (src / "chrome/browser/old_name.cc").read_text() == "original\n"
+    assert not (src / "chrome/browser/renamed.cc").exists()
+    assert not (src / "chrome/browser/resources").exists()
+    assert (src / "chrome/browser/untouched.cc").read_text() == "local edit\n"
+    assert (src / ctx.out_dir / "args.gn").exists()
+
+    status = subprocess.run(
+        ["git", "status", "--porcelain"], cwd=src, capture_output=True, text=True
+    ).stdout
+    assert status.splitlines() == [" M chrome/browser/untouched.cc", "?? out/"]
+    print("✓ Targeted clean test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_touched_paths,
+        test_targeted_clean,
+    ]
+
+    print("Running clean tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for compiler cache integration
+
+Checks cc_wrapper rewriting of gn args, the ccache environment and
+parsing of ccache/sccache statistics.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import compiler_cache
+from modules.compiler_cache import (
+    CompilerCache,
+    apply_cc_wrapper,
+    parse_ccache_stats,
+    parse_sccache_stats,
+)
+
+
+def test_apply_cc_wrapper():
+    """Test that hard-coded cc_wrapper lines are replaced or dropped"""
+    args = 'is_debug=false\ncc_wrapper="ccache"\nsymbol_level=0\n'
+    cache = CompilerCache("sccache", "/usr/bin/sccache", Path("/tmp/cache"))
+
+    replaced = apply_cc_wrapper(args, cache)
+    assert replaced.count("cc_wrapper") == 1
+    assert replaced.endswith('cc_wrapper = "sccache"\n')
+    assert "symbol_level=0" in replaced
+
+    dropped = apply_cc_wrapper(args, None)
+    assert "cc_wrapper" not in dropped
+    assert dropped == "is_debug=false\nsymbol_level=0\n"
+    print("✓ cc_wrapper rewrite test passed")
+
+
+def test_ccache_basedir_is_absolute():
+    """Test that a relative chromium_src still gives an absolute base dir"""
+    cache = CompilerCache("ccache", "ccache", Path(tempfile.mkdtemp()))
+    ctx = SimpleNamespace(chromium_src=Path("chromium/src"))
+    with mock.patch.dict(os.environ), mock.patch.object(
+        compiler_cache.subprocess, "run"
+    ):
+        cache.setup_environment(ctx)
+        basedir = Path(os.environ["CCACHE_BASEDIR"])
+    assert basedir.is_absolute()
+    assert basedir == Path.cwd() / "chromium" / "src"
+    print("✓ ccache base dir test passed")
+
+
+def test_parse_stats():
+    """Test hit/miss parsing for ccache 4.x, ccache 3.7 and sccache"""
+    ccache4 = "stats_updated_timestamp\t0\ndirect_cache_hit\t90\npreprocessed_cache_hit\t5\ncache_miss\t5\n"
+    assert parse_ccache_stats(ccache4) == {"hits": 95, "misses": 5}
+
+    ccache3 = "cache_hit_direct\t10\ncache_hit_preprocessed\t2\ncache_miss\t8\n"
+    assert parse_ccache_stats(ccache3) == {"hits": 12, "misses": 8}
+
+    sccache = (
+        '{"stats": {"cache_hits": {"counts": {"C/C++": 40, "Rust": 2}},'
+        ' "cache_misses": {"counts": {"C/C++": 3}}}}'
+    )
+    assert parse_sccache_stats(sccache) == {"hits": 42, "misses": 3}
+    assert parse_sccache_stats("") == {"hits": 0, "misses": 0}
+    print("✓ Stats parsing test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_apply_cc_wrapper,
+        test_ccache_basedir_is_absolute,
+        test_parse_stats,
+    ]
+
+    print("Running compiler cache tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
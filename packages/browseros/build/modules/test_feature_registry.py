@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the feature registry
+
+Checks the forward and reverse indexes, directory entries, that the
+cached registry is reused until features.yaml changes and that a new
+process loads it from the on-disk cache without parsing YAML.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import feature_registry
+from modules.feature_registry import FeatureRegistry, save_features
+
+FEATURES_YAML = """version: '1.0'
+features:
+  branding:
+    description: 'patch: branding'
+    files:
+    - chrome/app/chromium_strings.grd
+    - chrome/app/theme/chromium/linux/
+  linux-icons:
+    description: 'patch: linux icons'
+    files:
+    - chrome/app/theme/chromium/linux/product_logo_64.png
+  empty:
+    description: 'patch: nothing yet'
+  undocumented:
+    files:
+    - chrome/browser/undocumented.cc
+"""
+
+
+def _write_features() -> Path:
+    path = Path(tempfile.mkdtemp()) / "features.yaml"
+    path.write_text(FEATURES_YAML)
+    return path
+
+
+def test_indexes():
+    """Test forward lookup and file -> feature routing"""
+    registry = FeatureRegistry.load(_write_features())
+
+    assert [feature.name for feature in registry] == [
+        "branding",
+        "linux-icons",
+        "empty",
+        "undocumented",
+    ]
+    assert registry.get("empty").files == ()
+    assert registry.get("undocumented").description == "undocumented"
+    assert registry.get("missing") is None
+
+    assert registry.features_for_file("chrome/app/chromium_strings.grd") == ["branding"]
+    # Directory entries own everything below them; order follows the YAML
+    assert registry.features_for_file(
+        "chrome/app/theme/chromium/linux/product_logo_64.png"
+    ) == ["branding", "linux-icons"]
+    assert registry.owner("chrome/app/theme/chromium/linux/sub/x.png") == "branding"
+    assert registry.features_for_file("chrome/app/theme/chromium/linux") == []
+    assert registry.owner("chrome/browser/other.cc") is None
+
+    grouped, unowned = registry.group_by_feature(
+        ["chrome/browser/other.cc", "chrome/app/theme/chromium/linux/a.png"]
+    )
+    assert grouped == {"branding": ["chrome/app/theme/chromium/linux/a.png"]}
+    assert unowned == ["chrome/browser/other.cc"]
+    print("✓ Index test passed")
+
+
+def test_cache():
+    """Test that unchanged files reuse the compiled registry"""
+    path = _write_features()
+    registry = FeatureRegistry.load(path)
+    assert FeatureRegistry.load(path) is registry
+
+    data = registry.to_data()
+    del data["features"]["empty"]
+    save_features(path, data)
+
+    reloaded = FeatureRegistry.load(path)
+    assert reloaded is not registry
+    assert "empty" not in reloaded and "empty" in registry
+
+    missing = FeatureRegistry.load(path.parent / "nope.yaml")
+    assert not missing and not missing.exists
+    print("✓ Cache test passed")
+
+
+def test_disk_cache_skips_yaml():
+    """Test that a fresh process reads the parsed file from disk"""
+    path = _write_features()
+    cache_dir = path.parent / "cache"
+    registry = FeatureRegistry.load(path, cache_dir)
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    # Drop the in-process cache, as a new dev CLI invocation would have
+    feature_registry._cache.clear()
+    with mock.patch("yaml.load", side_effect=AssertionError("parsed YAML")):
+        reloaded = FeatureRegistry.load(path, cache_dir)
+    assert reloaded is not registry
+    assert reloaded.to_data() == registry.to_data()
+    assert reloaded.owner("chrome/app/theme/chromium/linux/a.png") == "branding"
+
+    # Changed contents hash to a new entry
+    path.write_text(FEATURES_YAML.replace("empty:", "renamed:"))
+    assert "renamed" in FeatureRegistry.load(path, cache_dir)
+    assert len(list(cache_dir.glob("*.json"))) == 2
+    print("✓ Disk cache test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_indexes,
+        test_cache,
+        test_disk_cache_skips_yaml,
+    ]
+
+    print("Running feature registry tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
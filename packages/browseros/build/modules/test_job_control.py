@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive job controller
+
+Feeds the controller synthetic memory readings and checks the restart
+loop against a real child process.
+"""
+
+import sys
+from pathlib import Path
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import job_control
+from modules.job_control import (
+    GB,
+    JobController,
+    choose_jobs,
+    run_with_adaptive_jobs,
+)
+from utils import IS_WINDOWS
+
+
+class FakeMemory:
+    """Memory readings returned in order, repeating the last one"""
+
+    def __init__(self, *readings):
+        self.readings = list(readings)
+
+    def __call__(self):
+        if len(self.readings) > 1:
+            return self.readings.pop(0)
+        return self.readings[0]
+
+
+def _status(available_gb, pressure=0.0, total_gb=64):
+    return {"total": total_gb * GB, "available": available_gb * GB, "pressure": pressure}
+
+
+def test_choose_jobs():
+    """Test that the initial job count fits available memory"""
+    assert choose_jobs(16, 64 * GB) == 16
+    assert choose_jobs(16, 12 * GB) == 6
+    assert choose_jobs(16, 1 * GB) == 1
+    assert choose_jobs(16, 0) == 16
+    print("✓ Choose jobs test passed")
+
+
+def test_shrinks_under_pressure_and_grows_back():
+    """Test hysteresis: shrink after sustained pressure, grow after cooldown"""
+    memory = FakeMemory(_status(40), _status(2, 50.0), _status(2, 50.0), _status(40))
+    controller = JobController(cpu_count=16, read_status=memory)
+    assert controller.jobs == 16
+    # Nothing changed yet, so autoninja picks its own defaults
+    assert controller.ninja_args() == []
+
+    # One pressured sample isn't enough
+    assert controller.sample() is None
+    assert controller.sample() == 10
+    assert controller.jobs == 10
+
+    # Relaxed, but the growth cooldown hasn't passed
+    for _ in range(job_control.LOW_SAMPLES):
+        assert controller.sample() is None
+    controller.last_restart -= job_control.RESTART_COOLDOWN
+    assert controller.sample() == 16
+
+    fixed = JobController(jobs=14, cpu_count=16, read_status=memory)
+    assert not fixed.adaptive
+    assert fixed.sample() is None
+    assert fixed.ninja_args() == ["-j14", "-l16"]
+    print("✓ Pressure hysteresis test passed")
+
+
+def test_restart_loop():
+    """Test that a controller decision restarts the command with new args"""
+    if IS_WINDOWS:
+        print("✓ Restart loop test skipped on Windows")
+        return
+
+    memory = FakeMemory(_status(40), _status(1, 80.0))
+    controller = JobController(cpu_count=16, read_status=memory)
+    commands = []
+
+    def make_cmd(jobs):
+        commands.append(jobs)
+        # First run waits to be interrupted, the restarted run succeeds
+        delay = 30 if len(commands) == 1 else 0
+        return [sys.executable, "-c", f"import time; time.sleep({delay})", *jobs]
+
+    old_high = job_control.HIGH_SAMPLES
+    job_control.HIGH_SAMPLES = 1
+    try:
+        runs = []
+        result = run_with_adaptive_jobs(
+            make_cmd, controller, interval=0.2, before_run=lambda: runs.append(1)
+        )
+    finally:
+        job_control.HIGH_SAMPLES = old_high
+
+    assert result.returncode == 0
+    assert commands == [[], ["-j10", "-l16"]]
+    assert len(runs) == 2
+    print("✓ Restart loop test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_choose_jobs,
+        test_shrinks_under_pressure_and_grows_back,
+        test_restart_loop,
+    ]
+
+    print("Running job control tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Test script for ninja log analysis
+
+Exercises incremental parsing, run boundaries, the critical path
+heuristic, source-to-object mapping and report diffing.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.ninja_log import (
+    NinjaLog,
+    build_report,
+    diff_reports,
+    estimate_critical_path,
+    map_sources_to_outputs,
+    parallelism_over_time,
+    unique_steps,
+)
+
+SAMPLE_LOG = """# ninja log v5
+0\t1000\t1\tobj/base/base/logging.o\taaa
+1000\t2000\t1\tgen/foo.h\tccc
+1000\t2000\t1\tgen/foo.cc\tccc
+0\t4000\t1\tobj/chrome/browser/extensions/extensions/browser_os_api.o\tbbb
+4000\t9000\t1\tchrome\tddd
+"""
+
+
+def _write_log(text: str) -> Path:
+    log_dir = Path(tempfile.mkdtemp())
+    log_path = log_dir / ".ninja_log"
+    log_path.write_text(text)
+    return log_path
+
+
+def test_incremental_refresh():
+    """Test that refresh only reads appended lines and handles partial lines"""
+    log_path = _write_log(SAMPLE_LOG)
+    log = NinjaLog(log_path)
+
+    assert log.refresh() == 5
+    assert log.version == 5
+    assert log.refresh() == 0
+
+    with open(log_path, "a") as f:
+        f.write("9000\t9500\t1\tchromedriver\teee\n9500\t95")
+    assert log.refresh() == 1
+    assert "chromedriver" in log.current
+
+    with open(log_path, "a") as f:
+        f.write("00\t1\tlast\tfff\n")
+    assert log.refresh() == 1
+    assert log.current["last"].duration == 0.0
+    print("✓ Incremental refresh test passed")
+
+
+def test_new_run_resets_current():
+    """Test that a new ninja run starts a fresh current set but keeps history"""
+    log_path = _write_log(SAMPLE_LOG + "0\t300\t2\tobj/base/base/logging.o\tabc\n")
+    log = NinjaLog(log_path)
+    log.refresh()
+
+    assert list(log.current) == ["obj/base/base/logging.o"]
+    assert log.expected_duration("obj/base/base/logging.o") == 0.3
+    assert log.expected_duration("chrome") == 5.0
+    print("✓ New run test passed")
+
+
+def test_marked_build_spans_restarts():
+    """Test that a marked build reports everything logged after the mark"""
+    # Real runs start their first job at about the same offset
+    log_path = _write_log("# ninja log v5\n3000\t3300\t1\tchrome\tddd\n")
+    log = NinjaLog(log_path)
+    log.mark_run()
+
+    with open(log_path, "a") as f:
+        f.write("3100\t60000\t2\tobj/base/base/logging.o\taaa\n")
+    assert log.refresh() == 1
+    assert list(log.current) == ["obj/base/base/logging.o"]
+
+    # The job controller restarted ninja, whose clock started over
+    log.mark_run()
+    with open(log_path, "a") as f:
+        f.write("3000\t4000\t2\tobj/foo.o\teee\n4000\t9000\t2\tchrome\tddd\n")
+    assert log.refresh() == 2
+    assert sorted(log.current) == ["chrome", "obj/base/base/logging.o", "obj/foo.o"]
+    assert log.current["chrome"].start_ms == 64000
+    assert log.current["chrome"].duration == 5.0
+    assert log.expected_duration("chrome") == 5.0
+
+    report = build_report(log)
+    assert report["steps"] == 3
+    assert report["wall_seconds"] == 65.9
+    print("✓ Marked build test passed")
+
+
+def test_out_of_order_finishes_stay_in_run():
+    """Test that a long first job finishing after later ones isn't a new run"""
+    text = (
+        "# ninja log v5\n"
+        "2500\t3000\t1\tfast.o\taaa\n"
+        "0\t5000\t1\tslow.o\tbbb\n"
+        "5000\t6000\t1\tchrome\tccc\n"
+    )
+    log = NinjaLog(_write_log(text))
+    assert log.refresh() == 3
+    assert sorted(log.current) == ["chrome", "fast.o", "slow.o"]
+
+    marked = NinjaLog(_write_log(""))
+    marked.mark_run()
+    marked.path.write_text(text)
+    assert marked.refresh() == 3
+    assert len(marked.current) == 3
+    print("✓ Out of order finish test passed")
+
+
+def test_rewritten_log_resets():
+    """Test that a replaced or truncated log is read again from the start"""
+    log_path = _write_log(SAMPLE_LOG)
+    log = NinjaLog(log_path)
+    log.refresh()
+
+    # Recompaction writes a new file of the same size and renames it over
+    replacement = log_path.with_name(".ninja_log.tmp")
+    replacement.write_text(SAMPLE_LOG.replace("chrome\tddd", "chrome\tzzz"))
+    replacement.replace(log_path)
+    assert log.refresh() == 5
+    assert log.current["chrome"].cmd_hash == "zzz"
+
+    log_path.write_text("# ninja log v5\n0\t10\t1\tlast\tfff\n")
+    assert log.refresh() == 1
+    assert list(log.current) == ["last"]
+    assert log.expected_duration("chrome") is None
+    print("✓ Rewritten log test passed")
+
+
+def test_critical_path_and_parallelism():
+    """Test critical path estimation and parallelism buckets"""
+    log = NinjaLog(_write_log(SAMPLE_LOG))
+    log.refresh()
+    steps = unique_steps(log.current.values())
+
+    # gen/foo.h and gen/foo.cc come from the same edge
+    assert len(steps) == 4
+
+    path = [e.output for e in estimate_critical_path(steps)]
+    assert path == [
+        "obj/chrome/browser/extensions/extensions/browser_os_api.o",
+        "chrome",
+    ]
+
+    buckets = parallelism_over_time(steps, bucket_seconds=1.0)
+    assert buckets[0] == (0.0, 2.0)
+    assert buckets[1] == (1.0, 2.0)
+    assert buckets[5] == (5.0, 1.0)
+    print("✓ Critical path and parallelism test passed")
+
+
+def test_map_sources_to_outputs():
+    """Test mapping patched sources to object files"""
+    outputs = [
+        "obj/chrome/browser/extensions/extensions/browser_os_api.o",
+        "obj/chrome/browser/browser/browser_os_api.o",
+        "obj/components/foo/foo/browser_os_api.o",
+        "gen/chrome/browser/browser_os_api.h",
+    ]
+    sources = [
+        "chrome/browser/extensions/api/browser_os/browser_os_api.cc",
+        "chrome/browser/extensions/api/browser_os/browser_os_api.h",
+    ]
+
+    mapping = map_sources_to_outputs(sources, outputs)
+    assert list(mapping) == [sources[0]]
+    assert mapping[sources[0]] == [
+        "obj/chrome/browser/browser/browser_os_api.o",
+        "obj/chrome/browser/extensions/extensions/browser_os_api.o",
+    ]
+    print("✓ Source mapping test passed")
+
+
+def test_report_and_diff():
+    """Test building a report and diffing it against a slower build"""
+    log = NinjaLog(_write_log(SAMPLE_LOG))
+    log.refresh()
+    old = build_report(
+        log, ["chrome/browser/extensions/api/browser_os/browser_os_api.cc"]
+    )
+
+    assert old["steps"] == 4
+    assert old["wall_seconds"] == 9.0
+    assert old["slowest"][0]["output"] == "chrome"
+    assert old["patches"][0]["seconds"] == 4.0
+
+    slower = SAMPLE_LOG.replace("4000\t9000\t1\tchrome", "4000\t19000\t1\tchrome")
+    new_log = NinjaLog(_write_log(slower))
+    new_log.refresh()
+    new = build_report(new_log)
+
+    result = diff_reports(old, new)
+    assert [r["output"] for r in result["regressions"]] == ["chrome"]
+    assert result["wall_seconds"] == [9.0, 19.0]
+    assert not result["improvements"]
+    print("✓ Report and diff test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_incremental_refresh,
+        test_new_run_resets_current,
+        test_marked_build_spans_restarts,
+        test_out_of_order_finishes_stay_in_run,
+        test_rewritten_log_resets,
+        test_critical_path_and_parallelism,
+        test_map_sources_to_outputs,
+        test_report_and_diff,
+    ]
+
+    print("Running ninja log tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the build profiler
+
+Checks span nesting and error status, the per-step attribution of peak
+child RSS and the JSON report and Chrome trace written for a build.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import profiler
+from modules.profiler import BuildProfiler
+
+
+def test_span_nesting():
+    """Test depths, ordering and the status of a failing span"""
+    prof = BuildProfiler("test")
+    with prof.span("clean", arch="x64"):
+        with prof.span("git_setup", arch="x64") as inner:
+            inner.attrs["note"] = "shallow"
+    try:
+        with prof.span("compile", arch="x64"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert [(s.name, s.depth) for s in prof.spans] == [
+        ("clean", 0),
+        ("git_setup", 1),
+        ("compile", 0),
+    ]
+    assert [s.status for s in prof.spans] == ["ok", "ok", "error"]
+    clean, git_setup, _ = prof.spans
+    assert clean.start <= git_setup.start
+    assert git_setup.start + git_setup.wall <= clean.start + clean.wall
+    assert git_setup.attrs == {"arch": "x64", "note": "shallow"}
+    print("✓ Span nesting test passed")
+
+
+def test_peak_rss_attribution():
+    """Test that only spans during which the high-water mark rose get it"""
+    readings = iter([100, 100, 100, 300, 300, 300])
+
+    def fake_snapshot():
+        return {
+            "wall": 0.0,
+            "cpu_self": 0.0,
+            "cpu_children": 0.0,
+            "peak_child_rss": next(readings),
+            "read_bytes": 0,
+            "write_bytes": 0,
+        }
+
+    prof = BuildProfiler("test")
+    with mock.patch.object(profiler, "_snapshot", fake_snapshot):
+        with prof.span("configure"):
+            pass
+        with prof.span("compile"):
+            pass
+        with prof.span("package"):
+            pass
+
+    assert [s.peak_child_rss for s in prof.spans] == [None, 300, None]
+    print("✓ Peak RSS attribution test passed")
+
+
+def test_reports():
+    """Test the JSON report and Chrome trace written for a build"""
+    prof = BuildProfiler("test")
+    with prof.span("configure", arch="arm64"):
+        with prof.span("gn_gen"):
+            pass
+
+    output_dir = Path(tempfile.mkdtemp())
+    report_path, trace_path = prof.write_reports(output_dir)
+
+    report = json.loads(report_path.read_text())
+    assert report["name"] == "test"
+    assert [s["name"] for s in report["spans"]] == ["configure", "gn_gen"]
+    assert [s["depth"] for s in report["spans"]] == [0, 1]
+    assert report["spans"][0]["attrs"] == {"arch": "arm64"}
+    assert "peak_child_rss" in report["spans"][0]
+    assert report["total_wall"] >= report["spans"][0]["wall"]
+
+    trace = json.loads(trace_path.read_text())
+    events = trace["traceEvents"]
+    assert events[0]["ph"] == "M"
+    complete = [e for e in events if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["configure", "gn_gen"]
+    outer, inner = complete
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1
+    assert outer["args"]["arch"] == "arm64"
+    assert outer["args"]["status"] == "ok"
+    print("✓ Report test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_span_nesting,
+        test_peak_rss_attribution,
+        test_reports,
+    ]
+
+    print("Running build profiler tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
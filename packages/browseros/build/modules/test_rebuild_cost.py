@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for rebuild cost estimation
+
+Covers parsing of `ninja -t query` and `ninja -t deps` output, the
+conversion of source paths to ninja graph paths and that unknown nodes
+are filtered out before a single `ninja -t query` run.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.rebuild_cost import (
+    list_graph_inputs,
+    parse_deps_output,
+    parse_query_output,
+    query_direct_outputs,
+    to_graph_path,
+)
+from utils import IS_WINDOWS
+
+QUERY_OUTPUT = """../../chrome/app/generated_resources.grd:
+  input: phony
+  outputs:
+    gen/chrome/grit/generated_resources.h
+    gen/chrome/generated_resources_en-US.pak
+../../chrome/browser/ui/browser.cc:
+  outputs:
+    obj/chrome/browser/ui/ui/browser.o
+"""
+
+DEPS_OUTPUT = """obj/chrome/browser/ui/ui/browser.o: #deps 3, deps mtime 1700000000 (VALID)
+    ../../chrome/browser/ui/browser.cc
+    ../../chrome/browser/ui/browser.h
+    gen/chrome/grit/generated_resources.h
+
+obj/chrome/browser/ui/ui/tabs.o: #deps 2, deps mtime 1700000000 (STALE)
+    ../../chrome/browser/ui/tabs.cc
+    ../../chrome/browser/ui/browser.h
+
+"""
+
+
+def test_parse_query_output():
+    """Test that only the outputs section of each node is collected"""
+    result = parse_query_output(QUERY_OUTPUT.splitlines())
+
+    assert result["../../chrome/app/generated_resources.grd"] == {
+        "gen/chrome/grit/generated_resources.h",
+        "gen/chrome/generated_resources_en-US.pak",
+    }
+    assert result["../../chrome/browser/ui/browser.cc"] == {
+        "obj/chrome/browser/ui/ui/browser.o"
+    }
+    print("✓ Query output parse test passed")
+
+
+def test_parse_deps_output():
+    """Test that dependents are collected only for wanted nodes"""
+    wanted = {
+        "../../chrome/browser/ui/browser.h",
+        "gen/chrome/grit/generated_resources.h",
+    }
+    result = parse_deps_output(DEPS_OUTPUT.splitlines(), wanted)
+
+    assert set(result) == wanted
+    assert result["../../chrome/browser/ui/browser.h"] == {
+        "obj/chrome/browser/ui/ui/browser.o",
+        "obj/chrome/browser/ui/ui/tabs.o",
+    }
+    assert result["gen/chrome/grit/generated_resources.h"] == {
+        "obj/chrome/browser/ui/ui/browser.o"
+    }
+    print("✓ Deps output parse test passed")
+
+
+def test_to_graph_path():
+    """Test conversion of src-relative paths to out-dir-relative paths"""
+    src = Path("/src")
+    out = src / "out" / "Default_x64"
+    assert to_graph_path(src, out, "chrome/app/x.grd") == "../../chrome/app/x.grd"
+    print("✓ Graph path test passed")
+
+
+FAKE_NINJA = """#!{python}
+import json, sys
+args = sys.argv[sys.argv.index("-t") + 1:]
+with open({calls!r}, "a") as f:
+    f.write(json.dumps(args) + "\\n")
+inputs = ["../../chrome/app/generated_resources.grd", "../../chrome/browser/ui/browser.cc"]
+if args[0] == "inputs":
+    print("\\n".join(inputs))
+elif args[0] == "query":
+    for node in args[1:]:
+        if node not in inputs:
+            sys.exit("ninja: error: unknown target '" + node + "'")
+    print({query!r})
+"""
+
+
+def test_query_runs_once_over_known_nodes():
+    """Test that unknown nodes are filtered out instead of retried"""
+    if IS_WINDOWS:
+        print("✓ Single query test skipped on Windows")
+        return
+    directory = Path(tempfile.mkdtemp())
+    calls = directory / "calls.jsonl"
+    ninja = directory / "ninja"
+    ninja.write_text(
+        FAKE_NINJA.format(python=sys.executable, calls=str(calls), query=QUERY_OUTPUT)
+    )
+    ninja.chmod(0o755)
+
+    known = list_graph_inputs(str(ninja), directory)
+    nodes = [
+        "../../chrome/app/generated_resources.grd",
+        "../../chrome/browser/new_file.cc",
+        "../../chrome/browser/ui/browser.cc",
+        "../../chrome/browser/ui/browser.h",
+    ]
+    result = query_direct_outputs(str(ninja), directory, nodes, known)
+
+    assert result == parse_query_output(QUERY_OUTPUT.splitlines())
+    assert [json.loads(line) for line in calls.read_text().splitlines()] == [
+        ["inputs", "all"],
+        [
+            "query",
+            "../../chrome/app/generated_resources.grd",
+            "../../chrome/browser/ui/browser.cc",
+        ],
+    ]
+    print("✓ Single query test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_parse_query_output,
+        test_parse_deps_output,
+        test_to_graph_path,
+        test_query_runs_once_over_known_nodes,
+    ]
+
+    print("Running rebuild cost tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental resource copying
+
+Runs copy_resources against a throwaway source/destination pair and
+checks that unchanged files are left alone, stale files are removed (or
+restored from git when tracked) and overlapping operations resolve like
+a sequential copy.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from context import BuildContext
+from modules.resources import MANIFEST_DIR_NAME, copy_resources
+
+
+def _git(cwd: Path, *args: str):
+    subprocess.run(
+        ["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _make_tree() -> BuildContext:
+    """Create a root dir with resources and an empty chromium_src"""
+    base = Path(tempfile.mkdtemp())
+    root = base / "root"
+    src = base / "src"
+    src.mkdir()
+
+    (root / "resources" / "ext" / "js").mkdir(parents=True)
+    (root / "resources" / "ext" / "manifest.json").write_text("{}")
+    (root / "resources" / "ext" / "js" / "main.js").write_text("main")
+    (root / "resources" / "ext" / "js" / "old.js").write_text("old")
+    (root / "resources" / "icons").mkdir()
+    (root / "resources" / "icons" / "logo.png").write_text("generic")
+    (root / "resources" / "icons" / "logo_arm.png").write_text("arm")
+    (root / "build" / "config").mkdir(parents=True)
+    (root / "build" / "config" / "copy_resources.yaml").write_text(
+        "copy_operations:\n"
+        "  - name: Extension\n"
+        "    source: resources/ext\n"
+        "    destination: chrome/browser/resources/ext/\n"
+        "    type: directory\n"
+        "  - name: Icons\n"
+        "    source: resources/icons/*.png\n"
+        "    destination: chrome/app/theme/\n"
+        "    type: files\n"
+        "  - name: ARM Logo\n"
+        "    source: resources/icons/logo_arm.png\n"
+        "    destination: chrome/app/theme/logo.png\n"
+        "    type: file\n"
+        "    arch: [arm64]\n"
+    )
+    return BuildContext(root_dir=root, chromium_src=src, architecture="x64")
+
+
+def test_incremental_copy():
+    """Test copying, skipping unchanged files and removing stale ones"""
+    ctx = _make_tree()
+    ext = ctx.root_dir / "resources" / "ext"
+    dst = ctx.chromium_src / "chrome" / "browser" / "resources" / "ext"
+
+    assert copy_resources(ctx)
+    assert (dst / "js" / "main.js").read_text() == "main"
+    assert (ctx.chromium_src / "chrome/app/theme/logo.png").read_text() == "generic"
+
+    # A destination edited outside the build no longer matches its manifest
+    os.utime(dst / "manifest.json", ns=(1, 1))
+    os.utime(ext / "manifest.json", ns=(5_000_000_000, 5_000_000_000))
+    (ext / "js" / "old.js").unlink()
+    (ext / "js" / "main.js").write_text("main v2")
+    assert copy_resources(ctx)
+
+    assert not (dst / "js" / "old.js").exists()
+    assert (dst / "js" / "main.js").read_text() == "main v2"
+    assert (dst / "manifest.json").stat().st_mtime_ns == 5_000_000_000
+
+    # Source only touched: destination keeps its own mtime
+    os.utime(ext / "manifest.json", ns=(9_000_000_000, 9_000_000_000))
+    assert copy_resources(ctx)
+    assert (dst / "manifest.json").stat().st_mtime_ns == 5_000_000_000
+    print("✓ Incremental copy test passed")
+
+
+def test_overlapping_operations():
+    """Test that the last matching operation owns a shared destination"""
+    ctx = _make_tree()
+    logo = ctx.chromium_src / "chrome/app/theme/logo.png"
+
+    ctx.architecture = "arm64"
+    assert copy_resources(ctx)
+    assert logo.read_text() == "arm"
+
+    # Switching back: the files operation owns logo.png again
+    ctx.architecture = "x64"
+    assert copy_resources(ctx)
+    assert logo.read_text() == "generic"
+    print("✓ Overlapping operations test passed")
+
+
+def test_unnamed_operations_keep_own_manifests():
+    """Test that operations without distinct names don't share a manifest"""
+    ctx = _make_tree()
+    (ctx.root_dir / "build" / "config" / "copy_resources.yaml").write_text(
+        "copy_operations:\n"
+        "  - source: resources/ext/manifest.json\n"
+        "    destination: chrome/a.json\n"
+        "    type: file\n"
+        "  - source: resources/icons/logo.png\n"
+        "    destination: chrome/b.png\n"
+        "    type: file\n"
+    )
+    assert copy_resources(ctx)
+
+    manifests = sorted((ctx.chromium_src / "out" / MANIFEST_DIR_NAME).iterdir())
+    assert [sorted(json.loads(m.read_text())) for m in manifests] == [
+        ["chrome/a.json"],
+        ["chrome/b.png"],
+    ]
+    print("✓ Unnamed operations test passed")
+
+
+def test_stale_tracked_files_are_restored():
+    """Test that dropping an operation restores files it had overwritten"""
+    ctx = _make_tree()
+    src = ctx.chromium_src
+    (src / "chrome" / "app" / "theme").mkdir(parents=True)
+    (src / "chrome" / "app" / "theme" / "logo.png").write_text("upstream")
+    _git(src, "init", "-q")
+    _git(src, "add", "-A")
+    _git(src, "commit", "-q", "-m", "base")
+
+    assert copy_resources(ctx)
+    assert (src / "chrome/app/theme/logo.png").read_text() == "generic"
+    assert (src / "chrome/app/theme/logo_arm.png").exists()
+
+    # Without the Icons operation its files are stale
+    config = ctx.root_dir / "build" / "config" / "copy_resources.yaml"
+    config.write_text(config.read_text().split("  - name: Icons")[0])
+    assert copy_resources(ctx)
+
+    assert (src / "chrome/app/theme/logo.png").read_text() == "upstream"
+    assert not (src / "chrome/app/theme/logo_arm.png").exists()
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "--", "chrome/app"],
+        cwd=src,
+        capture_output=True,
+        text=True,
+    )
+    assert status.stdout == ""
+    print("✓ Stale tracked file test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_incremental_copy,
+        test_overlapping_operations,
+        test_unnamed_operations_keep_own_manifests,
+        test_stale_tracked_files_are_restored,
+    ]
+
+    print("Running resource copy tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for the background Slack notifier
+
+Runs a local HTTP server standing in for the webhook and checks that
+notifications don't block the caller, that rapid step messages are
+coalesced and that a slow webhook is bounded by timeouts.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import slack
+from modules.slack import SlackNotifier
+
+
+class _Webhook:
+    """Local stand-in for a Slack webhook recording posted messages"""
+
+    def __init__(self, delay: float = 0.0):
+        self.messages = []
+        webhook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(delay)
+                field = json.loads(body)["attachments"][0]["fields"][0]
+                webhook.messages.append(field["value"])
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_coalesces_steps_in_order():
+    """Test that rapid steps become one post, sent before later messages"""
+    webhook = _Webhook()
+    notifier = SlackNotifier(webhook.url, coalesce_window=0.5)
+    try:
+        for step in ("clean", "git setup", "patches"):
+            assert notifier.notify(f"Running step: {step}", coalesce=True)
+        notifier.notify("Build failed: boom", success=False)
+        assert notifier.flush(5)
+
+        assert webhook.messages == [
+            "✅ Running step: clean\nRunning step: git setup\nRunning step: patches",
+            "❌ Build failed: boom",
+        ]
+
+        # A lone step is sent once its window has passed, without a flush
+        notifier.notify("Running step: sign", coalesce=True)
+        time.sleep(1.0)
+        assert webhook.messages[-1] == "✅ Running step: sign"
+    finally:
+        notifier.close(5)
+        webhook.close()
+    print("✓ Coalescing test passed")
+
+
+def test_slow_webhook_does_not_block():
+    """Test that notify returns at once and posts are bounded by timeouts"""
+    webhook = _Webhook(delay=2.0)
+    notifier = SlackNotifier(webhook.url, coalesce_window=0.0, timeout=(1.0, 0.2))
+    try:
+        start = time.monotonic()
+        for i in range(5):
+            notifier.notify(f"message {i}")
+        assert time.monotonic() - start < 0.1
+
+        with mock.patch.object(slack, "log_warning") as warning:
+            assert notifier.flush(5)
+        assert time.monotonic() - start < 3.0
+        assert warning.call_count == 5
+        assert "Failed to send Slack notification" in warning.call_args[0][0]
+    finally:
+        notifier.close(1)
+        webhook.close()
+    print("✓ Slow webhook test passed")
+
+
+def test_worker_survives_send_errors():
+    """Test that an unexpected error posting one message doesn't stop the rest"""
+    webhook = _Webhook()
+    notifier = SlackNotifier(webhook.url, coalesce_window=0.0)
+    real_post = slack.post_notification
+
+    def flaky_post(url, message, *args):
+        if message.endswith("bad"):
+            raise TypeError("unexpected payload")
+        return real_post(url, message, *args)
+
+    try:
+        with mock.patch.object(
+            slack, "post_notification", flaky_post
+        ), mock.patch.object(slack, "log_warning") as warning:
+            notifier.notify("bad")
+            notifier.notify("good")
+            assert notifier.flush(5)
+        assert warning.call_count == 1
+        assert "unexpected payload" in warning.call_args[0][0]
+        assert webhook.messages == ["✅ good"]
+    finally:
+        notifier.close(5)
+        webhook.close()
+    print("✓ Send error test passed")
+
+
+def test_final_notification_flushes():
+    """Test the module-level notify helpers against the webhook"""
+    webhook = _Webhook()
+    with mock.patch.dict(os.environ, {"SLACK_WEBHOOK_URL": webhook.url}):
+        try:
+            assert slack.notify_build_step("Completed Git setup")
+            assert slack.notify_build_interrupted()
+            # The interrupt flushed the queue before returning
+            assert webhook.messages == [
+                "✅ Running step: Completed Git setup",
+                "❌ Build was interrupted by user",
+            ]
+        finally:
+            slack._close_notifier()
+            slack._notifier = None
+            webhook.close()
+
+    # Without a webhook nothing is queued
+    with mock.patch.dict(os.environ, {}, clear=True):
+        assert slack.get_notifier() is None
+        assert slack.notify_build_step("anything")
+    print("✓ Final flush test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_coalesces_steps_in_order,
+        test_slow_webhook_does_not_block,
+        test_worker_survives_send_errors,
+        test_final_notification_flushes,
+    ]
+
+    print("Running Slack notifier tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the branding replacement engine
+
+Checks that the single-pass engine matches sequential re.sub over the
+branding patterns, that only changed files are written and that the
+branding index skips files left unchanged since the last run.
+"""
+
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from context import BuildContext
+from modules.string_replaces import (
+    BRANDING_INDEX_NAME,
+    ReplacementEngine,
+    apply_string_replacements,
+    branding_replacements,
+    list_target_files,
+    replace_in_files,
+)
+
+SAMPLE_TEXT = """<message name="IDS_PRODUCT_NAME">Chromium</message>
+<message name="IDS_ABOUT">Copyright The Chromium Authors. All rights reserved.</message>
+<message name="IDS_GOOGLE">Google LLC. All rights reserved. Google Chrome, Google Play</message>
+<message name="IDS_MIXED">BrowserOS runs Chrome extensions from Google</message>
+<message name="IDS_AUTHORS">The Chromium Authors and Chromium OS</message>
+"""
+
+
+def _sequential(text: str) -> str:
+    for pattern, replacement in branding_replacements:
+        text = re.sub(pattern, replacement, text)
+    return text
+
+
+def test_single_pass_matches_sequential():
+    """Test that one pass gives the same output as the sequential passes"""
+    engine = ReplacementEngine(branding_replacements)
+    result, counts = engine.apply(SAMPLE_TEXT)
+
+    assert result == _sequential(SAMPLE_TEXT)
+    assert "Google Play" in result
+    assert dict(zip((p for p, _ in branding_replacements), counts)) == {
+        r"The Chromium Authors. All rights reserved.": 1,
+        r"Google LLC. All rights reserved.": 1,
+        r"The Chromium Authors": 1,
+        r"Google Chrome": 1,
+        r"(Google)(?! Play)": 1,
+        r"Chromium": 2,
+        r"Chrome": 1,
+        r"BrowserOS": 1,
+    }
+
+    # Replacement text never re-matches, so branding is idempotent
+    assert engine.apply(result) == (result, [0] * len(branding_replacements))
+    print("✓ Single pass equivalence test passed")
+
+
+def test_backreferences():
+    """Test that group references in replacements expand per pattern"""
+    engine = ReplacementEngine([(r"(\w+)@old", r"\1@new"), (r"old", "OLD")])
+    assert engine.apply("me@old old") == ("me@new OLD", [1, 1])
+    print("✓ Backreference test passed")
+
+
+def test_replace_in_files_writes_only_changes():
+    """Test parallel file processing, untouched files and line endings"""
+    directory = Path(tempfile.mkdtemp())
+    changed = directory / "changed.xtb"
+    changed.write_bytes(b"Chromium\r\nChrome\r\n")
+    unchanged = directory / "unchanged.xtb"
+    unchanged.write_text("nothing to brand\n")
+    os.utime(unchanged, (1, 1))
+    extra = [directory / f"f{i}.grd" for i in range(10)]
+    for path in extra:
+        path.write_text("Google Chrome\n")
+
+    results = replace_in_files([changed, unchanged, *extra], branding_replacements)
+
+    assert [Path(r[0]).name for r in results[:2]] == ["changed.xtb", "unchanged.xtb"]
+    assert [r[1] for r in results] == [True, False] + [True] * 10
+    assert changed.read_bytes() == b"E-Nation OS\r\nE-Nation OS\r\n"
+    assert unchanged.stat().st_mtime == 1
+    assert all(p.read_text() == "E-Nation OS\n" for p in extra)
+    print("✓ File processing test passed")
+
+
+def test_branding_index_skips_unchanged_files():
+    """Test XTB discovery and that indexed files aren't re-read"""
+    src = Path(tempfile.mkdtemp())
+    resources = src / "chrome" / "app" / "resources"
+    resources.mkdir(parents=True)
+    (src / "chrome/app/chromium_strings.grd").write_text("Chromium\n")
+    (resources / "chromium_strings_fr.xtb").write_text("Chromium\n")
+    (resources / "chromium_strings_de.xtb").write_text("Google Chrome\n")
+    ctx = BuildContext(root_dir=src, chromium_src=src)
+
+    assert list_target_files(ctx)[-2:] == [
+        "chrome/app/resources/chromium_strings_de.xtb",
+        "chrome/app/resources/chromium_strings_fr.xtb",
+    ]
+    assert apply_string_replacements(ctx)
+    assert (src / "out" / BRANDING_INDEX_NAME).exists()
+    assert (resources / "chromium_strings_fr.xtb").read_text() == "E-Nation OS\n"
+
+    # Same size and mtime as recorded: the index says it's branded, so the
+    # file isn't read again
+    xtb = resources / "chromium_strings_fr.xtb"
+    stat = xtb.stat()
+    xtb.write_text("Chromium123\n")
+    os.utime(xtb, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert apply_string_replacements(ctx)
+    assert xtb.read_text() == "Chromium123\n"
+
+    # A real change (new mtime) is picked up
+    os.utime(xtb, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert apply_string_replacements(ctx)
+    assert xtb.read_text() == "E-Nation OS123\n"
+    print("✓ Branding index test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_single_pass_matches_sequential,
+        test_backreferences,
+        test_replace_in_files_writes_only_changes,
+        test_branding_index_skips_unchanged_files,
+    ]
+
+    print("Running string replacement tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for BuildContext
+
+Checks that constructing a context doesn't touch the filesystem, that
+versions and the Chromium source path are resolved on first use and
+that version files are read once per root dir.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import context
+from context import BuildContext, read_versions
+
+
+def _make_root() -> Path:
+    root = Path(tempfile.mkdtemp())
+    (root / "build" / "config").mkdir(parents=True)
+    (root / "CHROMIUM_VERSION").write_text("MAJOR=137\nMINOR=0\nBUILD=7151\nPATCH=69\n")
+    (root / "build" / "config" / "NXTSCAPE_VERSION").write_text("42\n")
+    return root
+
+
+def test_construction_is_lazy():
+    """Test that a context can be built without any files existing"""
+    root = Path(tempfile.mkdtemp()) / "missing"
+    with mock.patch.object(context, "log_warning") as warning:
+        ctx = BuildContext(root_dir=root, chromium_src=root / "src", architecture="x64")
+    warning.assert_not_called()
+    assert ctx.out_dir.endswith("Default_x64")
+    assert ctx.chromium_version == "" and ctx.nxtscape_chromium_version == ""
+    assert not hasattr(ctx, "__dict__")
+
+    try:
+        ctx.chromium_src
+        assert False, "Expected FileNotFoundError"
+    except FileNotFoundError:
+        pass
+    print("✓ Lazy construction test passed")
+
+
+def test_versions_shared_per_root():
+    """Test version resolution, caching across contexts and overrides"""
+    root = _make_root()
+    read_versions.cache_clear()
+    contexts = [BuildContext(root_dir=root, architecture=a) for a in ("arm64", "x64")]
+    assert read_versions.cache_info().currsize == 0
+
+    assert contexts[0].nxtscape_chromium_version == "137.0.7193.69"
+    assert contexts[1].chromium_version == "137.0.7151.69"
+    assert read_versions.cache_info().misses == 1
+
+    contexts[1].nxtscape_version = "1"
+    assert contexts[1].nxtscape_chromium_version == "137.0.7152.69"
+    assert contexts[0].nxtscape_version == "42"
+    print("✓ Shared versions test passed")
+
+
+def test_chromium_src_fallback_and_overrides():
+    """Test the chromium_src fallback and the explicit path overrides"""
+    root = _make_root()
+    (root / "chromium_src").mkdir()
+    ctx = BuildContext(root_dir=root, chromium_src=root / "nowhere")
+    assert ctx.chromium_src == root / "chromium_src"
+
+    app = root / "out" / "Default_universal" / BuildContext.NXTSCAPE_APP_NAME
+    ctx = BuildContext(
+        root_dir=root,
+        chromium_src=root,
+        out_dir="out/Default_universal",
+        architecture="universal",
+        app_path=app,
+    )
+    assert ctx.chromium_src == root
+    assert ctx.get_app_path() == app
+    assert ctx.get_gn_args_file() == root / "out" / "Default_universal" / "args.gn"
+    print("✓ chromium_src and override test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_construction_is_lazy,
+        test_versions_shared_per_root,
+        test_chromium_src_fallback_and_overrides,
+    ]
+
+    print("Running build context tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Import-time checks for the build and dev CLIs
+
+Checks that importing build.py or dev.py doesn't load subcommand
+modules, YAML or the optional GCS/Slack dependencies, so `dev status`
+and `build.py --help` start quickly. Each entry point is imported in a
+fresh interpreter; no wall-clock timing is asserted.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+BUILD_DIR = Path(__file__).parent
+
+# Modules that must only be imported by the commands that use them
+LAZY_MODULES = [
+    "yaml",
+    "requests",
+    "google.cloud",
+    "urllib.request",
+    "modules.gcs",
+    "modules.slack",
+    "modules.git",
+    "modules.sign",
+    "modules.package_linux",
+    "modules.string_replaces",
+    "modules.dev_cli.apply",
+    "modules.dev_cli.extract",
+    "modules.dev_cli.feature",
+    "modules.dev_cli.ninja",
+]
+
+
+def _loaded_lazy_modules(module: str) -> list:
+    """Lazy modules present in sys.modules after a fresh `import module`"""
+    script = (
+        f"import sys, {module}; "
+        f"print('\\n'.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BUILD_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [line for line in result.stdout.splitlines() if line in LAZY_MODULES]
+
+
+def test_build_skips_heavy_modules():
+    """Test that importing build.py leaves lazy modules unloaded"""
+    loaded = _loaded_lazy_modules("build")
+    assert loaded == [], f"Imported by build.py at startup: {loaded}"
+    print("✓ build.py lazy module test passed")
+
+
+def test_dev_skips_heavy_modules():
+    """Test that importing dev.py leaves lazy modules unloaded"""
+    loaded = _loaded_lazy_modules("dev")
+    assert loaded == [], f"Imported by dev.py at startup: {loaded}"
+    print("✓ dev.py lazy module test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_build_skips_heavy_modules,
+        test_dev_skips_heavy_modules,
+    ]
+
+    print("Running import time tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Test script for shared build utilities
+
+Covers the streaming output handling in run_command, the console
+status line that collapses ninja progress output and the background
+log sink.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add build directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import utils
+from utils import ConsoleStatus, run_command, safe_rmtree, TRASH_DIR_NAME
+
+
+@contextmanager
+def _temp_log_file():
+    """Point the build log at a temp file so tests don't create logs/
+
+    The original log file is restored afterwards, so later tests in the
+    same process don't log into a deleted file.
+    """
+    utils.flush_log()
+    original = utils._log_file
+    log_file = tempfile.NamedTemporaryFile(
+        mode="w", suffix=".log", delete=False, encoding="utf-8"
+    )
+    utils._log_file = log_file
+    try:
+        yield Path(log_file.name)
+    finally:
+        utils.flush_log()
+        utils._log_file = original
+        log_file.close()
+        os.unlink(log_file.name)
+
+
+def test_console_status_collapses_progress():
+    """Test that progress lines replace each other instead of printing"""
+    stream = io.StringIO()
+    console = ConsoleStatus(stream, interval=3600)
+
+    console.add_line("ninja: Entering directory `out/Default'")
+    console.set_status("[1/3] CXX a.o")
+    console.render(force=True)
+    console.set_status("[2/3] CXX b.o")
+    console.render()  # Rate limited, must not print
+    console.set_status("[3/3] LINK chrome")
+    console.finish()
+
+    output = stream.getvalue().splitlines()
+    assert output == [
+        "ninja: Entering directory `out/Default'",
+        "[1/3] CXX a.o",
+        "[3/3] LINK chrome",
+    ]
+    print("✓ Console status collapse test passed")
+
+
+def test_run_command_captures_output():
+    """Test that run_command captures all lines and logs them in batches"""
+    with _temp_log_file() as log_path:
+        script = (
+            "print('starting');"
+            "[print(f'[{i}/50] CXX obj/{i}.o') for i in range(1, 51)];"
+            "print('done')"
+        )
+
+        result = run_command([sys.executable, "-c", script])
+
+        lines = result.stdout.splitlines()
+        assert result.returncode == 0
+        assert lines[0] == "starting"
+        assert lines[-1] == "done"
+        assert len(lines) == 52
+
+        utils.flush_log()
+        log_text = log_path.read_text(encoding="utf-8")
+        assert "RUN_COMMAND: STDOUT: [50/50] CXX obj/50.o" in log_text
+        print("✓ run_command capture test passed")
+
+
+def test_run_command_failure():
+    """Test that a failing command raises with its output attached"""
+    with _temp_log_file():
+        script = "print('boom'); raise SystemExit(3)"
+
+        try:
+            run_command([sys.executable, "-c", script])
+        except utils.subprocess.CalledProcessError as e:
+            assert e.returncode == 3
+            assert e.stdout == "boom"
+        else:
+            assert False, "Expected CalledProcessError"
+
+        result = run_command([sys.executable, "-c", script], check=False)
+        assert result.returncode == 3
+        print("✓ run_command failure test passed")
+
+
+def test_run_command_interrupt_stops_group():
+    """Test that an interrupt stops a detached command's whole group"""
+    if utils.IS_WINDOWS:
+        print("✓ Interrupt test skipped on Windows")
+        return
+    with _temp_log_file():
+        pid_file = Path(tempfile.mkdtemp()) / "child.pid"
+        # The command starts a grandchild in its process group, like ninja
+        # starting compiler jobs
+        script = (
+            "import subprocess, sys, time;"
+            "p = subprocess.Popen("
+            "[sys.executable, '-c', 'import time; time.sleep(60)']);"
+            f"open({str(pid_file)!r}, 'w').write(str(p.pid));"
+            "time.sleep(60)"
+        )
+        started = []
+
+        def interrupt(process):
+            started.append(process)
+            while not pid_file.exists() or not pid_file.read_text():
+                time.sleep(0.05)
+            raise KeyboardInterrupt
+
+        try:
+            run_command([sys.executable, "-c", script], on_start=interrupt)
+        except KeyboardInterrupt:
+            pass
+        else:
+            assert False, "Expected KeyboardInterrupt"
+
+        assert started[0].poll() is not None
+        grandchild = int(pid_file.read_text())
+        for _ in range(50):
+            try:
+                utils.os.kill(grandchild, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.1)
+        else:
+            assert False, "Grandchild outlived the interrupt"
+        print("✓ run_command interrupt test passed")
+
+
+def test_log_sink_batches_in_order():
+    """Test that queued log messages reach the file in order after a flush"""
+    with _temp_log_file() as log_path:
+
+        for i in range(2000):
+            utils._log_to_file(f"INFO: message {i}")
+        utils._log_lines_to_file(["INFO: batch a", "INFO: batch b"])
+        utils.flush_log()
+
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2002
+        assert lines[0].endswith("] INFO: message 0")
+        assert lines[1999].endswith("] INFO: message 1999")
+        assert lines[-1].endswith("] INFO: batch b")
+        assert lines[0].startswith("[")
+        print("✓ Log sink ordering test passed")
+
+
+def test_safe_rmtree_background():
+    """Test that a background delete renames away at once and purges later"""
+    parent = Path(tempfile.mkdtemp())
+    out_dir = parent / "Default_x64"
+    for i in range(20):
+        (out_dir / "obj" / f"dir{i}").mkdir(parents=True)
+        (out_dir / "obj" / f"dir{i}" / "a.o").write_text("x")
+    (out_dir / "args.gn").write_text("")
+
+    safe_rmtree(out_dir, background=True)
+    assert not out_dir.exists()
+
+    trash = parent / TRASH_DIR_NAME
+    deadline = time.time() + 10
+    while trash.exists() and time.time() < deadline:
+        time.sleep(0.05)
+    assert not trash.exists()
+    print("✓ Background rmtree test passed")
+
+
+def test_concurrent_trash_purgers():
+    """Test that purgers racing on one trash dir skip each other's claims"""
+    trash = Path(tempfile.mkdtemp()) / TRASH_DIR_NAME
+    for i in range(20):
+        (trash / f"out{i}" / "obj").mkdir(parents=True)
+        (trash / f"out{i}" / "obj" / "a.o").write_text("x")
+
+    # A live purger's claim is left alone, a dead one's is taken over
+    live = trash / f"{utils.PURGE_CLAIM_PREFIX}1.{time.time_ns()}.busy"
+    stale = trash / f"{utils.PURGE_CLAIM_PREFIX}1.0.orphan"
+    live.mkdir()
+    (stale / "obj").mkdir(parents=True)
+
+    errors = []
+
+    def purge():
+        try:
+            utils.purge_trash(trash)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=purge) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert [p.name for p in trash.iterdir()] == [live.name]
+    live.rmdir()
+    utils.purge_trash(trash)
+    assert not trash.exists()
+    print("✓ Concurrent trash purge test passed")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_console_status_collapses_progress,
+        test_run_command_captures_output,
+        test_run_command_failure,
+        test_run_command_interrupt_stops_group,
+        test_log_sink_batches_in_order,
+        test_safe_rmtree_background,
+        test_concurrent_trash_purgers,
+    ]
+
+    print("Running utils tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -4,12 +4,18 @@ Shared utilities for the build system
 """
 
 import os
+import re
+import atexit
 import sys
+import time
+import queue
+import signal
+import threading
 import subprocess
-import yaml
+import importlib
 import shutil
 from pathlib import Path
-from typing import Optional, List, Dict, Union
+from typing import Callable, Optional, List, Dict, Union
 from datetime import datetime
 
 
@@ -22,12 +28,17 @@ IS_LINUX = sys.platform.startswith("linux")
 _log_file = None
 
 
+def get_logs_dir() -> Path:
+    """Get directory for build logs and reports"""
+    return Path(__file__).parent.parent / "logs"
+
+
 def _ensure_log_file():
     """Ensure log file is created with timestamp"""
     global _log_file
     if _log_file is None:
         # Create logs directory if it doesn't exist
-        log_dir = Path(__file__).parent.parent / "logs"
+        log_dir = get_logs_dir()
         log_dir.mkdir(exist_ok=True)
 
         # Create log file with timestamp
@@ -42,19 +53,130 @@ def _ensure_log_file():
     return _log_file
 
 
+# Log sink tuning: queue bound (callers block briefly when full), maximum
+# messages per write and the periodic flush interval in seconds
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 1000
+LOG_FLUSH_INTERVAL = 1.0
+
+
+class _LogSink:
+    """Background writer for the build log file
+
+    Log calls only enqueue (timestamp, message) pairs. A daemon thread
+    formats them in batches, writes each batch with a single write() and
+    flushes the file periodically or when flush() is requested.
+    """
+
+    def __init__(self):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(
+                        target=self._run, name="build-log-sink", daemon=True
+                    )
+                    self.thread.start()
+
+    def write(self, message: str):
+        """Queue a single message"""
+        self._ensure_thread()
+        self.queue.put((time.time(), message))
+
+    def write_many(self, messages: List[str]):
+        """Queue several messages sharing one timestamp"""
+        self._ensure_thread()
+        self.queue.put((time.time(), messages))
+
+    def flush(self, timeout: float = 5.0):
+        """Block until everything queued so far is written and flushed"""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def _run(self):
+        last_second = None
+        stamp = ""
+        unflushed = False
+        last_flush = time.monotonic()
+        while True:
+            try:
+                items = [self.queue.get(timeout=LOG_FLUSH_INTERVAL)]
+            except queue.Empty:
+                items = []
+            while items and len(items) < LOG_BATCH_SIZE:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            chunks = []
+            waiters = []
+            for item in items:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    continue
+                ts, message = item
+                second = int(ts)
+                if second != last_second:
+                    last_second = second
+                    stamp = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+                if isinstance(message, list):
+                    chunks.extend(f"[{stamp}] {m}\n" for m in message)
+                else:
+                    chunks.append(f"[{stamp}] {message}\n")
+
+            try:
+                log_file = _ensure_log_file()
+                if chunks:
+                    log_file.write("".join(chunks))
+                    unflushed = True
+                now = time.monotonic()
+                if waiters or (unflushed and now - last_flush >= LOG_FLUSH_INTERVAL):
+                    log_file.flush()
+                    unflushed = False
+                    last_flush = now
+            except (OSError, ValueError):
+                # Never let logging failures take the build down
+                pass
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+
+
+_log_sink = _LogSink()
+
+
 def _log_to_file(message: str):
-    """Write message to log file with timestamp"""
-    log_file = _ensure_log_file()
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_file.write(f"[{timestamp}] {message}\n")
-    log_file.flush()
+    """Queue message for the log file; the sink adds the timestamp"""
+    _log_sink.write(message)
+
+
+def _log_lines_to_file(messages: List[str]):
+    """Queue a batch of messages for the log file"""
+    if messages:
+        _log_sink.write_many(messages)
+
+
+def flush_log():
+    """Write out all queued log messages and flush the log file"""
+    _log_sink.flush()
+
+
+atexit.register(flush_log)
 
 
 def _sanitize_for_windows(message: str) -> str:
     """Remove non-ASCII characters on Windows to avoid encoding issues"""
-    if sys.platform == "win32":
+    if IS_WINDOWS:
         # Remove all non-ASCII characters
-        return "".join(char for char in message if ord(char) < 128)
+        return message.encode("ascii", "ignore").decode("ascii")
     return message
 
 
@@ -80,6 +202,7 @@ def log_error(message: str):
     else:
         print(f"❌ {message}")
     _log_to_file(f"ERROR: {message}")
+    flush_log()
 
 
 def log_success(message: str):
@@ -91,17 +214,192 @@ def log_success(message: str):
     _log_to_file(f"SUCCESS: {message}")
 
 
+# Ninja progress lines look like "[1234/56789] CXX obj/foo.o"
+NINJA_PROGRESS_RE = re.compile(r"^\[\d+/\d+\] ")
+
+# Minimum seconds between redraws of the collapsed status line on a terminal
+STATUS_RENDER_INTERVAL = 0.1
+# When stdout is not a terminal (CI logs), print the status line this often
+STATUS_LOG_INTERVAL = 30.0
+# Maximum number of output lines handled per console/log batch
+OUTPUT_BATCH_SIZE = 1000
+
+
+class ConsoleStatus:
+    """Console writer that collapses progress lines into one updating status line
+
+    Regular lines are printed as-is. Progress lines only replace the current
+    status, which is redrawn in place at most once per render interval. When
+    the stream is not a terminal the status is printed as a normal line at a
+    much lower rate so CI logs still show progress.
+    """
+
+    def __init__(self, stream=None, interval: Optional[float] = None):
+        self.stream = stream or sys.stdout
+        isatty = getattr(self.stream, "isatty", None)
+        self.interactive = bool(isatty and isatty())
+        if interval is None:
+            interval = (
+                STATUS_RENDER_INTERVAL if self.interactive else STATUS_LOG_INTERVAL
+            )
+        self.interval = interval
+        self.width = shutil.get_terminal_size().columns - 1 if self.interactive else 0
+        self.status = ""
+        self.dirty = False
+        self.shown = False
+        self.last_render = 0.0
+        self.pending: List[str] = []
+
+    def add_line(self, line: str):
+        """Queue a regular output line"""
+        self.pending.append(line)
+
+    def set_status(self, line: str):
+        """Replace the current status line"""
+        self.status = line
+        self.dirty = True
+
+    def render(self, force: bool = False):
+        """Write pending lines and, if due, the status line in one write"""
+        out = []
+        if self.pending:
+            if self.shown:
+                out.append("\r" + " " * self.width + "\r")
+                self.shown = False
+                self.dirty = self.dirty or bool(self.status)
+            out.append("\n".join(self.pending) + "\n")
+            self.pending = []
+
+        now = time.monotonic()
+        if self.dirty and (force or now - self.last_render >= self.interval):
+            if self.interactive:
+                out.append("\r" + self.status[: self.width].ljust(self.width))
+                self.shown = True
+            else:
+                out.append(self.status + "\n")
+            self.dirty = False
+            self.last_render = now
+
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+
+    def finish(self):
+        """Flush everything and leave the last status on its own line"""
+        self.render(force=True)
+        if self.shown:
+            self.stream.write("\n")
+            self.stream.flush()
+            self.shown = False
+
+
+def _read_output(stream, lines: "queue.Queue[Optional[str]]"):
+    """Reader thread: push every output line onto the queue, then a sentinel"""
+    try:
+        for line in iter(stream.readline, ""):
+            lines.put(line)
+    finally:
+        lines.put(None)
+
+
+def _stream_output(process: subprocess.Popen, console: ConsoleStatus) -> List[str]:
+    """Drain process output in batches, rendering and logging each batch once"""
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+    reader = threading.Thread(
+        target=_read_output, args=(process.stdout, lines), daemon=True
+    )
+    reader.start()
+
+    stdout_lines = []
+    done = False
+    while not done:
+        try:
+            batch = [lines.get(timeout=console.interval)]
+        except queue.Empty:
+            console.render()
+            continue
+
+        while len(batch) < OUTPUT_BATCH_SIZE:
+            try:
+                batch.append(lines.get_nowait())
+            except queue.Empty:
+                break
+
+        log_batch = []
+        for raw in batch:
+            if raw is None:
+                done = True
+                break
+            line = raw.rstrip()
+            if not line:
+                continue
+            stdout_lines.append(line)
+            log_batch.append(f"RUN_COMMAND: STDOUT: {line}")
+            if NINJA_PROGRESS_RE.match(line):
+                console.set_status(line)
+            else:
+                console.add_line(line)
+
+        _log_lines_to_file(log_batch)
+        console.render()
+
+    reader.join()
+    console.finish()
+    return stdout_lines
+
+
+def _stop_process(
+    process: subprocess.Popen, group: bool, timeout: float = 10.0
+) -> None:
+    """Stop a child after the caller was interrupted
+
+    A child in its own session (`group`) doesn't see the terminal's Ctrl-C,
+    so its process group is sent SIGINT, then SIGTERM, then SIGKILL, waiting
+    for it to exit after each.
+    """
+    if IS_WINDOWS:
+        if process.poll() is None:
+            process.terminate()
+        process.wait()
+        return
+
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGKILL):
+        if process.poll() is not None:
+            return
+        try:
+            if group:
+                os.killpg(process.pid, sig)
+            else:
+                process.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            return
+        try:
+            process.wait(timeout)
+            return
+        except subprocess.TimeoutExpired:
+            pass
+
+
 def run_command(
     cmd: List[str],
     cwd: Optional[Path] = None,
     env: Optional[Dict] = None,
     check: bool = True,
+    on_start: Optional[Callable[[subprocess.Popen], None]] = None,
 ) -> subprocess.CompletedProcess:
-    """Run a command with real-time streaming output and full capture"""
+    """Run a command with real-time streaming output and full capture
+
+    `on_start` is called with the process once it is running. The process
+    then gets its own session on POSIX so the callback can signal its whole
+    process group without hitting this one. If this process is interrupted
+    (Ctrl-C) while the command runs, the command is stopped before the
+    interrupt propagates.
+    """
     cmd_str = " ".join(cmd)
     _log_to_file(f"RUN_COMMAND: 🔧 Running: {cmd_str}")
     log_info(f"🔧 Running: {cmd_str}")
 
+    detach = on_start is not None and not IS_WINDOWS
     try:
         # Always use Popen for real-time streaming and capturing
         process = subprocess.Popen(
@@ -113,20 +411,21 @@ def run_command(
             text=True,
             bufsize=1,
             universal_newlines=True,
+            start_new_session=detach,
         )
+        try:
+            if on_start:
+                on_start(process)
 
-        stdout_lines = []
-
-        # Stream output line by line
-        for line in iter(process.stdout.readline, ""):
-            line = line.rstrip()
-            if line:
-                print(line)  # Print to console in real-time
-                _log_to_file(f"RUN_COMMAND: STDOUT: {line}")  # Log to file
-                stdout_lines.append(line)
+            # Stream output from a reader thread; ninja progress collapses
+            # into a single status line and log writes are batched
+            stdout_lines = _stream_output(process, ConsoleStatus())
 
-        # Wait for process to complete
-        process.wait()
+            # Wait for process to complete
+            process.wait()
+        except BaseException:
+            _stop_process(process, group=detach)
+            raise
 
         _log_to_file(
             f"RUN_COMMAND: ✅ Command completed with exit code: {process.returncode}"
@@ -148,19 +447,10 @@ def run_command(
         return result
 
     except subprocess.CalledProcessError as e:
+        # Output was already streamed to the log file line by line
         _log_to_file(f"RUN_COMMAND: ❌ Command failed: {cmd_str}")
         _log_to_file(f"RUN_COMMAND: ❌ Exit code: {e.returncode}")
 
-        if e.stdout:
-            for line in e.stdout.strip().split("\n"):
-                if line.strip():
-                    _log_to_file(f"RUN_COMMAND: STDOUT: {line}")
-
-        if e.stderr:
-            for line in e.stderr.strip().split("\n"):
-                if line.strip():
-                    _log_to_file(f"RUN_COMMAND: STDERR: {line}")
-
         if check:
             log_error(f"Command failed: {cmd_str}")
             if e.stderr:
@@ -181,12 +471,30 @@ def load_config(config_path: Path) -> Dict:
         log_error(f"Config file not found: {config_path}")
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
+    import yaml
+
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
 
     return config
 
 
+def lazy_import(module_name: str, attr: str) -> Callable:
+    """Stand-in for `module_name.attr` that imports the module on first call
+
+    Keeps heavy or optional dependencies (cloud SDKs, HTTP clients,
+    platform tooling) out of CLI startup until a step actually runs.
+    """
+
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), attr)(*args, **kwargs)
+
+    call.__name__ = attr
+    call.__qualname__ = attr
+    call.__module__ = module_name
+    return call
+
+
 # Platform-specific utilities
 def get_platform() -> str:
     """Get platform name in a consistent format"""
@@ -258,23 +566,173 @@ def join_paths(*paths: Union[str, Path]) -> Path:
     return normalize_path(result)
 
 
-def safe_rmtree(path: Union[str, Path]) -> None:
-    """Safely remove directory tree, handling Windows symlinks and junction points"""
-    path = Path(path)
+# Directory (next to the deleted path) that background deletions are renamed into
+TRASH_DIR_NAME = ".nxtscape_trash"
+# Purgers rename an entry to "<prefix><pid>.<claim time ns>.<name>" before
+# deleting it, so concurrent purgers never work on the same tree
+PURGE_CLAIM_PREFIX = ".purging."
+# Claims older than this were left by a purger that died; others may take them
+PURGE_CLAIM_TIMEOUT = 24 * 3600
 
-    if not path.exists():
+
+def _handle_remove_readonly(func, path, exc):
+    """Error handler for Windows readonly files"""
+    import stat
+
+    if os.path.exists(path):
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+
+
+def _rmtree(path: Path, ignore_errors: bool = False) -> None:
+    """shutil.rmtree with the Windows readonly handler"""
+    if ignore_errors:
+        shutil.rmtree(path, ignore_errors=True)
+    elif IS_WINDOWS:
+        shutil.rmtree(path, onerror=_handle_remove_readonly)
+    else:
+        shutil.rmtree(path)
+
+
+def parallel_rmtree(path: Union[str, Path], workers: Optional[int] = None) -> None:
+    """Delete a large directory tree with a pool of worker threads
+
+    Subtrees two levels down are deleted concurrently; unlink() releases
+    the GIL, so this scales with the filesystem rather than one core.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = Path(path)
+    if path.is_symlink() or not path.is_dir():
+        path.unlink(missing_ok=True)
         return
 
+    tasks = []
+    for child in os.scandir(path):
+        if child.is_dir(follow_symlinks=False):
+            tasks.extend(Path(grandchild.path) for grandchild in os.scandir(child.path))
+        else:
+            tasks.append(Path(child.path))
+
+    def remove(entry: Path):
+        if entry.is_dir() and not entry.is_symlink():
+            _rmtree(entry, ignore_errors=True)
+        else:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+    workers = workers or min(32, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(remove, tasks))
+    # What's left is the (now empty) directory skeleton
+    _rmtree(path, ignore_errors=True)
+
+
+def _claim_trash_entry(entry: Path) -> Optional[Path]:
+    """Rename a trash entry to a name unique to this purger
+
+    Returns None when the entry is another live purger's claim or when
+    someone else claimed it first (the rename is atomic).
+    """
+    name = entry.name
+    if name.startswith(PURGE_CLAIM_PREFIX):
+        try:
+            _, claimed_ns, name = name[len(PURGE_CLAIM_PREFIX) :].split(".", 2)
+            age = (time.time_ns() - int(claimed_ns)) / 1e9
+        except ValueError:
+            age = PURGE_CLAIM_TIMEOUT
+        if age < PURGE_CLAIM_TIMEOUT:
+            return None
+    claimed = entry.with_name(
+        f"{PURGE_CLAIM_PREFIX}{os.getpid()}.{time.time_ns()}.{name}"
+    )
+    try:
+        os.rename(entry, claimed)
+    except OSError:
+        return None
+    return claimed
+
+
+def purge_trash(trash_dir: Union[str, Path]) -> None:
+    """Delete everything in a trash directory (runs in a detached process)
+
+    Several purgers may run on the same trash dir; each deletes only the
+    entries it claimed.
+    """
+    try:
+        entries = list(Path(trash_dir).iterdir())
+    except OSError:
+        return  # Already purged
+    for entry in entries:
+        claimed = _claim_trash_entry(entry)
+        if claimed:
+            parallel_rmtree(claimed)
+    try:
+        Path(trash_dir).rmdir()
+    except OSError:
+        pass  # Another deletion moved something in meanwhile
+
+
+def _spawn_trash_purge(trash_dir: Path) -> None:
+    """Start a detached process that purges trash_dir and outlives this one"""
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); "
+        "from utils import purge_trash; purge_trash(sys.argv[2])"
+    )
+    kwargs = {}
     if IS_WINDOWS:
-        # On Windows, use rmdir for junctions and symlinks
-        import stat
+        kwargs["creationflags"] = (
+            subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, "-c", code, str(Path(__file__).parent), str(trash_dir)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **kwargs,
+    )
+
+
+def move_to_trash(path: Union[str, Path]) -> Optional[Path]:
+    """Rename a directory into the sibling trash dir (instant, same filesystem)"""
+    path = Path(path)
+    trash_dir = path.parent / TRASH_DIR_NAME
+    target = trash_dir / f"{path.name}.{os.getpid()}.{time.time_ns()}"
+    try:
+        trash_dir.mkdir(exist_ok=True)
+        os.rename(path, target)
+    except OSError:
+        return None
+    return target
+
+
+def prune_empty_dirs(directory: Path, stop: Path):
+    """Remove empty directories up to (not including) `stop`"""
+    while directory != stop and stop in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
 
-        def handle_remove_readonly(func, path, exc):
-            """Error handler for Windows readonly files"""
-            if os.path.exists(path):
-                os.chmod(path, stat.S_IWRITE)
-                func(path)
 
+def safe_rmtree(path: Union[str, Path], background: bool = False) -> None:
+    """Safely remove directory tree, handling Windows symlinks and junction points
+
+    With `background`, the directory is renamed into a trash dir next to it
+    and deleted by a detached process with parallel workers, so the caller
+    doesn't wait. Falls back to a synchronous delete if the rename fails.
+    """
+    path = Path(path)
+
+    if not path.exists():
+        return
+
+    if IS_WINDOWS:
         # Try to remove as a junction/symlink first
         try:
             if path.is_symlink() or (path.is_dir() and os.path.islink(str(path))):
@@ -283,8 +741,12 @@ def safe_rmtree(path: Union[str, Path]) -> None:
         except:
             pass
 
-        # Fall back to rmtree with error handler
-        shutil.rmtree(path, onerror=handle_remove_readonly)
-    else:
-        # On Unix-like systems, regular rmtree works fine
-        shutil.rmtree(path)
+    if background and not path.is_symlink():
+        trashed = move_to_trash(path)
+        if trashed:
+            log_info(f"🗑️  Deleting {path.name} in the background")
+            _spawn_trash_purge(trashed.parent)
+            return
+
+    # Synchronous delete (handles readonly files on Windows)
+    _rmtree(path)
@@ -46,10 +46,9 @@ caffeinate -disu -w $$ &
 CAFFEINATE_PID=$!
 echo "6️⃣  Mac will not sleep (caffeinate PID: $CAFFEINATE_PID)"
 
-# 7. Get max CPU cores
+# 7. Get max CPU cores (the agent sizes -j to free memory; export JOBS to pin it)
 CPU_CORES=$(sysctl -n hw.ncpu)
-export JOBS=$CPU_CORES
-echo "7️⃣  Using $CPU_CORES parallel jobs"
+echo "7️⃣  Up to $CPU_CORES parallel jobs (adjusted to memory pressure)"
 
 # 8. Create a watchdog that monitors and restarts if needed
 (
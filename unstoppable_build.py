@@ -1,20 +1,42 @@
 #!/usr/bin/env python3
 """
 Force-Resume Build Agent v2.0
-- Detects stalls (5 min no progress)
+- Detects hung compiler processes (no CPU time, no output growth, far past
+  the duration recorded in .ninja_log) and kills only those
+- Detects whole-build stalls (no progress and no live compiler)
+- Sizes -j/-l to available memory and restarts ninja with fewer jobs
+  when the machine starts swapping
 - RESUMES from last successful step
 - Advanced Real-time Monitor with ETA
 - Visual & Audio Alerts
+- Publishes progress via the build status daemon (see build_status.py)
 """
 
 import subprocess
 import time
 import os
-import re
 import sys
+import queue
+import signal
 import shutil
+import threading
 from datetime import datetime, timedelta
-from collections import deque
+from build_status import ProgressTracker, StatusServer
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Per-target timings from .ninja_log and memory-aware job control
+# (optional, from the Nxtscape build system)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "packages", "browseros", "build"))
+try:
+    from modules.ninja_log import NinjaLog
+    from modules.job_control import JobController
+except ImportError:
+    NinjaLog = None
+    JobController = None
 
 # ANSI Colors
 RESET = "\033[0m"
@@ -28,65 +50,54 @@ BOLD = "\033[1m"
 CLEAR_SCREEN = "\033[2J\033[H"
 
 class BuildMonitor:
-    def __init__(self, total_targets=0):
-        self.start_time = time.time()
-        self.total_targets = total_targets
-        self.current_target = 0
-        self.last_target = 0
-        self.recent_times = deque(maxlen=100)
-        self.last_target_time = None
-        self.avg_time_per_target = 0.0
-        self.current_action = ""
-        self.status = "BUILDING"
+    """Terminal view of a ProgressTracker (the tracker owns all parsing)"""
+
+    def __init__(self, tracker=None):
+        self.tracker = tracker or ProgressTracker()
         self.health = "Good"
         self.spinner_idx = 0
         self.spinner_chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
 
+    @property
+    def start_time(self):
+        return self.tracker.start_time
+
+    @property
+    def current_target(self):
+        return self.tracker.current_target
+
+    @property
+    def total_targets(self):
+        return self.tracker.total_targets
+
+    @property
+    def current_action(self):
+        return self.tracker.current_action[:50]
+
+    @property
+    def status(self):
+        return self.tracker.status
+
+    @status.setter
+    def status(self, value):
+        self.tracker.set_status(value)
+
     def update(self, line):
         # Parse Ninja output: [123/456] CXX obj/...
-        match = re.search(r'\[(\d+)/(\d+)\]\s+(.*)', line)
-        if match:
-            self.current_target = int(match.group(1))
-            self.total_targets = int(match.group(2))
-            self.current_action = match.group(3)[:50]  # Truncate
-            
-            # Calculate stats
-            if self.current_target > self.last_target:
-                now = time.time()
-                if self.last_target_time is not None:
-                    self.recent_times.append(now - self.last_target_time)
-                self.last_target_time = now
-
-                if self.recent_times:
-                    self.avg_time_per_target = sum(self.recent_times) / len(self.recent_times)
-                
-                self.last_target = self.current_target
+        return self.tracker.feed(line)
 
     def get_eta(self):
-        if self.avg_time_per_target <= 0 or self.total_targets == 0:
+        eta = self.tracker.snapshot()["eta_seconds"]
+        if eta is None:
             return "Calculating..."
-        
-        remaining = self.total_targets - self.current_target
-        # Recalculate avg based on total elapsed
-        elapsed = time.time() - self.start_time
-        if self.current_target > 0:
-            real_avg = elapsed / self.current_target
-            seconds_left = remaining * real_avg
-            return str(timedelta(seconds=int(seconds_left)))
-        return "Calculating..."
+        return str(timedelta(seconds=eta))
 
     def get_finish_time(self):
-        if self.avg_time_per_target <= 0 or self.total_targets == 0:
+        eta = self.tracker.snapshot()["eta_seconds"]
+        if eta is None:
             return "Calculating..."
-        
-        remaining = self.total_targets - self.current_target
-        elapsed = time.time() - self.start_time
-        if self.current_target > 0:
-            real_avg = elapsed / self.current_target
-            seconds_left = remaining * real_avg
-            finish_time = datetime.now() + timedelta(seconds=int(seconds_left))
-            return finish_time.strftime("%I:%M:%S %p")
-        return "Calculating..."
+        finish_time = datetime.now() + timedelta(seconds=eta)
+        return finish_time.strftime("%I:%M:%S %p")
 
     def draw(self, stalled=False):
         # Move cursor to top
@@ -154,6 +165,168 @@ class BuildMonitor:
             sys.stdout.write('\a')
             sys.stdout.flush()
 
+def parse_ps_time(value):
+    """Parse ps time/etime ([[dd-]hh:]mm:ss[.cc]) into seconds"""
+    days = 0
+    if "-" in value:
+        day_part, value = value.split("-", 1)
+        days = int(day_part)
+    seconds = 0.0
+    for part in value.split(":"):
+        seconds = seconds * 60 + float(part)
+    return days * 86400 + seconds
+
+
+def list_processes():
+    """Return {pid: (ppid, cpu_seconds, age_seconds, argv)} for all processes"""
+    processes = {}
+    if psutil is not None:
+        now = time.time()
+        for proc in psutil.process_iter(["pid", "ppid", "cpu_times", "create_time", "cmdline"]):
+            info = proc.info
+            if info["cpu_times"] is None:
+                continue
+            cpu = info["cpu_times"].user + info["cpu_times"].system
+            processes[info["pid"]] = (
+                info["ppid"], cpu, now - (info["create_time"] or now), info["cmdline"] or []
+            )
+        return processes
+
+    result = subprocess.run(
+        ["ps", "-A", "-o", "pid=,ppid=,time=,etime=,command="],
+        capture_output=True, text=True
+    )
+    for line in result.stdout.splitlines():
+        parts = line.split(None, 4)
+        if len(parts) < 5:
+            continue
+        try:
+            processes[int(parts[0])] = (
+                int(parts[1]), parse_ps_time(parts[2]), parse_ps_time(parts[3]), parts[4].split()
+            )
+        except ValueError:
+            continue
+    return processes
+
+
+def output_of(argv):
+    """Find the output file of a compiler-style command line (-o FILE)"""
+    for i, arg in enumerate(argv):
+        if arg == "-o" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("/Fo"):  # clang-cl
+            return arg[3:]
+    return None
+
+
+class CompilerWatchdog:
+    """Find hung build actions among ninja's children
+
+    An action (a direct child of ninja and its subprocesses) is hung when
+    it has been running far longer than that target took last time
+    (.ninja_log), its CPU time has not advanced and its output file has
+    not grown for `idle_window` seconds. Busy actions are never touched,
+    however long they run.
+    """
+
+    def __init__(self, out_dir, min_timeout=600, slack=4.0, idle_window=300):
+        self.out_dir = out_dir
+        self.min_timeout = min_timeout
+        self.slack = slack
+        self.idle_window = idle_window
+        self.actions = {}  # pid -> state from the previous sample
+        self.ninja_log = None
+        if NinjaLog is not None:
+            self.ninja_log = NinjaLog(os.path.join(out_dir, ".ninja_log"))
+
+    def expected_duration(self, output):
+        if self.ninja_log is None or output is None:
+            return None
+        self.ninja_log.refresh()
+        return self.ninja_log.expected_duration(output)
+
+    def timeout_for(self, output):
+        expected = self.expected_duration(output)
+        if expected is None:
+            return self.min_timeout
+        return max(self.min_timeout, expected * self.slack)
+
+    def _output_size(self, output):
+        if output is None:
+            return None
+        try:
+            return os.path.getsize(os.path.join(self.out_dir, output))
+        except OSError:
+            return None
+
+    def check(self, ninja_pid):
+        """Sample ninja's actions; returns (any_action_alive, hung_actions)
+
+        Each hung action is a dict with pid, pids (its process subtree),
+        output, age and timeout.
+        """
+        processes = list_processes()
+        children = {}
+        for pid, (ppid, _, _, _) in processes.items():
+            children.setdefault(ppid, []).append(pid)
+
+        now = time.time()
+        alive = False
+        hung = []
+        current = {}
+        for root in children.get(ninja_pid, []):
+            subtree, stack = [], [root]
+            while stack:
+                pid = stack.pop()
+                subtree.append(pid)
+                stack.extend(children.get(pid, []))
+
+            cpu = sum(processes[pid][1] for pid in subtree)
+            output = None
+            for pid in subtree:
+                output = output_of(processes[pid][3])
+                if output:
+                    break
+            size = self._output_size(output)
+
+            state = self.actions.get(root)
+            if state is None or state["output"] != output:
+                state = {"output": output, "cpu": cpu, "size": size, "last_active": now}
+            elif cpu > state["cpu"] + 0.5 or size != state["size"]:
+                state.update(cpu=cpu, size=size, last_active=now)
+            current[root] = state
+
+            if now - state["last_active"] < self.idle_window:
+                alive = True
+                continue
+
+            age = processes[root][2]
+            timeout = self.timeout_for(output)
+            if age > timeout:
+                hung.append({
+                    "pid": root,
+                    "pids": subtree,
+                    "output": output or " ".join(processes[root][3])[:80],
+                    "age": int(age),
+                    "timeout": int(timeout),
+                })
+
+        self.actions = current
+        return alive, hung
+
+    @staticmethod
+    def kill(action, grace=5):
+        """Terminate a hung action's process tree (ninja itself is untouched)"""
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            for pid in reversed(action["pids"]):
+                try:
+                    os.kill(pid, sig)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            if sig == signal.SIGTERM:
+                time.sleep(grace)
+
+
 class ForceResumeBuildAgent:
     def __init__(self):
         self.build_dir = os.path.expanduser("~/chromium/src")
@@ -161,12 +334,20 @@ class ForceResumeBuildAgent:
         self.status_file = "agent_status.txt"
         self.log_file = "build_ultra_reliable.log"
         self.stall_timeout = 1200  # 20 minutes (increased for regeneration)
+        self.watchdog_interval = 30  # Seconds between compiler liveness checks
         self.last_progress = time.time()
         self.last_target_count = 0
         self.retry_count = 0
         self.max_retries = 100 # Never give up basically
         self.build_process = None
-        self.monitor = BuildMonitor()
+        self.tracker = ProgressTracker(stall_timeout=self.stall_timeout)
+        self.tracker.max_retries = self.max_retries
+        self.status_server = None
+        self.monitor = BuildMonitor(self.tracker)
+        self.watchdog = CompilerWatchdog(self.out_dir)
+        # JOBS=N pins the job count; otherwise it follows memory pressure
+        self.job_controller = JobController.from_env() if JobController else None
+        self.restart_requested = False
         
     def log(self, message):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -176,25 +357,27 @@ class ForceResumeBuildAgent:
             f.write(log_msg + "\n")
             
     def update_status(self, status, details=""):
-        with open(self.status_file, "w") as f:
-            f.write(f"Status: {status}\n")
-            f.write(f"Time: {datetime.now()}\n")
-            f.write(f"Resume: {self.retry_count}/{self.max_retries}\n")
-            f.write(f"Last Target: {self.last_target_count}\n")
-            if details:
-                f.write(f"Details: {details}\n")
+        self.tracker.retry_count = self.retry_count
+        self.tracker.set_status(status, details)
+        # agent_status.txt is kept for existing scripts; prefer build_status.py
+        self.tracker.write_status_file(self.status_file)
+
+    def start_status_server(self):
+        """Serve progress to monitors and scripts (./build_status.py status)"""
+        try:
+            self.status_server = StatusServer(
+                self.tracker, os.path.abspath("build_status.sock")
+            ).start()
+        except OSError as e:
+            self.log(f"⚠️ Status server unavailable: {e}")
     
-    def detect_stall(self, output_line):
-        """Check if build has stalled (no progress for 5 minutes)"""
-        # Look for ninja progress: [1234/5678]
-        match = re.search(r'\[(\d+)/(\d+)\]', output_line)
-        if match:
-            current_count = int(match.group(1))
-            if current_count > self.last_target_count:
-                self.last_target_count = current_count
-                self.last_progress = time.time()
-                self.monitor.health = "Good"
-                return False
+    def detect_stall(self, progressed):
+        """Check if build has stalled (no finished target for stall_timeout)"""
+        if progressed:
+            self.last_target_count = self.tracker.current_target
+            self.last_progress = time.time()
+            self.monitor.health = "Good"
+            return False
         
         # Check if stalled
         elapsed = time.time() - self.last_progress
@@ -210,16 +393,21 @@ class ForceResumeBuildAgent:
         
         # Set environment
         os.environ['PATH'] = f"{os.environ.get('PATH')}:{os.path.expanduser('~/depot_tools')}"
-        os.environ.setdefault('JOBS', '14')
         
         # Increase limits
         subprocess.run(["ulimit", "-n", "10000"], shell=True)
         subprocess.run(["ulimit", "-v", "unlimited"], shell=True)
         
+        self.last_progress = time.time()
         self.log(f"🔄 RESUMING build (attempt {self.retry_count + 1}/{self.max_retries})")
         self.update_status("RESUMING")
         
-        cmd = ["ninja", "-C", self.out_dir, "chrome"]
+        # -k 0: a killed (hung) compiler fails only its own edge; ninja keeps
+        # building everything else and the next resume retries just that edge
+        cmd = ["ninja", "-C", self.out_dir, "-k", "0", "chrome"]
+        if self.job_controller:
+            cmd[1:1] = self.job_controller.ninja_args()
+            self.log(f"⚖️ Parallelism: {' '.join(self.job_controller.ninja_args())}")
         
         self.build_process = subprocess.Popen(
             cmd,
@@ -229,15 +417,73 @@ class ForceResumeBuildAgent:
             bufsize=1
         )
         
+        # Read output on a thread so stalls are noticed even when ninja is silent
+        self.output_queue = queue.Queue()
+        threading.Thread(
+            target=self._read_output, args=(self.build_process.stdout,), daemon=True
+        ).start()
+        
         return self.build_process
+
+    def _read_output(self, stream):
+        for line in stream:
+            self.output_queue.put(line)
+        self.output_queue.put("")  # EOF
+
+    def check_compilers(self):
+        """Kill hung compiler actions; returns True if any action is alive"""
+        alive, hung = self.watchdog.check(self.build_process.pid)
+        for action in hung:
+            self.log(
+                f"⚠️ HUNG ACTION: {action['output']} (pid {action['pid']}, "
+                f"{action['age']}s > {action['timeout']}s, no CPU or output) - killing it"
+            )
+            self.watchdog.kill(action)
+        if alive:
+            self.last_progress = time.time()
+            self.tracker.touch()
+        return alive
     
+    def check_memory_pressure(self):
+        """Restart ninja with a new -j when memory pressure calls for it"""
+        if not self.job_controller:
+            return False
+        jobs = self.job_controller.sample()
+        if jobs is None:
+            return False
+        self.log(f"⚖️ Memory pressure changed - restarting ninja with -j{jobs}")
+        self.restart_requested = True
+        # Like Ctrl-C: ninja stops its running commands and exits cleanly
+        self.build_process.send_signal(signal.SIGINT)
+        try:
+            self.build_process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            self.build_process.kill()
+            self.build_process.wait()
+        return True
+
     def monitor_build(self):
         """Monitor build and handle stalls/failures"""
         last_line = ""
+        next_check = time.time() + self.watchdog_interval
         
         while True:
-            # Non-blocking read would be better, but readline is okay for now
-            line = self.build_process.stdout.readline()
+            try:
+                line = self.output_queue.get(timeout=5)
+            except queue.Empty:
+                line = None
+
+            if time.time() >= next_check:
+                self.check_compilers()
+                if self.check_memory_pressure():
+                    return False
+                next_check = time.time() + self.watchdog_interval
+
+            if line is None:
+                # Silent ninja: only stall detection can make progress
+                if self.detect_stall(False):
+                    return self.handle_stall()
+                continue
             
             if not line:
                 # Build process ended
@@ -251,23 +497,17 @@ class ForceResumeBuildAgent:
                     return False
             
             clean_line = line.strip()
+            progressed = False
             if clean_line:
-                self.monitor.update(clean_line)
+                progressed = self.monitor.update(clean_line)
                 last_line = clean_line
             
             # Update UI
             self.monitor.draw()
             
             # Check for stall
-            if self.detect_stall(line):
-                self.monitor.draw(stalled=True)
-                self.log("⚠️ Stall detected - will kill and RESUME...")
-                # Play sound
-                os.system('tput bel') 
-                time.sleep(2) # Let user see the red screen
-                self.build_process.kill()
-                self.build_process.wait()
-                return False
+            if self.detect_stall(progressed):
+                return self.handle_stall()
             
             # Check for fatal errors
             if "FAILED:" in line:
@@ -277,12 +517,31 @@ class ForceResumeBuildAgent:
                 os.system('tput bel')
                 # Don't immediately kill - let ninja try to continue or fail
     
+    def handle_stall(self):
+        """No target finished and no action alive for stall_timeout: restart ninja"""
+        self.monitor.draw(stalled=True)
+        self.log("⚠️ Stall detected (ninja idle, no live compiler) - will kill and RESUME...")
+        # Play sound
+        os.system('tput bel') 
+        time.sleep(2) # Let user see the red screen
+        self.build_process.kill()
+        self.build_process.wait()
+        return False
+
     def run_force_resume_until_done(self):
         """Main loop - resumes build until success"""
         self.log("=" * 70)
         self.log("🔄 FORCE-RESUME BUILD AGENT ACTIVATED")
         self.log("=" * 70)
+        self.start_status_server()
         
+        try:
+            return self._resume_loop()
+        finally:
+            if self.status_server:
+                self.status_server.stop()
+
+    def _resume_loop(self):
         while self.retry_count < self.max_retries:
             try:
                 # Resume build
@@ -295,8 +554,14 @@ class ForceResumeBuildAgent:
                     self.log("🎉 BUILD COMPLETED SUCCESSFULLY!")
                     return True
                 
+                if self.restart_requested:
+                    # Planned restart with a new job count, not a failure
+                    self.restart_requested = False
+                    continue
+
                 # Build failed or stalled
                 self.retry_count += 1
+                self.tracker.retry_count = self.retry_count
                 self.monitor.status = "RESUMING..."
                 self.monitor.draw(stalled=True)
                 